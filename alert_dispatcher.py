@@ -0,0 +1,228 @@
+import time
+import queue
+import atexit
+import smtplib
+import logging
+import threading
+from email.mime.text import MIMEText
+
+# Class to deliver fault alerts by email from a background worker.
+# Producers only enqueue; the worker keeps one authenticated SMTP session
+# open, coalesces alerts that arrive for the same channel into a single
+# digest, and sends at most one email per channel every `rate_limit_interval`
+# seconds. The session is closed after `idle_timeout` seconds without mail.
+# A digest that cannot be sent is kept and retried after `retry_interval`
+# seconds (at most `queue_size` alerts per channel are kept). The worker is a
+# daemon thread, so pending digests are also flushed at interpreter exit
+# (waiting at most `exit_timeout` seconds).
+class AlertDispatcher:
+    def __init__(self, sender_email, receiver_email, smtp_server, smtp_port, smtp_username=None, smtp_password=None,
+                 use_ssl=True, rate_limit_interval=300.0, idle_timeout=60.0, queue_size=1000, smtp_timeout=10.0,
+                 exit_timeout=30.0, retry_interval=30.0):
+        self.sender_email = sender_email
+        self.receiver_email = receiver_email
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.smtp_username = smtp_username
+        self.smtp_password = smtp_password
+        self.use_ssl = use_ssl
+        self.rate_limit_interval = rate_limit_interval
+        self.idle_timeout = idle_timeout
+        self.smtp_timeout = smtp_timeout
+        self.exit_timeout = exit_timeout
+        self.retry_interval = retry_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending = {}
+        self._next_allowed = {}
+        self._smtp = None
+        self._last_used = 0.0
+        self._worker = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "alerts_received": 0,
+            "alerts_dropped": 0,
+            "alerts_coalesced": 0,
+            "emails_sent": 0,
+            "send_failures": 0,
+            "connections_opened": 0
+        }
+
+    # Start the background worker thread
+    def start(self):
+        with self._lock:
+            if self._worker is None:
+                self._stopping.clear()
+                self._worker = threading.Thread(target=self._run, name="AlertDispatcher", daemon=True)
+                self._worker.start()
+                atexit.register(self._stop_at_exit)
+
+    # Send every pending digest, close the SMTP session and stop the worker.
+    # Never blocks on a full queue: the worker drains whatever is queued
+    # before its final flush.
+    def stop(self, timeout=None):
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+        if worker is not None:
+            atexit.unregister(self._stop_at_exit)
+            self._stopping.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            worker.join(timeout)
+
+    def _stop_at_exit(self):
+        self.stop(self.exit_timeout)
+
+    # Queue an alert without blocking; returns False if the queue is full
+    def submit(self, channel, message):
+        self.start()
+        try:
+            self._queue.put_nowait((channel, message, time.time()))
+        except queue.Full:
+            with self._lock:
+                self._stats["alerts_dropped"] += 1
+            return False
+        with self._lock:
+            self._stats["alerts_received"] += 1
+        return True
+
+    # Get a snapshot of the dispatcher counters
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["pending_channels"] = len(self._pending)
+        return stats
+
+    # Open (or reuse) the authenticated SMTP session
+    def _connection(self):
+        if self._smtp is None:
+            if self.use_ssl:
+                smtp = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+            else:
+                smtp = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+            if self.smtp_username:
+                smtp.login(self.smtp_username, self.smtp_password)
+            self._smtp = smtp
+            with self._lock:
+                self._stats["connections_opened"] += 1
+        return self._smtp
+
+    # Close the SMTP session, ignoring errors from an already dead connection
+    def _disconnect(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._smtp = None
+
+    # Build the email for the alerts collected on one channel
+    def _build_message(self, channel, alerts):
+        if len(alerts) == 1:
+            subject = "Drone Fault Detected"
+            body = alerts[0][0]
+        else:
+            subject = f"Drone Fault Digest: {channel} ({len(alerts)} alerts)"
+            body = "\n".join(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))} {message}" for message, timestamp in alerts)
+        msg = MIMEText(body)
+        msg['Subject'] = subject
+        msg['From'] = self.sender_email
+        msg['To'] = self.receiver_email
+        return msg
+
+    # Send one digest, reconnecting once if the kept-alive session has dropped
+    def _send(self, channel, alerts):
+        msg = self._build_message(channel, alerts).as_string()
+        for attempt in range(2):
+            try:
+                self._connection().sendmail(self.sender_email, [self.receiver_email], msg)
+                self._last_used = time.monotonic()
+                with self._lock:
+                    self._stats["emails_sent"] += 1
+                    self._stats["alerts_coalesced"] += len(alerts) - 1
+                logging.info("Email notification sent.")
+                return True
+            except (smtplib.SMTPException, OSError) as e:
+                self._disconnect()
+                if attempt == 1:
+                    with self._lock:
+                        self._stats["send_failures"] += 1
+                    logging.error(f"Failed to send email notification: {str(e)}")
+        return False
+
+    # Send the digests of every channel whose rate limit has expired; alerts
+    # stay pending until their digest has actually been sent
+    def _flush(self, force=False):
+        now = time.monotonic()
+        for channel in list(self._pending):
+            if force or now >= self._next_allowed.get(channel, 0.0):
+                alerts = self._pending[channel]
+                if self._send(channel, alerts):
+                    del self._pending[channel]
+                    self._next_allowed[channel] = now + self.rate_limit_interval
+                else:
+                    dropped = len(alerts) - self._queue.maxsize
+                    if dropped > 0:
+                        del alerts[:dropped]
+                        with self._lock:
+                            self._stats["alerts_dropped"] += dropped
+                    self._next_allowed[channel] = now + self.retry_interval
+
+    # Seconds until the next pending digest may be sent (None if nothing is pending)
+    def _next_deadline(self):
+        if not self._pending:
+            return None
+        now = time.monotonic()
+        return max(0.0, min(self._next_allowed.get(channel, 0.0) for channel in self._pending) - now)
+
+    # Background loop: gather alerts, send due digests, drop idle connections
+    def _run(self):
+        stopping = False
+        while not stopping:
+            timeout = self._next_deadline()
+            if self._smtp is not None:
+                idle_left = max(0.0, self._last_used + self.idle_timeout - time.monotonic())
+                timeout = idle_left if timeout is None else min(timeout, idle_left)
+
+            try:
+                item = self._queue.get(timeout=timeout)
+                while True:
+                    if item is None:
+                        stopping = True
+                    else:
+                        channel, message, timestamp = item
+                        self._pending.setdefault(channel, []).append((message, timestamp))
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            stopping = stopping or self._stopping.is_set()
+            self._flush(force=stopping)
+            if stopping and self._pending:
+                logging.error(f"Failed to deliver alerts for {len(self._pending)} channels before shutdown")
+            if self._smtp is not None and (stopping or time.monotonic() - self._last_used >= self.idle_timeout):
+                self._disconnect()
+
+# Function to create an alert dispatcher from the [email_notification] configuration
+def create_alert_dispatcher(config):
+    section = "email_notification"
+    return AlertDispatcher(
+        config.get(section, "sender_email"),
+        config.get(section, "receiver_email"),
+        config.get(section, "smtp_server"),
+        config.getint(section, "smtp_port"),
+        smtp_username=config.get(section, "smtp_username", fallback=None),
+        smtp_password=config.get(section, "smtp_password", fallback=None),
+        use_ssl=config.getboolean(section, "use_ssl", fallback=True),
+        rate_limit_interval=config.getfloat(section, "rate_limit_interval", fallback=300.0),
+        idle_timeout=config.getfloat(section, "idle_timeout", fallback=60.0),
+        queue_size=config.getint(section, "queue_size", fallback=1000),
+        retry_interval=config.getfloat(section, "retry_interval", fallback=30.0)
+    )
@@ -0,0 +1,140 @@
+import numpy as np
+from rolling_stats import RollingWindow
+
+# Names of the anomaly detectors, in the order reported by describe()
+ANOMALY_KINDS = ("zscore", "cusum", "rate")
+
+# Take rows of a per-drone state array; rows of -1 are filled with `value`
+def _take_rows(array, rows, value):
+    result = np.full((len(rows),) + array.shape[1:], value, dtype=array.dtype)
+    kept = rows >= 0
+    result[kept] = array[rows[kept]]
+    return result
+
+# Class detecting statistical anomalies in streaming telemetry.
+# Every update takes one (n_drones, n_channels) block and runs three checks,
+# each vectorized across all drones and channels:
+#   zscore - the sample is more than `z_threshold` rolling standard deviations
+#            away from the rolling mean of the preceding `window` samples
+#   cusum  - a two-sided CUSUM of those z-scores exceeds `cusum_h`, which
+#            catches slow drift that never trips the z-score check
+#   rate   - the change since the drone's previous sample, divided by the
+#            time between the two samples, exceeds the channel's
+#            `max_rates` limit (units per second)
+# Every drone carries the timestamp of its latest sample; a drone whose
+# timestamp has not advanced has no new data and is skipped, so re-read or
+# stale samples never enter the windows. The window advances once per update
+# that has new data for at least one drone. The rolling mean/std come from
+# RollingWindow, so the per-sample cost stays flat as the window grows.
+class StreamingAnomalyDetector:
+    def __init__(self, channels, n_drones=1, window=60, z_threshold=4.0, cusum_k=0.5, cusum_h=5.0, min_samples=10, max_rates=None):
+        self.channels = tuple(channels)
+        self.n_drones = n_drones
+        self.z_threshold = z_threshold
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.min_samples = min_samples
+        max_rates = max_rates or {}
+        self.max_rates = np.array([max_rates.get(name, np.inf) for name in self.channels], dtype=np.float64)
+        self._window = RollingWindow(window, n_drones * len(self.channels))
+        self._cusum_pos = np.zeros((n_drones, len(self.channels)))
+        self._cusum_neg = np.zeros((n_drones, len(self.channels)))
+        self._last_values = np.full((n_drones, len(self.channels)), np.nan)
+        self._last_timestamps = np.full(n_drones, np.nan)
+        self.drone_ids = None
+
+    # Build a detector from a config section ("max_rate_<channel>" keys set rate limits)
+    @classmethod
+    def from_config(cls, config, channels, n_drones=1, section="anomaly_detection"):
+        max_rates = {}
+        if config.has_section(section):
+            for key in config.options(section):
+                if key.startswith("max_rate_"):
+                    max_rates[key[len("max_rate_"):]] = config.getfloat(section, key)
+        return cls(
+            channels,
+            n_drones=n_drones,
+            window=config.getint(section, "window", fallback=60),
+            z_threshold=config.getfloat(section, "z_threshold", fallback=4.0),
+            cusum_k=config.getfloat(section, "cusum_k", fallback=0.5),
+            cusum_h=config.getfloat(section, "cusum_h", fallback=5.0),
+            min_samples=config.getint(section, "min_samples", fallback=10),
+            max_rates=max_rates
+        )
+
+    # Grow the number of tracked drones; new drones start with empty history
+    def resize(self, n_drones):
+        extra = n_drones - self.n_drones
+        if extra <= 0:
+            return
+        self._select_rows(np.concatenate([np.arange(self.n_drones), np.full(extra, -1)]))
+
+    # Match the tracked rows to a list of drone IDs (e.g. a registry snapshot):
+    # known drones keep their history even if their row moves, new drones
+    # start empty and drones no longer listed are dropped
+    def align(self, drone_ids):
+        drone_ids = list(drone_ids)
+        if drone_ids == self.drone_ids:
+            return
+        known = {drone_id: row for row, drone_id in enumerate(self.drone_ids or ())}
+        self._select_rows(np.array([known.get(drone_id, -1) for drone_id in drone_ids], dtype=np.intp))
+        self.drone_ids = drone_ids
+
+    # Rearrange the per-drone state: row i becomes old row rows[i] (-1 = new drone)
+    def _select_rows(self, rows):
+        n_channels = len(self.channels)
+        columns = rows[:, None] * n_channels + np.arange(n_channels)
+        self._window.select(np.where(rows[:, None] >= 0, columns, -1).ravel())
+        self._cusum_pos = _take_rows(self._cusum_pos, rows, 0.0)
+        self._cusum_neg = _take_rows(self._cusum_neg, rows, 0.0)
+        self._last_values = _take_rows(self._last_values, rows, np.nan)
+        self._last_timestamps = _take_rows(self._last_timestamps, rows, np.nan)
+        self.n_drones = len(rows)
+
+    # Check one sample per drone and return {kind: (n_drones, n_channels) bool array}.
+    # `timestamps` holds the sample time of every drone (or one time for all);
+    # drones whose timestamp is NaN or not newer than their last one are skipped.
+    def update(self, values, timestamps):
+        values = np.asarray(values, dtype=np.float64).reshape(self.n_drones, len(self.channels))
+        shape = values.shape
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (self.n_drones,))
+        with np.errstate(invalid="ignore"):
+            fresh = ~np.isnan(timestamps) & ~(timestamps <= self._last_timestamps)
+        if not fresh.any():
+            return {kind: np.zeros(shape, dtype=bool) for kind in ANOMALY_KINDS}
+        values = np.where(fresh[:, None], values, np.nan)
+
+        # Score against the window before this sample joins it
+        stats = self._window.get_stats()
+        mean = stats["mean"].reshape(shape)
+        std = stats["std"].reshape(shape)
+        ready = (stats["count"].reshape(shape) >= self.min_samples) & (std > 0) & ~np.isnan(values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.where(ready, (values - mean) / std, 0.0)
+        zscore = ready & (np.abs(z) > self.z_threshold)
+
+        # Skipped drones keep their CUSUM state until their next sample
+        fresh_rows = fresh[:, None]
+        self._cusum_pos = np.where(fresh_rows, np.maximum(0.0, self._cusum_pos + z - self.cusum_k) * ready, self._cusum_pos)
+        self._cusum_neg = np.where(fresh_rows, np.maximum(0.0, self._cusum_neg - z - self.cusum_k) * ready, self._cusum_neg)
+        cusum = fresh_rows & ((self._cusum_pos > self.cusum_h) | (self._cusum_neg > self.cusum_h))
+        self._cusum_pos[cusum] = 0.0
+        self._cusum_neg[cusum] = 0.0
+
+        # Rate of change against each drone's own previous sample
+        with np.errstate(invalid="ignore", divide="ignore"):
+            elapsed = (timestamps - self._last_timestamps)[:, None]
+            rate = fresh_rows & (np.abs(values - self._last_values) / elapsed > self.max_rates)
+
+        self._window.update(values.ravel())
+        self._last_values = np.where(np.isnan(values), self._last_values, values)
+        self._last_timestamps = np.where(fresh, timestamps, self._last_timestamps)
+        return {"zscore": zscore, "cusum": cusum, "rate": rate}
+
+    # List (drone_index, channel, kind) for every flagged value in an update result
+    def describe(self, anomalies):
+        found = []
+        for kind in ANOMALY_KINDS:
+            for drone_index, column in zip(*np.nonzero(anomalies[kind])):
+                found.append((int(drone_index), self.channels[column], kind))
+        return found
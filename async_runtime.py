@@ -0,0 +1,164 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+
+# Load configuration from the "config.ini" file
+config = configparser.ConfigParser()
+config.read("config.ini")
+
+# Class describing one periodic task and its timing statistics
+class PeriodicTask:
+    def __init__(self, name, func, interval, jitter=0.0, blocking=True):
+        if interval <= 0:
+            raise ValueError(f"Task {name} needs a positive interval")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.blocking = blocking
+        self.runs = 0
+        self.errors = 0
+        self.overruns = 0
+        self.missed_ticks = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.max_lateness = 0.0
+
+    def get_stats(self):
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "missed_ticks": self.missed_ticks,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration,
+            "max_lateness": self.max_lateness
+        }
+
+# Class running many periodic tasks on a single asyncio event loop.
+# Each task keeps a fixed deadline grid (jitter delays a run but never shifts
+# the grid); a run that ends past its next deadline counts as an overrun and
+# the ticks it swallowed are skipped rather than replayed back to back.
+# Blocking tasks run on a shared thread pool so they never stall the loop.
+class AsyncRuntime:
+    def __init__(self, max_workers=4):
+        self.tasks = {}
+        self.max_workers = max_workers
+        self._loop = None
+        self._stop_event = None
+        self._executor = None
+        self._started = threading.Event()
+        self._state_lock = threading.Lock()
+        self._stop_requested = False
+
+    # Register a callable to run every `interval` seconds
+    def add_task(self, name, func, interval, jitter=0.0, blocking=True):
+        if name in self.tasks:
+            raise ValueError(f"Task {name} is already registered")
+        task = PeriodicTask(name, func, interval, jitter, blocking)
+        self.tasks[name] = task
+        return task
+
+    # Get the timing statistics of every task
+    def get_stats(self):
+        return {name: task.get_stats() for name, task in self.tasks.items()}
+
+    # Run one task forever on its deadline grid
+    async def _run_task(self, task):
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            delay = deadline - time.monotonic()
+            if task.jitter:
+                delay += random.uniform(0.0, task.jitter)
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+
+            started = time.monotonic()
+            task.max_lateness = max(task.max_lateness, started - deadline)
+            try:
+                if task.blocking:
+                    await loop.run_in_executor(self._executor, task.func)
+                else:
+                    result = task.func()
+                    if asyncio.iscoroutine(result):
+                        await result
+            except Exception as e:
+                task.errors += 1
+                logging.error(f"Periodic task {task.name} failed: {str(e)}")
+            finished = time.monotonic()
+
+            task.runs += 1
+            task.last_duration = finished - started
+            task.max_duration = max(task.max_duration, task.last_duration)
+
+            deadline += task.interval
+            if finished > deadline:
+                skipped = int((finished - deadline) // task.interval) + 1
+                task.overruns += 1
+                task.missed_ticks += skipped
+                deadline += skipped * task.interval
+
+    # Run all registered tasks until stop() is called
+    async def run_async(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="AsyncRuntime")
+        with self._state_lock:
+            # A stop() that arrived before the loop was up ends this run at once
+            if self._stop_requested:
+                self._stop_event.set()
+            self._started.set()
+        try:
+            await asyncio.gather(*(self._run_task(task) for task in self.tasks.values()))
+        finally:
+            self._executor.shutdown(wait=True)
+            with self._state_lock:
+                self._started.clear()
+                self._stop_requested = False
+
+    # Blocking entry point that owns the event loop
+    def run(self):
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            logging.info("Async runtime interrupted by user.")
+
+    # Stop all tasks; safe to call from any thread, also before run() has started
+    def stop(self):
+        with self._state_lock:
+            self._stop_requested = True
+            if self._started.is_set():
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+
+# Function to create a runtime with the standard subsystem loops registered
+def create_default_runtime():
+    import data_transmitter
+    import fault_detection
+    import power_analysis
+    import telemetry
+
+    jitter = config.getfloat("runtime", "jitter", fallback=0.0)
+    runtime = AsyncRuntime(max_workers=config.getint("runtime", "max_workers", fallback=4))
+    runtime.add_task("telemetry_update", data_transmitter.update_telemetry_sample,
+                     config.getfloat("data_generation", "update_interval", fallback=0.5), jitter)
+    runtime.add_task("fault_detection", fault_detection.run_fault_detection_cycle,
+                     config.getfloat("fault_detection", "update_interval", fallback=5.0), jitter)
+    runtime.add_task("power_analysis", power_analysis.run_power_analysis_cycle,
+                     config.getfloat("power_analysis", "update_interval", fallback=1.0), jitter)
+    telemetry.subscribe_telemetry_events(telemetry.log_telemetry_event)
+    runtime.add_task("telemetry_events", telemetry.publish_fleet_events,
+                     config.getfloat("runtime", "telemetry_event_interval", fallback=5.0), jitter)
+    return runtime
+
+if __name__ == "__main__":
+    create_default_runtime().run()
@@ -0,0 +1,61 @@
+# Benchmark: genetic power optimizer generations per second
+#
+# Measures how many generations per second GeneticPowerOptimizer runs for a
+# grid of population sizes and device counts using the vectorized default
+# fitness.
+#
+#   python benchmarks/bench_power_optimizer.py [--generations 50] [--json]
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from power_optimizer import GeneticPowerOptimizer
+
+POPULATION_SIZES = (50, 200, 1000, 5000)
+DEVICE_COUNTS = (4, 16, 64, 256)
+
+# Time `generations` generations for one problem size
+def run_case(population_size, n_devices, generations, seed=0):
+    rng = np.random.default_rng(seed)
+    min_power = rng.uniform(5.0, 15.0, n_devices)
+    max_power = min_power + rng.uniform(10.0, 30.0, n_devices)
+    budget = 0.7 * max_power.sum()
+    optimizer = GeneticPowerOptimizer(min_power, max_power, budget, demand=max_power, population_size=population_size, seed=seed)
+    optimizer.step()
+
+    started = time.perf_counter()
+    for _ in range(generations):
+        optimizer.step()
+    elapsed = time.perf_counter() - started
+    return {
+        "population_size": population_size,
+        "devices": n_devices,
+        "generations_per_second": generations / elapsed,
+        "best_fitness": optimizer.best_fitness
+    }
+
+# Run every population size against every device count
+def run_benchmark(generations=50, population_sizes=POPULATION_SIZES, device_counts=DEVICE_COUNTS):
+    return [run_case(population_size, n_devices, generations) for population_size in population_sizes for n_devices in device_counts]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark genetic power optimizer throughput.")
+    parser.add_argument("--generations", type=int, default=50, help="generations timed per case")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.generations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'population':>10} {'devices':>7} {'generations/s':>14}")
+    for result in results:
+        print(f"{result['population_size']:>10} {result['devices']:>7} {result['generations_per_second']:>14,.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Benchmark: lock-and-copy reads versus snapshot publication
+#
+# Runs one producer thread and 1 to 16 reader threads for a fixed duration
+# and reports reads/s and writes/s for both the original locked dict copy and
+# the SnapshotPublisher reference swap.
+#
+#   python benchmarks/bench_snapshot.py [--duration 1.0] [--json]
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snapshot import SnapshotPublisher
+
+READER_COUNTS = (1, 2, 4, 8, 16)
+
+# Original pattern: a dict guarded by one lock, copied on every read
+class LockedCopyStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {"voltage": 0.0, "current": 0.0, "temperature": 0.0}
+
+    def write(self, value):
+        with self.lock:
+            self.data["voltage"] = value
+            self.data["current"] = value
+            self.data["temperature"] = value
+
+    def read(self):
+        with self.lock:
+            return self.data.copy()
+
+# Snapshot pattern: immutable sample published by reference swap
+class SnapshotStore:
+    def __init__(self):
+        self.publisher = SnapshotPublisher({"voltage": 0.0, "current": 0.0, "temperature": 0.0})
+
+    def write(self, value):
+        self.publisher.publish({"voltage": value, "current": value, "temperature": value})
+
+    def read(self):
+        return self.publisher.latest_data()
+
+# Run one producer and `readers` consumers against a store for `duration` seconds
+def run_case(store, readers, duration):
+    stop = threading.Event()
+    read_counts = [0] * readers
+    write_count = [0]
+
+    def reader(index):
+        read = store.read
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                read().get("voltage")
+            count += 100
+        read_counts[index] = count
+
+    def writer():
+        write = store.write
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                write(float(count))
+                count += 1
+        write_count[0] = count
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "readers": readers,
+        "reads_per_second": sum(read_counts) / duration,
+        "writes_per_second": write_count[0] / duration
+    }
+
+# Run every store against every reader count
+def run_benchmark(duration=1.0, reader_counts=READER_COUNTS):
+    results = []
+    for name, factory in (("locked_copy", LockedCopyStore), ("snapshot", SnapshotStore)):
+        for readers in reader_counts:
+            result = run_case(factory(), readers, duration)
+            result["store"] = name
+            results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark telemetry snapshot publication against locked dict copies.")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per case")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.duration)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'store':<12} {'readers':>7} {'reads/s':>14} {'writes/s':>14}")
+    for result in results:
+        print(f"{result['store']:<12} {result['readers']:>7} {result['reads_per_second']:>14,.0f} {result['writes_per_second']:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
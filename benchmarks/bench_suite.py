@@ -0,0 +1,418 @@
+# Benchmark suite for the telemetry ingest, snapshot, detection, analysis,
+# transmission and synthetic generation paths
+#
+# Runs offline: the modules are imported from a scratch directory holding a
+# copy of config.ini whose server endpoint points at a local HTTP stand-in and
+# whose SMTP server is a closed local port, so logs and archives never touch
+# the working tree. Results are written as JSON together with the commit they
+# were measured on; pass --compare with an earlier result file to print the
+# change of every metric (on stderr; the exit status is 1 if any regressed).
+#
+#   python benchmarks/bench_suite.py [--duration 1.0] [--quick] [--only ingest,transmission]
+#                                    [--output results.json] [--compare baseline.json]
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import contextlib
+import subprocess
+import configparser
+import importlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+
+READER_COUNTS = (0, 1, 4, 8)
+HISTORY_SIZES = (1000, 10000, 100000, 1000000)
+QUICK_HISTORY_SIZES = (1000, 10000, 100000)
+
+# Minimal telemetry endpoint: reads the request body and answers 200.
+# Nagle is disabled so the split header/body writes are not held back by the
+# client's delayed ACK (which would cap keep-alive requests at ~25/s).
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+# Start the local HTTP stand-in on a free port; returns (server, endpoint URL)
+def start_stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="StandInServer", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/telemetry"
+
+# Copy config.ini into a scratch directory, point it at local stand-ins and chdir there
+def prepare_workspace(endpoint):
+    workspace = tempfile.mkdtemp(prefix="bench_suite_")
+    config = configparser.ConfigParser()
+    config.read(os.path.join(REPO_ROOT, "config.ini"))
+    config.set("server", "endpoint", endpoint)
+    config.set("email_notification", "smtp_server", "127.0.0.1")
+    config.set("email_notification", "smtp_port", "9")
+    config.set("email_notification", "use_ssl", "false")
+    config.set("power_analysis", "live_plot", "false")
+    with open(os.path.join(workspace, "config.ini"), "w") as file:
+        config.write(file)
+    os.chdir(workspace)
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    return workspace
+
+# Call func repeatedly for `duration` seconds; returns calls per second
+def measure_rate(func, duration, batch=100):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while True:
+        for _ in range(batch):
+            func()
+        count += batch
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+# Summarize per-call latencies (ns) as percentiles in microseconds
+def latency_summary(samples_ns):
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1e3
+    return {
+        "calls": int(samples.size),
+        "p50_us": float(np.percentile(samples, 50)),
+        "p99_us": float(np.percentile(samples, 99)),
+        "p999_us": float(np.percentile(samples, 99.9)),
+        "max_us": float(samples.max())
+    }
+
+# Sample ingest: update_telemetry_sample() (publish, fleet registry, sample log)
+def bench_ingest(modules, duration, quick):
+    data_transmitter = modules["data_transmitter"]
+    results = [{
+        "name": "update_telemetry_sample",
+        "samples_per_second": measure_rate(data_transmitter.update_telemetry_sample, duration)
+    }]
+
+    # Several producers feeding the same publisher and registry
+    for producers in (2, 4):
+        counts = [0] * producers
+        stop = threading.Event()
+
+        def producer(index):
+            count = 0
+            while not stop.is_set():
+                for _ in range(100):
+                    data_transmitter.update_telemetry_sample()
+                count += 100
+            counts[index] = count
+
+        threads = [threading.Thread(target=producer, args=(index,)) for index in range(producers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        results.append({
+            "name": f"update_telemetry_sample_x{producers}",
+            "producers": producers,
+            "samples_per_second": sum(counts) / (time.perf_counter() - start)
+        })
+    return results
+
+# get_telemetry_data latency while a producer publishes and other readers poll
+def bench_snapshot_contention(modules, duration, quick):
+    data_transmitter = modules["data_transmitter"]
+    get_telemetry_data = data_transmitter.get_telemetry_data
+    perf_counter_ns = time.perf_counter_ns
+
+    timer_samples = []
+    for _ in range(10000):
+        started = perf_counter_ns()
+        timer_samples.append(perf_counter_ns() - started)
+    timer_overhead_ns = float(np.median(timer_samples))
+
+    results = []
+    for readers in READER_COUNTS:
+        stop = threading.Event()
+
+        def producer():
+            value = 0.0
+            while not stop.is_set():
+                data_transmitter.telemetry_publisher.publish({"voltage": value, "current": value, "temperature": value})
+                value += 1.0
+                time.sleep(0)
+
+        def reader():
+            while not stop.is_set():
+                for _ in range(100):
+                    get_telemetry_data()
+
+        threads = [threading.Thread(target=producer)] + [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+
+        samples = []
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            for _ in range(1000):
+                started = perf_counter_ns()
+                get_telemetry_data()
+                samples.append(perf_counter_ns() - started)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        result = {"name": f"get_telemetry_data_readers_{readers}", "other_readers": readers, "timer_overhead_ns": timer_overhead_ns}
+        result.update(latency_summary(samples))
+        results.append(result)
+    return results
+
+# Per-sample cost of the scalar check_*_fault path and the batched rule engine
+def bench_fault_checks(modules, duration, quick):
+    fault_detection = modules["fault_detection"]
+    rules = fault_detection.fault_rules
+    nominal = {channel: float((low + high) / 2) for channel, low, high in zip(rules.channels, rules.min_limits, rules.max_limits)}
+
+    voltage, current, temperature = nominal.get("voltage", 0.0), nominal.get("current", 0.0), nominal.get("temperature", 0.0)
+
+    def check_sample():
+        fault_detection.check_voltage_fault(voltage)
+        fault_detection.check_current_fault(current)
+        fault_detection.check_temperature_fault(temperature)
+
+    results = [
+        {"name": "check_voltage_fault", "per_sample_ns": 1e9 / measure_rate(lambda: fault_detection.check_voltage_fault(voltage), duration)},
+        {"name": "check_all_channels", "per_sample_ns": 1e9 / measure_rate(check_sample, duration)}
+    ]
+
+    # Vectorized evaluation of a whole batch of nominal samples
+    for batch_size in (100, 10000):
+        values = np.tile(np.array([nominal[channel] for channel in rules.channels]), (batch_size, 1))
+        rate = measure_rate(lambda: rules.evaluate(values), duration, batch=10)
+        results.append({"name": f"fault_rules_evaluate_{batch_size}", "batch_size": batch_size, "per_sample_ns": 1e9 / (rate * batch_size)})
+    return results
+
+# Power analysis history: append cost and plot preparation as the history grows
+def bench_power_analysis(modules, duration, quick):
+    power_analysis = modules["power_analysis"]
+    ring_buffer = modules["ring_buffer"]
+    live_plot = modules["live_plot"]
+    max_points = power_analysis.config.getint("power_analysis", "plot_max_points", fallback=2000)
+
+    results = [{
+        "name": "run_power_analysis_cycle",
+        "cycles_per_second": measure_rate(power_analysis.run_power_analysis_cycle, duration)
+    }]
+
+    rng = np.random.default_rng(0)
+    for size in (QUICK_HISTORY_SIZES if quick else HISTORY_SIZES):
+        history = ring_buffer.TimeSeriesRingBuffer(size)
+        values = rng.uniform(10.0, 20.0, size=(size, 4))
+        started = time.perf_counter()
+        for index, (voltage, current, power, efficiency) in enumerate(values.tolist()):
+            history.append(float(index), voltage, current, power, efficiency)
+        fill_seconds = time.perf_counter() - started
+
+        window = history.window()
+        results.append({
+            "name": f"history_{size}",
+            "history_size": size,
+            "append_ns": fill_seconds / size * 1e9,
+            "append_full_ns": 1e9 / measure_rate(lambda: history.append(0.0, 1.0, 1.0, 1.0, 100.0), duration / 4),
+            "window_us": 1e6 / measure_rate(history.window, duration / 4, batch=10),
+            "plot_prep_lttb_us": 1e6 / measure_rate(lambda: live_plot.downsample(window["timestamp"], window["power"], max_points), duration / 4, batch=1),
+            "plot_prep_minmax_us": 1e6 / measure_rate(lambda: live_plot.downsample(window["timestamp"], window["power"], max_points, method="minmax"), duration / 4, batch=1)
+        })
+    return results
+
+# Transmission against the local HTTP stand-in: single posts and batched uploads
+def bench_transmission(modules, duration, quick):
+    data_transmitter = modules["data_transmitter"]
+    sample = {"voltage": 12.0, "current": 3.0, "temperature": 35.0}
+
+    # send_telemetry_data prints every successful transmission; keep it off the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        single_rate = measure_rate(lambda: data_transmitter.send_telemetry_data(sample), duration, batch=10)
+    results = [{"name": "send_telemetry_data", "requests_per_second": single_rate, "samples_per_second": single_rate}]
+
+    for compress in (False, True):
+        transmitter = data_transmitter.BatchTelemetryTransmitter(
+            data_transmitter.config.get("server", "endpoint"),
+            batch_size=data_transmitter.config.getint("server", "batch_size", fallback=100),
+            compress=compress
+        )
+        transmitter.start()
+        submitted = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        while time.perf_counter() < deadline:
+            for _ in range(100):
+                transmitter.submit(sample)
+            submitted += 100
+        transmitter.stop()
+        elapsed = time.perf_counter() - start
+        metrics = transmitter.get_metrics()
+        results.append({
+            "name": "batch_transmitter_gzip" if compress else "batch_transmitter",
+            "samples_per_second": metrics["samples_sent"] / elapsed,
+            "submitted": submitted,
+            "batches_sent": metrics["batches_sent"],
+            "samples_dropped": metrics["samples_dropped"],
+            "mean_flush_latency_ms": metrics["mean_flush_latency"] * 1e3,
+            "last_payload_bytes": metrics["last_payload_bytes"]
+        })
+    return results
+
+# Synthetic fleet generation, alone and feeding a fleet registry, against a 10 Hz budget
+def bench_synthetic(modules, duration, quick):
+    synthetic_telemetry = modules["synthetic_telemetry"]
+    fleet_registry = modules["fleet_registry"]
+    results = []
+    for n_drones in (1000, 10000):
+        generator = synthetic_telemetry.SyntheticFleetGenerator(n_drones, rate=10.0, seed=0, start_time=0.0, fault_rate=0.001)
+        steps_per_second = measure_rate(generator.step, duration, batch=10)
+
+        registry = fleet_registry.FleetRegistry(capacity=n_drones)
+        drone_ids = [f"drone-{index}" for index in range(n_drones)]
+
+        def feed():
+            _, values, _ = generator.step()
+            registry.update_many(drone_ids, values)
+
+        fed_steps_per_second = measure_rate(feed, duration, batch=10)
+        results.append({
+            "name": f"fleet_{n_drones}",
+            "drones": n_drones,
+            "samples_per_second": steps_per_second * n_drones,
+            "registry_samples_per_second": fed_steps_per_second * n_drones,
+            "headroom_at_10hz": fed_steps_per_second / 10.0
+        })
+    return results
+
+BENCHMARKS = {
+    "ingest": bench_ingest,
+    "snapshot_contention": bench_snapshot_contention,
+    "fault_checks": bench_fault_checks,
+    "power_analysis": bench_power_analysis,
+    "transmission": bench_transmission,
+    "synthetic": bench_synthetic
+}
+
+# Describe where the numbers were measured
+def environment_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count()
+    }
+
+# Flatten results into {"benchmark/case/metric": value} for comparison
+def flatten_metrics(report):
+    metrics = {}
+    for benchmark, cases in report["results"].items():
+        for case in cases:
+            for key, value in case.items():
+                if key != "name" and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics[f"{benchmark}/{case['name']}/{key}"] = value
+    return metrics
+
+# Suffixes of the throughput (higher is better) and latency (lower is better) metrics
+THROUGHPUT_SUFFIXES = ("_per_second",)
+LATENCY_SUFFIXES = ("_ns", "_us", "_ms")
+
+# Calibration values reported for context only; they are not the code under test
+CALIBRATION_METRICS = ("timer_overhead_ns",)
+
+# Print the relative change of every throughput and latency metric present in both reports.
+# Rates (*_per_second) are better when higher; times are better when lower.
+def compare_reports(baseline, report, threshold=0.1):
+    old_metrics = flatten_metrics(baseline)
+    new_metrics = flatten_metrics(report)
+    print(f"Comparing against {baseline['environment'].get('commit')} (threshold {threshold:.0%})", file=sys.stderr)
+    regressions = 0
+    for key in sorted(old_metrics.keys() & new_metrics.keys()):
+        old, new = old_metrics[key], new_metrics[key]
+        if not old:
+            continue
+        metric = key.rsplit("/", 1)[-1]
+        if metric in CALIBRATION_METRICS or not metric.endswith(THROUGHPUT_SUFFIXES + LATENCY_SUFFIXES):
+            continue
+        change = (new - old) / old
+        higher_is_better = metric.endswith(THROUGHPUT_SUFFIXES)
+        worse = change < -threshold if higher_is_better else change > threshold
+        regressions += worse
+        print(f"{'REGRESSION' if worse else '':<10} {key:<70} {old:>14.4g} -> {new:>14.4g} ({change:+.1%})", file=sys.stderr)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the telemetry ingest, snapshot, detection, analysis and transmission paths.")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per measurement")
+    parser.add_argument("--quick", action="store_true", help="skip the largest history size")
+    parser.add_argument("--only", help="comma-separated benchmarks to run: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    server, endpoint = start_stand_in_server()
+    workspace = prepare_workspace(endpoint)
+    try:
+        modules = {name: importlib.import_module(name) for name in ("data_transmitter", "fault_detection", "power_analysis", "ring_buffer", "live_plot", "synthetic_telemetry", "fleet_registry")}
+        report = {
+            "environment": environment_info(),
+            "parameters": {"duration": args.duration, "quick": args.quick},
+            "results": {name: BENCHMARKS[name](modules, args.duration, args.quick) for name in selected}
+        }
+        modules["fault_detection"].alert_dispatcher.stop(timeout=1.0)
+        importlib.import_module("logging_setup").stop_logging()
+    finally:
+        server.shutdown()
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        regressions = compare_reports(baseline, report, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
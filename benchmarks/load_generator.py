@@ -0,0 +1,243 @@
+# Load generator: thousands of simulated drones against the stand-in server
+#
+# Every drone emits telemetry at --rate Hz through BatchTelemetryTransmitter
+# uplinks (drones are spread across --uplinks transmitters) while power
+# setpoints for random drones go through the PowerCommandChannel at
+# --command-rate commands/s. Without --telemetry-url/--command-url an
+# in-process StandInServer is started; it shares the interpreter with the
+# generator, so run `python stand_in_server.py` separately for cleaner numbers.
+# The report gives offered versus delivered throughput, end-to-end sample
+# latency (sample timestamp to server arrival) and command latency
+# (submission to confirmation) as JSON.
+#
+#   python benchmarks/load_generator.py [--drones 2000] [--rate 1.0] [--duration 10]
+#                                       [--latency 0.005] [--error-rate 0.01] [--max-rps 500]
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import configparser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import requests
+from command_channel import PowerCommandChannel
+from telemetry_uplink import BatchTelemetryTransmitter
+from stand_in_server import StandInServer
+
+# Generator tick; samples and commands due within a tick are submitted together
+TICK_INTERVAL = 0.05
+
+# Summarize latencies (seconds) as percentiles in milliseconds
+def latency_percentiles(latencies):
+    if not latencies:
+        return None
+    values = np.asarray(latencies) * 1e3
+    p50, p99, p999 = np.percentile(values, (50, 99, 99.9))
+    return {"p50": p50, "p99": p99, "p999": p999, "max": values.max(), "count": int(values.size)}
+
+# Class tracking when each drone's latest setpoint was submitted
+class CommandLatencyTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._submitted = {}
+        self.latencies = []
+
+    def submitted(self, drone_id, voltage, current):
+        with self._lock:
+            self._submitted[drone_id] = (voltage, current, time.monotonic())
+
+    # PowerCommandChannel on_success callback
+    def confirmed(self, drone_id, voltage, current):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._submitted.get(drone_id)
+            if entry is not None and entry[0] == voltage and entry[1] == current:
+                self.latencies.append(now - entry[2])
+
+# Run the load for `duration` seconds and return the report
+def run_load(args, telemetry_url, command_url, power_range):
+    rng = np.random.default_rng(args.seed)
+    drone_ids = [f"drone-{index}" for index in range(args.drones)]
+
+    session_timeout = (3.0, 5.0)
+    transmitters = [
+        BatchTelemetryTransmitter(telemetry_url, batch_size=args.batch_size, max_age=args.batch_max_age,
+                                  max_pending=args.max_pending, timeout=session_timeout[1], compress=not args.no_compress,
+                                  max_retries=args.max_retries)
+        for _ in range(args.uplinks)
+    ]
+    for transmitter in transmitters:
+        transmitter.start()
+
+    tracker = CommandLatencyTracker()
+    channel = PowerCommandChannel(command_url, timeout=session_timeout, max_retries=args.max_retries,
+                                  workers=args.command_workers, on_success=tracker.confirmed)
+    channel.start()
+
+    samples_per_tick = args.drones * args.rate * TICK_INTERVAL
+    commands_per_tick = args.command_rate * TICK_INTERVAL
+    sample_credit = command_credit = 0.0
+    next_drone = 0
+    generated = accepted = commands = 0
+    max_lag = 0.0
+
+    start = time.monotonic()
+    next_tick = start
+    while next_tick - start < args.duration:
+        lag = time.monotonic() - next_tick
+        if lag < 0:
+            time.sleep(-lag)
+        else:
+            max_lag = max(max_lag, lag)
+
+        # Telemetry for the next drones in round-robin order
+        sample_credit += samples_per_tick
+        count = int(sample_credit)
+        sample_credit -= count
+        if count:
+            now = time.time()
+            values = rng.uniform(
+                (power_range["min_voltage"], power_range["min_current"], 20.0),
+                (power_range["max_voltage"], power_range["max_current"], 60.0),
+                size=(count, 3)
+            ).round(2).tolist()
+            for voltage, current, temperature in values:
+                drone = next_drone
+                next_drone = (next_drone + 1) % args.drones
+                sample = {"drone_id": drone_ids[drone], "voltage": voltage, "current": current, "temperature": temperature, "timestamp": now}
+                accepted += transmitters[drone % args.uplinks].submit(sample, block=False)
+            generated += count
+
+        # Setpoints for random drones
+        command_credit += commands_per_tick
+        count = int(command_credit)
+        command_credit -= count
+        if count:
+            targets = rng.integers(0, args.drones, size=count).tolist()
+            settings = rng.uniform(
+                (power_range["min_voltage"], power_range["min_current"]),
+                (power_range["max_voltage"], power_range["max_current"]),
+                size=(count, 2)
+            ).round(2).tolist()
+            for drone, (voltage, current) in zip(targets, settings):
+                tracker.submitted(drone_ids[drone], voltage, current)
+                channel.submit(drone_ids[drone], voltage, current)
+            commands += count
+
+        next_tick += TICK_INTERVAL
+    generation_seconds = time.monotonic() - start
+
+    # Drain the uplinks and the command channel
+    for transmitter in transmitters:
+        transmitter.stop()
+    channel.wait_idle(timeout=args.drain_timeout)
+    channel.stop(timeout=args.drain_timeout)
+    elapsed = time.monotonic() - start
+
+    uplink_metrics = [transmitter.get_metrics() for transmitter in transmitters]
+    samples_sent = sum(metrics["samples_sent"] for metrics in uplink_metrics)
+    batches = sum(metrics["batches_sent"] + metrics["batches_failed"] for metrics in uplink_metrics)
+    flush_latency = sum(metrics["total_flush_latency"] for metrics in uplink_metrics)
+    command_metrics = channel.get_metrics()
+    return {
+        "parameters": vars(args),
+        "generation_seconds": generation_seconds,
+        "elapsed_seconds": elapsed,
+        "max_generator_lag_ms": max_lag * 1e3,
+        "telemetry": {
+            "offered_samples_per_second": args.drones * args.rate,
+            "generated": generated,
+            "accepted": accepted,
+            "rejected_backpressure": generated - accepted,
+            "samples_sent": samples_sent,
+            "samples_dropped": sum(metrics["samples_dropped"] for metrics in uplink_metrics),
+            "delivered_samples_per_second": samples_sent / elapsed,
+            "batches": batches,
+            "mean_flush_latency_ms": flush_latency / batches * 1e3 if batches else 0.0,
+            "max_flush_latency_ms": max(metrics["max_flush_latency"] for metrics in uplink_metrics) * 1e3
+        },
+        "commands": {
+            "offered_commands_per_second": args.command_rate,
+            "submitted": commands,
+            "sent": command_metrics["sent"],
+            "coalesced": command_metrics["coalesced"],
+            "superseded": command_metrics["superseded"],
+            "failed": command_metrics["failed"],
+            "retries": command_metrics["retries"],
+            "delivered_commands_per_second": command_metrics["sent"] / elapsed,
+            "round_trip_histogram_ms": command_metrics["latency_histogram_ms"],
+            "submit_to_confirm_ms": latency_percentiles(tracker.latencies)
+        }
+    }
+
+def main():
+    config = configparser.ConfigParser()
+    config.read("config.ini")
+
+    parser = argparse.ArgumentParser(description="Drive the telemetry uplink and power command channel with simulated drones.")
+    parser.add_argument("--drones", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=1.0, help="telemetry samples per second per drone")
+    parser.add_argument("--command-rate", type=float, default=100.0, help="power setpoints per second across the fleet")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of generated load")
+    parser.add_argument("--uplinks", type=int, default=4, help="batch transmitters the drones are spread across")
+    parser.add_argument("--batch-size", type=int, default=config.getint("server", "batch_size", fallback=100))
+    parser.add_argument("--batch-max-age", type=float, default=config.getfloat("server", "batch_max_age", fallback=1.0))
+    parser.add_argument("--max-pending", type=int, default=config.getint("server", "max_pending", fallback=10000))
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--command-workers", type=int, default=config.getint("power_adjustment", "command_workers", fallback=2))
+    parser.add_argument("--max-retries", type=int, default=config.getint("power_adjustment", "max_retries", fallback=3),
+                        help="retries per telemetry batch and per power command")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--telemetry-url", help="use an external telemetry endpoint instead of the in-process stand-in")
+    parser.add_argument("--command-url", help="use an external power command endpoint instead of the in-process stand-in")
+    parser.add_argument("--latency", type=float, default=0.0, help="in-process stand-in: seconds added to every request")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="in-process stand-in: fraction of requests failed with 503")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="in-process stand-in: request cap before 429 (0 = unlimited)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    power_range = {
+        "min_voltage": config.getfloat("power_range", "min_voltage", fallback=10.0),
+        "max_voltage": config.getfloat("power_range", "max_voltage", fallback=13.0),
+        "min_current": config.getfloat("power_range", "min_current", fallback=1.5),
+        "max_current": config.getfloat("power_range", "max_current", fallback=2.5)
+    }
+
+    server = None
+    if args.telemetry_url is None or args.command_url is None:
+        server = StandInServer(port=0, latency=args.latency, latency_jitter=args.latency_jitter,
+                               error_rate=args.error_rate, max_requests_per_second=args.max_rps, seed=args.seed)
+        server.start()
+    telemetry_url = args.telemetry_url or server.telemetry_url
+    command_url = args.command_url or server.command_url
+
+    try:
+        report = run_load(args, telemetry_url, command_url, power_range)
+        if server is not None:
+            report["server"] = server.get_stats()
+        elif args.telemetry_url:
+            # External stand-ins expose their counters at /stats
+            try:
+                stats_url = args.telemetry_url.rsplit("/", 1)[0] + "/stats"
+                report["server"] = requests.get(stats_url, timeout=5.0).json()
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+    finally:
+        if server is not None:
+            server.stop()
+
+    text = json.dumps(report, indent=2, default=float)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
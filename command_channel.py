@@ -0,0 +1,177 @@
+import time
+import uuid
+import bisect
+import logging
+import threading
+import collections
+import requests
+
+# Upper bounds (milliseconds) of the round-trip latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+# HTTP status codes worth retrying; anything else is a final answer
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+
+# Class sending power setpoints to the drone control API.
+# Only the newest pending setpoint per drone is kept: a setpoint submitted
+# while an older one is still queued replaces it, and a retry is abandoned as
+# soon as a newer target exists. Requests share one keep-alive session with
+# (connect, read) timeouts, carry an idempotency key so a retried command is
+# applied at most once, and back off exponentially up to `backoff_max`.
+class PowerCommandChannel:
+    def __init__(self, api_url, timeout=(3.0, 5.0), max_retries=3, backoff_base=0.1, backoff_max=2.0, workers=2, session=None, on_success=None):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.workers = workers
+        self.on_success = on_success
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._ready = collections.deque()
+        self._in_flight = set()
+        self._threads = []
+        self._stop = False
+        self._histogram = [0] * len(LATENCY_BUCKETS_MS)
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "sent": 0,
+            "failed": 0,
+            "superseded": 0,
+            "retries": 0
+        }
+
+    # Start the worker threads
+    def start(self):
+        with self._condition:
+            if self._threads:
+                return
+            self._stop = False
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"PowerCommandChannel-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    # Send what is pending, then stop the worker threads
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+            threads = self._threads
+            self._threads = []
+        for thread in threads:
+            thread.join(timeout)
+
+    # Queue a setpoint for a drone, replacing any setpoint not yet sent
+    def submit(self, drone_id, voltage, current):
+        self.start()
+        command = {"command_id": uuid.uuid4().hex, "voltage": voltage, "current": current, "submitted": time.monotonic()}
+        with self._condition:
+            self._stats["submitted"] += 1
+            if drone_id in self._pending:
+                self._stats["coalesced"] += 1
+            elif drone_id not in self._in_flight:
+                self._ready.append(drone_id)
+            self._pending[drone_id] = command
+            self._condition.notify()
+        return command["command_id"]
+
+    # Block until no setpoint is pending or in flight (or the timeout expires)
+    def wait_idle(self, timeout=None):
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    # Get counters and the round-trip latency histogram
+    def get_metrics(self):
+        with self._condition:
+            metrics = dict(self._stats)
+            metrics["pending"] = len(self._pending)
+            metrics["latency_histogram_ms"] = {
+                ("inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self._histogram)
+            }
+        return metrics
+
+    # Record one request round trip
+    def _record_latency(self, seconds):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000.0)
+        with self._condition:
+            self._histogram[bucket] += 1
+
+    # True if a newer setpoint for this drone arrived after `command`
+    def _superseded(self, drone_id):
+        with self._condition:
+            return drone_id in self._pending
+
+    # POST one command, retrying transient failures with bounded backoff
+    def _deliver(self, drone_id, command):
+        payload = {"drone_id": drone_id, "voltage": command["voltage"], "current": command["current"], "command_id": command["command_id"]}
+        headers = {"Idempotency-Key": command["command_id"]}
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                if self._superseded(drone_id):
+                    with self._condition:
+                        self._stats["superseded"] += 1
+                    return
+                delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+                with self._condition:
+                    if self._condition.wait_for(lambda: self._stop or drone_id in self._pending, delay):
+                        # A newer setpoint replaces this one; on shutdown the retry is abandoned
+                        if drone_id in self._pending:
+                            self._stats["superseded"] += 1
+                        else:
+                            self._stats["failed"] += 1
+                            logging.error("Abandoned power settings for %s on shutdown. Status code: %s", drone_id, status)
+                        return
+                    self._stats["retries"] += 1
+
+            started = time.monotonic()
+            try:
+                response = self.session.post(self.api_url, json=payload, headers=headers, timeout=self.timeout)
+                status = response.status_code
+            except requests.exceptions.RequestException as e:
+                status = None
+                logging.error("Failed to make the HTTP request: %s", e)
+            self._record_latency(time.monotonic() - started)
+
+            if status == 200:
+                with self._condition:
+                    self._stats["sent"] += 1
+                if self.on_success is not None:
+                    self.on_success(drone_id, command["voltage"], command["current"])
+                logging.info("Power settings adjusted successfully.")
+                return
+            if status is not None and status not in RETRYABLE_STATUS:
+                break
+        with self._condition:
+            self._stats["failed"] += 1
+        logging.error("Failed to adjust power settings for %s. Status code: %s", drone_id, status)
+
+    # Worker loop: take the next drone with a pending setpoint and deliver it
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._ready or self._stop)
+                if not self._ready:
+                    return
+                drone_id = self._ready.popleft()
+                command = self._pending.pop(drone_id)
+                self._in_flight.add(drone_id)
+
+            try:
+                self._deliver(drone_id, command)
+            finally:
+                with self._condition:
+                    self._in_flight.discard(drone_id)
+                    if drone_id in self._pending:
+                        self._ready.append(drone_id)
+                    self._condition.notify_all()
@@ -0,0 +1,125 @@
+import time
+import logging
+import threading
+
+# Class describing one control-loop stage and its scheduling state
+class Stage:
+    def __init__(self, name, func, period, priority, critical=False):
+        self.name = name
+        self.func = func
+        self.period = period
+        self.priority = priority
+        self.critical = critical
+        self.next_due = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.deferred = 0
+        self.skipped = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+
+    def get_stats(self):
+        return {
+            "period": self.period,
+            "priority": self.priority,
+            "critical": self.critical,
+            "runs": self.runs,
+            "errors": self.errors,
+            "deferred": self.deferred,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration
+        }
+
+# Class running control-loop stages on their own deadlines.
+# Each tick runs the stages that are due, in priority order (lower number
+# first). Once the tick has used up `tick_budget` seconds, remaining
+# non-critical stages are deferred to the next tick; a stage that falls a
+# whole period behind skips the missed runs instead of bursting. Critical
+# stages (e.g. fault handling) always run. Between ticks the loop sleeps until
+# the earliest next deadline rather than for a fixed delay. With an
+# `instruments` registry (see instrumentation.py) every stage duration, tick
+# duration and tick overrun is also recorded under "<prefix>.<stage>".
+class ControlLoopScheduler:
+    def __init__(self, tick_budget=0.1, clock=time.monotonic, instruments=None, prefix="control_loop"):
+        self.tick_budget = tick_budget
+        self.clock = clock
+        self.instruments = instruments
+        self.prefix = prefix
+        self.stages = []
+        self.ticks = 0
+        self.tick_overruns = 0
+
+    # Register a stage called as func(context) every `period` seconds
+    def add_stage(self, name, func, period, priority, critical=False):
+        stage = Stage(name, func, period, priority, critical)
+        stage.histogram = self.instruments.histogram(f"{self.prefix}.{name}") if self.instruments is not None else None
+        self.stages.append(stage)
+        self.stages.sort(key=lambda item: item.priority)
+        return stage
+
+    # Run one stage and update its statistics
+    def _run_stage(self, stage, context, now):
+        started = self.clock()
+        try:
+            stage.func(context)
+        except Exception as e:
+            stage.errors += 1
+            if stage.histogram is not None:
+                stage.histogram.errors += 1
+            logging.error("Control loop stage %s failed: %s", stage.name, e)
+        stage.last_duration = self.clock() - started
+        stage.max_duration = max(stage.max_duration, stage.last_duration)
+        if stage.histogram is not None:
+            stage.histogram.record(stage.last_duration)
+        stage.runs += 1
+
+        # Keep the stage on its own grid; jump ahead if it fell behind
+        stage.next_due += stage.period
+        if stage.next_due <= now:
+            missed = int((now - stage.next_due) // stage.period) + 1
+            stage.skipped += missed
+            stage.next_due += missed * stage.period
+
+    # Run every due stage once; returns the time of the next deadline
+    def tick(self, context):
+        tick_start = self.clock()
+        self.ticks += 1
+        over_budget = False
+        for stage in self.stages:
+            if stage.next_due > tick_start:
+                continue
+            if over_budget and not stage.critical:
+                stage.deferred += 1
+                continue
+            self._run_stage(stage, context, tick_start)
+            if not over_budget and self.clock() - tick_start > self.tick_budget:
+                over_budget = True
+                self.tick_overruns += 1
+        if self.instruments is not None:
+            tick_name = f"{self.prefix}.tick"
+            self.instruments.record(tick_name, self.clock() - tick_start)
+            if over_budget:
+                self.instruments.count_overrun(tick_name)
+        return min(stage.next_due for stage in self.stages)
+
+    # Run ticks until stop_event is set, sleeping until each next deadline
+    def run(self, context=None, stop_event=None):
+        context = {} if context is None else context
+        stop_event = threading.Event() if stop_event is None else stop_event
+        start = self.clock()
+        for stage in self.stages:
+            stage.next_due = start
+        while not stop_event.is_set():
+            next_deadline = self.tick(context)
+            delay = next_deadline - self.clock()
+            if delay > 0:
+                stop_event.wait(delay)
+
+    # Get scheduler and per-stage statistics
+    def get_stats(self):
+        return {
+            "ticks": self.ticks,
+            "tick_overruns": self.tick_overruns,
+            "stages": {stage.name: stage.get_stats() for stage in self.stages}
+        }
@@ -0,0 +1,341 @@
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import configparser
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QMainWindow, QScrollArea, QWidget
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF, QTransform
+from PyQt5.QtCore import QRectF, Qt, QTimer
+from fleet_registry import fleet_registry
+from instrumentation import instruments
+from qt_bridge import TelemetryBridge
+
+# Load configuration from config.ini
+config = configparser.ConfigParser()
+config.read("config.ini")
+
+# Charted channels: (name, unit, colour); power is derived from voltage and current
+DASHBOARD_CHANNELS = (
+    ("voltage", "V", "#1f77b4"),
+    ("current", "A", "#2ca02c"),
+    ("power", "W", "#9467bd"),
+    ("temperature", "°C", "#d62728")
+)
+
+# Grid geometry in pixels
+LABEL_WIDTH = 90
+HEADER_HEIGHT = 22
+ROW_HEIGHT = 48
+CELL_PADDING = 3
+
+# Function to build a QPolygonF from an (n, 2) array by copying into its point storage
+def polygon_from_array(points):
+    polygon = QPolygonF(len(points))
+    if len(points):
+        storage = polygon.data()
+        storage.setsize(len(points) * 16)
+        np.frombuffer(storage, dtype=np.float64)[:] = points.reshape(-1)
+    return polygon
+
+# Class holding the recent history of a fixed set of drones in one preallocated
+# (time, drone, channel) block. As in TimeSeriesRingBuffer every sample is
+# written twice, at i and i + capacity, so the history is always one
+# contiguous view. Min/max decimation then runs over all drones and channels
+# in a single reshape; bucket boundaries are anchored to the absolute sample
+# count so they do not shift (and the traces do not shimmer) as the window scrolls.
+class FleetStripBuffer:
+    def __init__(self, capacity, drone_ids, channels=tuple(name for name, _, _ in DASHBOARD_CHANNELS)):
+        self.capacity = int(capacity)
+        self.drone_ids = list(drone_ids)
+        self.channels = tuple(channels)
+        self.lock = threading.Lock()
+        self._timestamps = np.zeros(2 * self.capacity)
+        self._values = np.zeros((2 * self.capacity, len(self.drone_ids), len(self.channels)))
+        self._next = 0
+        self._count = 0
+        self._total = 0
+
+    def __len__(self):
+        return self._count
+
+    # Append one fleet sample; values is (n_drones, n_channels)
+    def append(self, timestamp, values):
+        with self.lock:
+            low = self._next
+            self._timestamps[low] = self._timestamps[low + self.capacity] = timestamp
+            self._values[low] = self._values[low + self.capacity] = values
+            self._next = (low + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._total += 1
+
+    # Get the newest fleet sample, (n_drones, n_channels)
+    def latest(self):
+        with self.lock:
+            return self._values[(self._next - 1) % self.capacity].copy()
+
+    # Reduce the history to at most `buckets` min/max pairs per drone and channel.
+    # Returns (times, low, high) with low/high shaped (n_points, n_drones, n_channels),
+    # or None while the buffer is empty.
+    def decimate(self, buckets):
+        with self.lock:
+            count = self._count
+            if count == 0:
+                return None
+            stop = self._next + self.capacity if count == self.capacity else self._next
+            timestamps = self._timestamps[stop - count:stop]
+            values = self._values[stop - count:stop]
+            per_bucket = max(1, -(-self.capacity // max(1, buckets)))
+            if per_bucket == 1:
+                return timestamps.copy(), values.copy(), values.copy()
+
+            # Whole buckets aligned to the absolute sample index, then the newest partial bucket
+            skip = (count - self._total) % per_bucket
+            whole = (count - skip) // per_bucket
+            tail = count - skip - whole * per_bucket
+            blocks = values[skip:skip + whole * per_bucket].reshape(whole, per_bucket, *values.shape[1:])
+            times = timestamps[skip:skip + whole * per_bucket:per_bucket]
+            low = blocks.min(axis=1)
+            high = blocks.max(axis=1)
+            if tail:
+                times = np.append(times, timestamps[count - tail])
+                low = np.concatenate([low, values[count - tail:].min(axis=0, keepdims=True)])
+                high = np.concatenate([high, values[count - tail:].max(axis=0, keepdims=True)])
+            return times, low, high
+
+# Function to turn decimated history into a render-ready frame: one polygon per
+# drone and channel in unit cell coordinates (x: 0 = `span` seconds ago,
+# 1 = now; y: 0 = top of the auto-scaled range), plus the value labels.
+# Runs on the sampling thread so the GUI thread only draws.
+@instruments.timed("dashboard.prepare")
+def prepare_dashboard_frame(buffer, buckets, span):
+    decimated = buffer.decimate(buckets)
+    if decimated is None:
+        return None
+    times, low, high = decimated
+    now = time.time()
+
+    # Auto-scale every trace to its own range with a little headroom
+    floor = low.min(axis=0)
+    ceiling = high.max(axis=0)
+    padding = np.maximum((ceiling - floor) * 0.1, np.maximum(np.abs(ceiling) * 0.01, 1e-6))
+    floor -= padding
+    scale = 1.0 / (ceiling + padding - floor)
+
+    # Interleave each bucket's min and max into one polyline
+    n_drones, n_channels = low.shape[1:]
+    points = np.empty((n_drones, n_channels, 2 * len(times), 2))
+    points[..., 0] = np.repeat(1.0 - (now - times) / span, 2)
+    points[..., 0::2, 1] = (1.0 - (low - floor) * scale).transpose(1, 2, 0)
+    points[..., 1::2, 1] = (1.0 - (high - floor) * scale).transpose(1, 2, 0)
+
+    latest = buffer.latest()
+    units = [unit for _, unit, _ in DASHBOARD_CHANNELS]
+    return {
+        "drone_ids": buffer.drone_ids,
+        "polygons": [[polygon_from_array(points[drone, channel]) for channel in range(n_channels)] for drone in range(n_drones)],
+        "labels": [[f"{value:.2f} {unit}" for value, unit in zip(row, units)] for row in latest.tolist()]
+    }
+
+# Class painting the whole drone x channel grid of strip charts in one widget,
+# so a frame is a single paint event however many drones are shown
+class StripChartGrid(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = None
+        self.bucket_count = 64
+        self.paint_histogram = instruments.histogram("dashboard.paint")
+        self._pens = [QPen(QColor(colour), 0) for _, _, colour in DASHBOARD_CHANNELS]
+        self._grid_pen = QPen(QColor("#cccccc"), 0)
+        self.setMinimumWidth(LABEL_WIDTH + 4 * 120)
+
+    # Column width of one chart at the current size
+    def cell_width(self):
+        return max(1.0, (self.width() - LABEL_WIDTH) / len(DASHBOARD_CHANNELS))
+
+    def resizeEvent(self, event):
+        # About one min/max pair per two pixels
+        self.bucket_count = max(16, int(self.cell_width()) // 2)
+        super().resizeEvent(event)
+
+    # GUI thread: show a prepared frame
+    def set_frame(self, frame):
+        if frame is None:
+            return
+        if self.frame is None or len(frame["drone_ids"]) != len(self.frame["drone_ids"]):
+            self.setMinimumHeight(HEADER_HEIGHT + ROW_HEIGHT * len(frame["drone_ids"]))
+        self.frame = frame
+        self.update()
+
+    def paintEvent(self, event):
+        started = time.perf_counter_ns()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        cell_width = self.cell_width()
+        for column, (name, unit, _) in enumerate(DASHBOARD_CHANNELS):
+            painter.drawText(QRectF(LABEL_WIDTH + column * cell_width, 0, cell_width, HEADER_HEIGHT), Qt.AlignCenter, f"{name.capitalize()} ({unit})")
+
+        frame = self.frame
+        if frame is not None:
+            # Only rows intersecting the exposed area are drawn
+            exposed = event.rect()
+            first_row = max(0, (exposed.top() - HEADER_HEIGHT) // ROW_HEIGHT)
+            last_row = min(len(frame["drone_ids"]), (exposed.bottom() - HEADER_HEIGHT) // ROW_HEIGHT + 1)
+            inner_width = cell_width - 2 * CELL_PADDING
+            inner_height = ROW_HEIGHT - 2 * CELL_PADDING
+            for row in range(first_row, last_row):
+                top = HEADER_HEIGHT + row * ROW_HEIGHT
+                painter.resetTransform()
+                painter.setPen(Qt.black)
+                painter.drawText(QRectF(4, top, LABEL_WIDTH - 8, ROW_HEIGHT), Qt.AlignVCenter | Qt.AlignLeft, str(frame["drone_ids"][row]))
+                for column in range(len(DASHBOARD_CHANNELS)):
+                    left = LABEL_WIDTH + column * cell_width
+                    painter.resetTransform()
+                    painter.setPen(self._grid_pen)
+                    painter.drawRect(QRectF(left + 1, top + 1, cell_width - 2, ROW_HEIGHT - 2))
+                    painter.setPen(Qt.darkGray)
+                    painter.drawText(QRectF(left, top + 2, cell_width - 6, 14), Qt.AlignRight | Qt.AlignTop, frame["labels"][row][column])
+
+                    # Polygons are in unit coordinates; cosmetic pens keep one-pixel lines
+                    painter.setTransform(QTransform(inner_width, 0, 0, inner_height, left + CELL_PADDING, top + CELL_PADDING))
+                    painter.setPen(self._pens[column])
+                    painter.drawPolyline(frame["polygons"][row][column])
+        painter.end()
+        self.paint_histogram.record_ns(time.perf_counter_ns() - started)
+
+# Class showing live strip charts of voltage, current, power and temperature
+# for every drone in the fleet registry (up to `max_drones`). A sampling
+# thread copies the registry into a FleetStripBuffer every `sample_interval`
+# seconds and, when the GUI is ready for another frame, decimates it and
+# builds the polygons; the TelemetryBridge hands at most one frame per
+# display refresh to the GUI thread, which only paints.
+class FleetDashboard(QMainWindow):
+    def __init__(self, registry=fleet_registry, drone_ids=None, history=60.0, sample_interval=0.02,
+                 frame_rate=60.0, max_drones=48, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Fleet Telemetry Dashboard")
+        self.registry = registry
+        self.fixed_drone_ids = list(drone_ids) if drone_ids is not None else None
+        self.history = history
+        self.sample_interval = sample_interval
+        self.max_drones = max_drones
+        self.buffer = None
+        self.samples = 0
+
+        self.grid = StripChartGrid()
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.grid)
+        self.setCentralWidget(scroll_area)
+        self.resize(LABEL_WIDTH + 4 * 240, 720)
+
+        self.bridge = TelemetryBridge(prepare=self._prepare_frame, frame_rate=frame_rate, parent=self)
+        self.bridge.frame_ready.connect(self.grid.set_frame)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # Build a frame from the current buffer; runs on the sampling thread
+    def _prepare_frame(self, buckets):
+        return prepare_dashboard_frame(self.buffer, buckets, self.history)
+
+    # Copy the registry into the buffer; a changed drone list starts a new buffer
+    def _sample(self):
+        drone_ids = self.fixed_drone_ids or self.registry.drone_ids()[:self.max_drones]
+        if not drone_ids:
+            return False
+        if self.buffer is None or self.buffer.drone_ids != drone_ids:
+            self.buffer = FleetStripBuffer(max(2, int(round(self.history / self.sample_interval))), drone_ids)
+        _, values, _ = self.registry.snapshot(drone_ids, channels=("voltage", "current", "temperature"))
+        self.buffer.append(time.time(), np.column_stack([values[:, 0], values[:, 1], values[:, 0] * values[:, 1], values[:, 2]]))
+        self.samples += 1
+        return True
+
+    def _run(self):
+        next_sample = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                if self._sample() and not self.bridge.pending:
+                    self.bridge.submit(self.grid.bucket_count)
+            except Exception as e:
+                logging.error(f"Failed to update the dashboard: {str(e)}")
+            next_sample += self.sample_interval
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_sample = time.monotonic()
+
+    # Start sampling; called by showEvent
+    def start(self):
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="dashboard-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def showEvent(self, event):
+        self.start()
+        super().showEvent(event)
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
+
+    # Get frame delivery and paint time statistics
+    def get_stats(self):
+        stats = self.bridge.get_stats()
+        stats["samples"] = self.samples
+        stats["paint"] = self.grid.paint_histogram.to_dict()
+        stats["prepare"] = instruments.histogram("dashboard.prepare").to_dict()
+        return stats
+
+# Function to create a dashboard from the [user_interface] configuration
+def create_dashboard(registry=fleet_registry, drone_ids=None):
+    return FleetDashboard(
+        registry,
+        drone_ids,
+        history=config.getfloat("user_interface", "dashboard_history", fallback=60.0),
+        sample_interval=config.getfloat("user_interface", "dashboard_sample_interval", fallback=0.02),
+        frame_rate=config.getfloat("user_interface", "frame_rate", fallback=60.0),
+        max_drones=config.getint("user_interface", "dashboard_max_drones", fallback=48)
+    )
+
+# Show the dashboard for a simulated fleet:
+#   python dashboard.py [--drones 24] [--duration 10]
+# With --duration the window closes after that many seconds and frame and
+# paint statistics are printed as JSON (use QT_QPA_PLATFORM=offscreen headless).
+if __name__ == "__main__":
+    from fleet_registry import FleetRegistry
+    from synthetic_telemetry import SyntheticFleetGenerator, run_synthetic_fleet
+
+    parser = argparse.ArgumentParser(description="Live strip charts for a simulated drone fleet.")
+    parser.add_argument("--drones", type=int, default=24)
+    parser.add_argument("--rate", type=float, default=50.0, help="telemetry samples per second per drone")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, help="close after this many seconds and print statistics")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    registry = FleetRegistry(capacity=max(args.drones, 1))
+    generator = SyntheticFleetGenerator(args.drones, rate=args.rate, seed=args.seed)
+    stop_event = threading.Event()
+    threading.Thread(target=run_synthetic_fleet, args=(generator, registry, stop_event), daemon=True).start()
+
+    dashboard = create_dashboard(registry)
+    dashboard.max_drones = max(dashboard.max_drones, args.drones)
+    dashboard.show()
+    if args.duration:
+        QTimer.singleShot(int(args.duration * 1000), dashboard.close)
+        QTimer.singleShot(int(args.duration * 1000), app.quit)
+    app.exec_()
+    stop_event.set()
+    dashboard.stop()
+    if args.duration:
+        print(json.dumps(dashboard.get_stats(), indent=2))
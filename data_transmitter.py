@@ -1,68 +1,87 @@
-import random
 import time
 import threading
 import requests
 import logging
 import configparser
+from logging_setup import configure_logging, get_sample_logger
+from fleet_registry import fleet_registry
+from snapshot import SnapshotPublisher
+from synthetic_telemetry import SyntheticFleetGenerator
+from telemetry_uplink import BatchTelemetryTransmitter, create_http_session
 
-# Initialize a logger to record telemetry data and errors
-logging.basicConfig(filename="telemetry.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Initialize a logger to record telemetry data and errors (written by a background listener)
+configure_logging()
+sample_logger = get_sample_logger("data_transmitter")
 
 # Load configuration from the "config.ini" file
 config = configparser.ConfigParser()
 config.read("config.ini")
 
-# Define global variables for telemetry data
-telemetry_data = {
+# Publish telemetry data as immutable snapshots so readers never take a lock
+telemetry_publisher = SnapshotPublisher({
     "voltage": 0.0,
     "current": 0.0,
     "temperature": 0.0
-}
+})
 
-# Define a lock for thread safety when accessing telemetry data
-telemetry_lock = threading.Lock()
+# Identifier of this drone in the fleet registry
+DRONE_ID = config.get("fleet", "drone_id", fallback="drone-0")
+
+# Simulated drone (battery, load and thermal models configured in [data_generation])
+telemetry_generator = SyntheticFleetGenerator.from_config(config)
+telemetry_generator_lock = threading.Lock()
+
+# Function to read one telemetry sample from the drone
+def update_telemetry_sample():
+    # Simulate data retrieval from the drone (replace this with actual drone communication)
+    with telemetry_generator_lock:
+        timestamp, values, _ = telemetry_generator.step()
+    voltage, current, temperature = values[0].tolist()
+    voltage = round(voltage, 2)
+    current = round(current, 2)
+    temperature = round(temperature, 1)
+
+    # Publish the new telemetry data
+    sample = {"voltage": voltage, "current": current, "temperature": temperature}
+    telemetry_publisher.publish(sample, timestamp)
+    fleet_registry.update(DRONE_ID, sample, timestamp)
+
+    # Log the telemetry data
+    sample_logger.log(sample)
 
 # Function to continuously update telemetry data from the drone
 def update_telemetry_data():
-    global telemetry_data
+    update_interval = config.getfloat("data_generation", "update_interval")
     while True:
         try:
-            # Simulate data retrieval from the drone (replace this with actual drone communication)
-            voltage = round(random.uniform(config.getfloat("data_generation", "min_voltage"), config.getfloat("data_generation", "max_voltage")), 2)
-            current = round(random.uniform(config.getfloat("data_generation", "min_current"), config.getfloat("data_generation", "max_current")), 2)
-            temperature = round(random.uniform(config.getfloat("data_generation", "min_temperature"), config.getfloat("data_generation", "max_temperature")), 1)
-
-            # Update the telemetry data dictionary
-            with telemetry_lock:
-                telemetry_data["voltage"] = voltage
-                telemetry_data["current"] = current
-                telemetry_data["temperature"] = temperature
-
-            # Log the telemetry data
-            logging.info(f"Voltage: {voltage} V, Current: {current} A, Temperature: {temperature} °C")
-
-            time.sleep(config.getfloat("data_generation", "update_interval"))
+            update_telemetry_sample()
+            time.sleep(update_interval)
 
         except Exception as e:
             logging.error(f"Failed to update telemetry data: {str(e)}")
             time.sleep(1)  # Wait for a short duration before retrying
 
-# Function to get the latest telemetry data
+# Function to get the latest telemetry data (read-only; use dict() for a mutable copy)
 def get_telemetry_data():
-    global telemetry_data
-    with telemetry_lock:
-        return telemetry_data.copy()
+    return telemetry_publisher.latest_data()
+
+# Function to get the latest versioned telemetry snapshot
+def get_telemetry_snapshot():
+    return telemetry_publisher.latest()
 
 # Function to start the telemetry data update thread
 def start_telemetry_update_thread():
     telemetry_thread = threading.Thread(target=update_telemetry_data)
     telemetry_thread.start()
 
+# Shared session so single-shot transmissions reuse connections as well
+http_session = create_http_session()
+
 # Function to send telemetry data to a server
 def send_telemetry_data(data):
     try:
         # Replace "http://your_server_url/telemetry" with the actual endpoint URL to your server
-        response = requests.post(config.get("server", "endpoint"), json=data)
+        response = http_session.post(config.get("server", "endpoint"), json=data, timeout=config.getfloat("server", "request_timeout", fallback=5.0))
 
         # Check if the data was successfully transmitted (status code 200)
         if response.status_code == 200:
@@ -73,12 +92,37 @@ def send_telemetry_data(data):
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to transmit telemetry data: {str(e)}")
 
+# Function to queue the latest telemetry of every drone in the fleet for upload
+def submit_fleet_telemetry(transmitter, registry=fleet_registry):
+    for drone_id, sample in registry.snapshot_dicts().items():
+        sample["drone_id"] = drone_id
+        transmitter.submit(sample)
+
+# Function to create a batch transmitter from the [server] configuration
+def create_batch_transmitter():
+    return BatchTelemetryTransmitter(
+        config.get("server", "endpoint"),
+        batch_size=config.getint("server", "batch_size", fallback=100),
+        max_age=config.getfloat("server", "batch_max_age", fallback=1.0),
+        max_pending=config.getint("server", "max_pending", fallback=10000),
+        timeout=config.getfloat("server", "request_timeout", fallback=5.0),
+        compress=config.getboolean("server", "compress", fallback=True),
+        max_retries=config.getint("server", "max_retries", fallback=3),
+        backoff_base=config.getfloat("server", "backoff_base", fallback=0.1),
+        backoff_max=config.getfloat("server", "backoff_max", fallback=2.0)
+    )
+
 # Function to continuously transmit telemetry data to a server
 def transmit_telemetry_data():
-    while True:
-        telemetry_data = get_telemetry_data()
-        send_telemetry_data(telemetry_data)
-        time.sleep(config.getfloat("server", "transmission_interval"))
+    transmitter = create_batch_transmitter()
+    transmitter.start()
+    try:
+        while True:
+            telemetry_data = get_telemetry_data()
+            transmitter.submit(telemetry_data)
+            time.sleep(config.getfloat("server", "transmission_interval"))
+    finally:
+        transmitter.stop()
 
 if __name__ == "__main__":
     start_telemetry_update_thread()
@@ -0,0 +1,235 @@
+import logging
+import threading
+import numpy as np
+
+# Drone id used for samples published without one
+DEFAULT_DRONE_ID = "drone-0"
+
+# Predicate: the channel value lies in [low, high] (either bound may be None)
+def channel_range(channel, low=None, high=None):
+    return ("range", channel, -np.inf if low is None else float(low), np.inf if high is None else float(high), True)
+
+# Predicate: the channel value lies outside [low, high]
+def outside_range(channel, low=None, high=None):
+    return ("range", channel, -np.inf if low is None else float(low), np.inf if high is None else float(high), False)
+
+# Predicate: the channel changed by at least `min_change` since the drone's
+# previous sample; direction is "any", "rise" or "fall"
+def channel_delta(channel, min_change, direction="any"):
+    if direction not in ("any", "rise", "fall"):
+        raise ValueError(f"Unknown delta direction: {direction}")
+    return ("delta", channel, float(min_change), direction)
+
+# Predicate: the sample comes from one of the given drones
+def drone_set(drone_ids):
+    return ("drones", frozenset(drone_ids))
+
+# Class describing one subscriber: a callback and the predicates that must all hold
+class Subscription:
+    def __init__(self, callback, predicates, name):
+        self.callback = callback
+        self.predicates = tuple(predicates)
+        self.name = name
+        self.matches = 0
+        self.errors = 0
+
+# Class dispatching telemetry events to subscribers with declarative predicates.
+# Subscriptions are compiled into a shared table of distinct predicates, each
+# evaluated once per published batch as a vectorized column check (ranges and
+# deltas for all samples at once, drone sets by a per-drone lookup table).
+# Subscriptions are indexed by their predicate set: each distinct set is ANDed
+# over just its own predicate rows once per batch, and every subscription with
+# that set reuses the result. Each subscriber with matches then gets a single
+# callback for the whole batch, in subscription order. The work per batch
+# therefore grows with the distinct predicate sets, not with subscribers
+# times samples.
+class TelemetryEventBus:
+    def __init__(self, channels=("voltage", "current", "temperature")):
+        self.channels = tuple(channels)
+        self._columns = {name: index for index, name in enumerate(self.channels)}
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        self._compiled = None
+
+        # Per-drone state for deltas and stale-sample filtering
+        self._drone_index = {}
+        self._drone_ids = []
+        self._last_values = np.empty((0, len(self.channels)))
+        self._last_timestamps = np.empty(0)
+
+    # Register callback(events) for samples matching every predicate; returns the subscription
+    def subscribe(self, callback, *predicates, name=None):
+        for predicate in predicates:
+            if predicate[0] in ("range", "delta") and predicate[1] not in self._columns:
+                raise ValueError(f"Unknown telemetry channel: {predicate[1]}")
+        subscription = Subscription(callback, predicates, name or getattr(callback, "__name__", "subscriber"))
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+            self._compiled = None
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions = [item for item in self._subscriptions if item is not subscription]
+            self._compiled = None
+
+    # Build the distinct predicate table and index the subscriptions by predicate set
+    def _compile(self):
+        subscriptions = self._subscriptions
+        predicates = {}
+        predicate_sets = {}
+        subscription_sets = []
+        for subscription in subscriptions:
+            rows = frozenset(predicates.setdefault(predicate, len(predicates)) for predicate in subscription.predicates)
+            subscription_sets.append(predicate_sets.setdefault(rows, len(predicate_sets)))
+
+        ordered = list(predicates)
+        ranges = [(index, predicate) for index, predicate in enumerate(ordered) if predicate[0] == "range"]
+        deltas = [(index, predicate) for index, predicate in enumerate(ordered) if predicate[0] == "delta"]
+        drones = [(index, predicate) for index, predicate in enumerate(ordered) if predicate[0] == "drones"]
+        return {
+            "subscriptions": subscriptions,
+            "predicate_count": len(ordered),
+            "predicate_sets": [np.array(sorted(rows), dtype=np.intp) for rows in predicate_sets],
+            "subscription_sets": subscription_sets,
+            "range_rows": np.array([index for index, _ in ranges], dtype=np.intp),
+            "range_columns": np.array([self._columns[predicate[1]] for _, predicate in ranges], dtype=np.intp),
+            "range_low": np.array([predicate[2] for _, predicate in ranges]),
+            "range_high": np.array([predicate[3] for _, predicate in ranges]),
+            "range_inside": np.array([predicate[4] for _, predicate in ranges], dtype=bool),
+            "delta_rows": np.array([index for index, _ in deltas], dtype=np.intp),
+            "delta_columns": np.array([self._columns[predicate[1]] for _, predicate in deltas], dtype=np.intp),
+            "delta_min": np.array([predicate[2] for _, predicate in deltas]),
+            "delta_sign": np.array([{"any": 0.0, "rise": 1.0, "fall": -1.0}[predicate[3]] for _, predicate in deltas]),
+            "drone_rows": [index for index, _ in drones],
+            "drone_sets": [predicate[1] for _, predicate in drones],
+            "drone_members": [np.zeros(0, dtype=bool) for _ in drones]
+        }
+
+    # Membership of every known drone in each drone-set predicate, extended as drones appear
+    def _drone_members(self, compiled):
+        members = compiled["drone_members"]
+        known = len(self._drone_ids)
+        for index, (drone_ids_set, mask) in enumerate(zip(compiled["drone_sets"], members)):
+            if len(mask) < known:
+                extra = np.fromiter((drone_id in drone_ids_set for drone_id in self._drone_ids[len(mask):]), dtype=bool, count=known - len(mask))
+                members[index] = np.concatenate([mask, extra])
+        return members
+
+    # Map drone ids to state rows, registering new drones
+    def _drone_rows(self, drone_ids):
+        index = self._drone_index
+        new_ids = [drone_id for drone_id in dict.fromkeys(drone_ids) if drone_id not in index]
+        if new_ids:
+            for drone_id in new_ids:
+                index[drone_id] = len(self._drone_ids)
+                self._drone_ids.append(drone_id)
+            self._last_values = np.vstack([self._last_values, np.full((len(new_ids), len(self.channels)), np.nan)])
+            self._last_timestamps = np.concatenate([self._last_timestamps, np.full(len(new_ids), -np.inf)])
+        return np.fromiter((index[drone_id] for drone_id in drone_ids), dtype=np.intp, count=len(drone_ids))
+
+    # Change of every channel since each row's previous sample from the same drone
+    # (earlier rows of the batch first, then the stored state); updates the state
+    def _deltas(self, rows, values, timestamps):
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        sorted_values = values[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = sorted_rows[1:] != sorted_rows[:-1]
+        last = np.ones(len(rows), dtype=bool)
+        last[:-1] = first[1:]
+
+        previous = np.empty_like(sorted_values)
+        previous[1:] = sorted_values[:-1]
+        previous[first] = self._last_values[sorted_rows[first]]
+        deltas = np.empty_like(values)
+        deltas[order] = sorted_values - previous
+
+        self._last_values[sorted_rows[last]] = sorted_values[last]
+        self._last_timestamps[sorted_rows[last]] = timestamps[order][last]
+        return deltas
+
+    # Publish a batch: values is (n_samples, n_channels) in bus channel order.
+    # Samples not newer than the last one seen from the same drone are skipped,
+    # so re-publishing an unchanged fleet snapshot fires nothing. Returns the
+    # number of (sample, subscription) matches dispatched.
+    def publish(self, values, drone_ids=None, timestamps=None):
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.channels))
+        count = len(values)
+        if count == 0:
+            return 0
+        if drone_ids is None:
+            drone_ids = [DEFAULT_DRONE_ID] * count
+        timestamps = np.broadcast_to(np.asarray(np.nan if timestamps is None else timestamps, dtype=np.float64), (count,))
+
+        with self._lock:
+            if self._compiled is None:
+                self._compiled = self._compile()
+            compiled = self._compiled
+
+            rows = self._drone_rows(drone_ids)
+            fresh = ~(timestamps <= self._last_timestamps[rows])
+            if not fresh.all():
+                keep = np.flatnonzero(fresh)
+                rows, values, timestamps = rows[keep], values[keep], timestamps[keep]
+                drone_ids = [drone_ids[index] for index in keep.tolist()]
+                count = len(keep)
+                if count == 0:
+                    return 0
+            deltas = self._deltas(rows, values, timestamps)
+            drone_members = self._drone_members(compiled)
+            drone_ids = np.asarray(drone_ids, dtype=object)
+
+        subscriptions = compiled["subscriptions"]
+        if not subscriptions:
+            return 0
+
+        # Evaluate every distinct predicate once for the whole batch (one row per predicate)
+        truth = np.zeros((compiled["predicate_count"], count), dtype=bool)
+        if len(compiled["range_rows"]):
+            selected = values[:, compiled["range_columns"]]
+            inside = (selected >= compiled["range_low"]) & (selected <= compiled["range_high"])
+            truth[compiled["range_rows"]] = np.where(compiled["range_inside"], inside, ~inside & ~np.isnan(selected)).T
+        if len(compiled["delta_rows"]):
+            changes = deltas[:, compiled["delta_columns"]]
+            signed = np.where(compiled["delta_sign"] == 0.0, np.abs(changes), changes * compiled["delta_sign"])
+            truth[compiled["delta_rows"]] = (signed >= compiled["delta_min"]).T
+        for predicate_row, members in zip(compiled["drone_rows"], drone_members):
+            truth[predicate_row] = members[rows]
+
+        # Samples matching each distinct predicate set: all of its predicates hold
+        set_matches = [
+            np.flatnonzero(truth[predicate_rows].all(axis=0)) if len(predicate_rows) else np.arange(count)
+            for predicate_rows in compiled["predicate_sets"]
+        ]
+
+        dispatched = 0
+        for subscription, predicate_set in zip(subscriptions, compiled["subscription_sets"]):
+            rows_matched = set_matches[predicate_set]
+            if len(rows_matched) == 0:
+                continue
+            dispatched += len(rows_matched)
+            subscription.matches += len(rows_matched)
+            events = {
+                "name": subscription.name,
+                "channels": self.channels,
+                "drone_ids": drone_ids[rows_matched],
+                "timestamps": timestamps[rows_matched],
+                "values": values[rows_matched],
+                "deltas": deltas[rows_matched]
+            }
+            try:
+                subscription.callback(events)
+            except Exception as e:
+                subscription.errors += 1
+                logging.error("Telemetry event subscriber %s failed: %s", subscription.name, e)
+        return dispatched
+
+    # Publish one telemetry dictionary
+    def publish_sample(self, telemetry_data, drone_id=None, timestamp=None):
+        values = [telemetry_data.get(name, np.nan) for name in self.channels]
+        return self.publish([values], None if drone_id is None else [drone_id], timestamp)
+
+    # Get per-subscription match and error counts
+    def get_stats(self):
+        return {subscription.name: {"matches": subscription.matches, "errors": subscription.errors} for subscription in self._subscriptions}
@@ -2,87 +2,132 @@ import time
 import threading
 import logging
 import configparser
-import smtplib
-from email.mime.text import MIMEText
-from data_transmitter import get_telemetry_data
+from logging_setup import configure_logging
+import numpy as np
+from data_transmitter import get_telemetry_snapshot
+from fault_rules import FaultRuleEngine, CHANNEL_UNITS
+from anomaly_detection import StreamingAnomalyDetector
+from alert_dispatcher import create_alert_dispatcher
+from fleet_registry import fleet_registry
 
-# Initialize a logger to record fault detection results and errors
-logging.basicConfig(filename="fault_detection.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Initialize a logger to record fault detection results and errors (written by a background listener)
+configure_logging()
 
 # Load configuration from the "config.ini" file
 config = configparser.ConfigParser()
 config.read("config.ini")
 
+# Compile the [fault_detection] limits once instead of reading them per sample
+fault_rules = FaultRuleEngine.from_config(config)
+
+# Track sliding-window anomalies on the same channels, for this drone and the fleet
+anomaly_detector = StreamingAnomalyDetector.from_config(config, fault_rules.channels)
+fleet_anomaly_detector = StreamingAnomalyDetector.from_config(config, fault_rules.channels, n_drones=0)
+
+# Deliver notifications from a background worker so detection never waits on SMTP
+alert_dispatcher = create_alert_dispatcher(config)
+
+# Function to run one fault detection pass on the latest telemetry data
+def run_fault_detection_cycle():
+    # Retrieve the latest telemetry snapshot from the data_transmitter script
+    snapshot = get_telemetry_snapshot()
+    telemetry_data = snapshot.data
+
+    # Check every configured channel for potential faults in one pass
+    fault_mask = fault_rules.evaluate_sample(telemetry_data)
+    report_faults(telemetry_data, fault_mask)
+
+    # Check for drift and spikes that stay within the hard limits
+    # (a snapshot that was already checked has the same timestamp and is skipped)
+    check_anomalies(telemetry_data, snapshot.timestamp)
+    return fault_mask
+
+# Function to run the streaming anomaly detector on one telemetry sample
+# taken at `timestamp` (default: the sample's "timestamp", else now)
+def check_anomalies(telemetry_data, timestamp=None):
+    if timestamp is None:
+        timestamp = telemetry_data.get("timestamp", time.time())
+    values = np.array([[telemetry_data.get(name, np.nan) for name in fault_rules.channels]])
+    anomalies = anomaly_detector.update(values, timestamp)
+    report_anomalies(values, anomalies, anomaly_detector)
+    return anomalies
+
+# Function to run the streaming anomaly detector on every drone in the fleet at once
+def run_fleet_anomaly_detection(registry=fleet_registry):
+    drone_ids, values, timestamps = registry.snapshot(channels=fault_rules.channels)
+    fleet_anomaly_detector.align(drone_ids)
+    anomalies = fleet_anomaly_detector.update(values, timestamps)
+    report_anomalies(values, anomalies, fleet_anomaly_detector, drone_ids)
+    return anomalies
+
+# Function to log and notify every anomaly flagged by a detector update
+def report_anomalies(values, anomalies, detector, drone_ids=None):
+    for drone_index, channel, kind in detector.describe(anomalies):
+        value = values[drone_index, detector.channels.index(channel)]
+        message = f"Potential {channel} anomaly detected ({kind}): {value} {CHANNEL_UNITS.get(channel, '')}".rstrip()
+        alert_channel = f"anomaly:{channel}"
+        if drone_ids is not None:
+            message = f"[{drone_ids[drone_index]}] {message}"
+            alert_channel = f"{drone_ids[drone_index]}:{alert_channel}"
+        logging.warning(message)
+        send_email_notification(message, alert_channel)
+
+# Function to evaluate a batch of telemetry samples (e.g. one per drone) at once
+def detect_faults_batch(samples):
+    return fault_rules.evaluate(fault_rules.to_matrix(samples))
+
+# Function to check the latest telemetry of every drone in the fleet at once
+def run_fleet_fault_detection(registry=fleet_registry):
+    drone_ids, values, _ = registry.snapshot(channels=fault_rules.channels)
+    fault_masks = fault_rules.evaluate(values)
+    for row in np.flatnonzero(fault_masks):
+        report_faults(dict(zip(fault_rules.channels, values[row].tolist())), fault_masks[row], drone_ids[row])
+    return dict(zip(drone_ids, fault_masks.tolist()))
+
+# Function to log and notify every channel flagged in a fault bitmask
+def report_faults(telemetry_data, fault_mask, drone_id=None):
+    for channel in fault_rules.describe(fault_mask):
+        message = fault_rules.format_fault(channel, telemetry_data.get(channel, np.nan))
+        if drone_id is not None:
+            message = f"[{drone_id}] {message}"
+        logging.warning(message)
+        send_email_notification(message, channel if drone_id is None else f"{drone_id}:{channel}")
+
 # Function to perform fault detection on telemetry data
 def perform_fault_detection():
     while True:
         try:
-            # Retrieve the latest telemetry data from the data_transmitter script
-            telemetry_data = get_telemetry_data()
-
-            # Extract voltage, current, and temperature from telemetry data
-            voltage = telemetry_data.get("voltage", 0.0)
-            current = telemetry_data.get("current", 0.0)
-            temperature = telemetry_data.get("temperature", 0.0)
-
-            # Check for potential faults or anomalies in the telemetry data
-            check_voltage_fault(voltage)
-            check_current_fault(current)
-            check_temperature_fault(temperature)
-
+            run_fault_detection_cycle()
             time.sleep(config.getfloat("fault_detection", "update_interval"))
 
         except Exception as e:
             logging.error(f"Failed to perform fault detection: {str(e)}")
             time.sleep(1)  # Wait for a short duration before retrying
 
+# Function to check a single channel against its compiled limits (channels without limits are not checked)
+def check_channel_fault(channel, value):
+    if channel not in fault_rules.channel_bits:
+        return
+    index = fault_rules.channels.index(channel)
+    if value < fault_rules.min_limits[index] or value > fault_rules.max_limits[index]:
+        report_faults({channel: value}, fault_rules.channel_bits[channel])
+
 # Function to check for voltage faults
 def check_voltage_fault(voltage):
-    min_voltage = config.getfloat("fault_detection", "min_voltage")
-    max_voltage = config.getfloat("fault_detection", "max_voltage")
-    if voltage < min_voltage or voltage > max_voltage:
-        logging.warning(f"Potential voltage fault detected: {voltage} V")
-        send_email_notification(f"Potential voltage fault detected: {voltage} V")
+    check_channel_fault("voltage", voltage)
 
 # Function to check for current faults
 def check_current_fault(current):
-    min_current = config.getfloat("fault_detection", "min_current")
-    max_current = config.getfloat("fault_detection", "max_current")
-    if current < min_current or current > max_current:
-        logging.warning(f"Potential current fault detected: {current} A")
-        send_email_notification(f"Potential current fault detected: {current} A")
+    check_channel_fault("current", current)
 
 # Function to check for temperature faults
 def check_temperature_fault(temperature):
-    min_temperature = config.getfloat("fault_detection", "min_temperature")
-    max_temperature = config.getfloat("fault_detection", "max_temperature")
-    if temperature < min_temperature or temperature > max_temperature:
-        logging.warning(f"Potential temperature fault detected: {temperature} °C")
-        send_email_notification(f"Potential temperature fault detected: {temperature} °C")
-
-# Function to send email notifications
-def send_email_notification(message):
-    try:
-        sender_email = config.get("email_notification", "sender_email")
-        receiver_email = config.get("email_notification", "receiver_email")
-        smtp_server = config.get("email_notification", "smtp_server")
-        smtp_port = config.getint("email_notification", "smtp_port")
-        smtp_username = config.get("email_notification", "smtp_username")
-        smtp_password = config.get("email_notification", "smtp_password")
-
-        msg = MIMEText(message)
-        msg['Subject'] = 'Drone Fault Detected'
-        msg['From'] = sender_email
-        msg['To'] = receiver_email
-
-        with smtplib.SMTP_SSL(smtp_server, smtp_port) as server:
-            server.login(smtp_username, smtp_password)
-            server.sendmail(sender_email, [receiver_email], msg.as_string())
-
-        logging.info("Email notification sent.")
-
-    except Exception as e:
-        logging.error(f"Failed to send email notification: {str(e)}")
+    check_channel_fault("temperature", temperature)
+
+# Function to send email notifications (queued; repeated alerts per channel are coalesced)
+def send_email_notification(message, channel="general"):
+    if not alert_dispatcher.submit(channel, message):
+        logging.error("Failed to queue email notification: alert queue is full")
 
 if __name__ == "__main__":
     # Start the fault detection thread
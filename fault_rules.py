@@ -0,0 +1,64 @@
+import numpy as np
+
+# Display units of the known telemetry channels
+CHANNEL_UNITS = {
+    "voltage": "V",
+    "current": "A",
+    "temperature": "°C",
+    "power": "W"
+}
+
+# Class holding threshold rules compiled into limit arrays.
+# Every "min_<channel>" / "max_<channel>" key of the config section becomes a
+# rule, so a new channel only needs new config entries. Samples are evaluated
+# as an (n_samples, n_channels) matrix in one vectorized comparison and each
+# row yields a bitmask with bit i set when channel i is out of range.
+class FaultRuleEngine:
+    def __init__(self, channels, min_limits, max_limits):
+        if len(channels) > 64:
+            raise ValueError("At most 64 channels fit in a fault bitmask")
+        self.channels = tuple(channels)
+        self.min_limits = np.asarray(min_limits, dtype=np.float64)
+        self.max_limits = np.asarray(max_limits, dtype=np.float64)
+        self.channel_bits = {name: 1 << index for index, name in enumerate(self.channels)}
+        self._weights = np.left_shift(np.uint64(1), np.arange(len(self.channels), dtype=np.uint64))
+
+    # Compile the rules of a config section (a channel may define only one limit)
+    @classmethod
+    def from_config(cls, config, section="fault_detection"):
+        limits = {}
+        for key in config.options(section):
+            bound, _, channel = key.partition("_")
+            if bound in ("min", "max") and channel:
+                limits.setdefault(channel, [-np.inf, np.inf])
+                limits[channel][0 if bound == "min" else 1] = config.getfloat(section, key)
+        channels = list(limits)
+        return cls(channels, [limits[name][0] for name in channels], [limits[name][1] for name in channels])
+
+    # Convert telemetry dictionaries into an (n_samples, n_channels) matrix; missing channels are NaN
+    def to_matrix(self, samples):
+        matrix = np.full((len(samples), len(self.channels)), np.nan)
+        for row, sample in enumerate(samples):
+            matrix[row] = [sample.get(name, np.nan) for name in self.channels]
+        return matrix
+
+    # Evaluate a sample matrix (or a single row) and return one bitmask per sample.
+    # NaN means "no data" and never counts as a violation.
+    def evaluate(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        violations = ((values < self.min_limits) | (values > self.max_limits)) & ~np.isnan(values)
+        return (violations * self._weights).sum(axis=-1, dtype=np.uint64)
+
+    # Evaluate one telemetry dictionary and return its bitmask as an int
+    def evaluate_sample(self, telemetry_data):
+        return int(self.evaluate([telemetry_data.get(name, np.nan) for name in self.channels]))
+
+    # List the channel names whose bits are set in a bitmask
+    def describe(self, mask):
+        mask = int(mask)
+        return [name for name, bit in self.channel_bits.items() if mask & bit]
+
+    # Build the log/notification message for a channel violation
+    def format_fault(self, channel, value):
+        unit = CHANNEL_UNITS.get(channel, "")
+        return f"Potential {channel} fault detected: {value} {unit}".rstrip()
@@ -0,0 +1,169 @@
+import time
+import threading
+import configparser
+import numpy as np
+
+# Load configuration from the "config.ini" file
+config = configparser.ConfigParser()
+config.read("config.ini")
+
+# Telemetry channels stored for every drone
+FLEET_CHANNELS = ("voltage", "current", "temperature")
+
+# Class holding the latest telemetry of many drones in columnar slots.
+# Each drone owns one row of a preallocated (capacity, n_channels) matrix.
+# Writers only lock the shard that owns their row, so updates for different
+# drones rarely contend; batch reads lock every shard once and copy the whole
+# block, which is far cheaper than one locked dict copy per drone.
+# A drone's ID is published only after its first sample is stored, so batch
+# readers never see a registered row that holds no data yet; channels without
+# data are NaN.
+class FleetRegistry:
+    def __init__(self, channels=FLEET_CHANNELS, capacity=256, shards=16):
+        self.channels = tuple(channels)
+        self._channel_index = {name: index for index, name in enumerate(self.channels)}
+        self._shard_locks = [threading.Lock() for _ in range(shards)]
+        self._registry_lock = threading.Lock()
+        self._slots = {}
+        self._drone_ids = []
+        self._values = np.full((capacity, len(self.channels)), np.nan)
+        self._timestamps = np.full(capacity, np.nan)
+
+    def __len__(self):
+        return len(self._drone_ids)
+
+    def __contains__(self, drone_id):
+        return drone_id in self._slots
+
+    # Get the IDs of all registered drones in slot order
+    def drone_ids(self):
+        return list(self._drone_ids)
+
+    # Lock every shard (used for growth and consistent batch reads)
+    def _lock_all(self):
+        for lock in self._shard_locks:
+            lock.acquire()
+
+    def _unlock_all(self):
+        for lock in reversed(self._shard_locks):
+            lock.release()
+
+    # Get the slot of a drone, registering it on first sight. The initial row
+    # (NaN unless `values` is given) and timestamp are written before the ID
+    # becomes visible to drone_ids() and snapshot().
+    def register(self, drone_id, values=None, timestamp=None):
+        slot = self._slots.get(drone_id)
+        if slot is not None:
+            return slot
+        with self._registry_lock:
+            slot = self._slots.get(drone_id)
+            if slot is not None:
+                return slot
+            slot = len(self._drone_ids)
+            if slot == len(self._values):
+                self._grow(2 * len(self._values))
+            with self._shard_locks[slot % len(self._shard_locks)]:
+                self._values[slot] = np.nan if values is None else values
+                self._timestamps[slot] = np.nan if timestamp is None else timestamp
+            self._slots[drone_id] = slot
+            self._drone_ids.append(drone_id)
+            return slot
+
+    # Reallocate the slot arrays (caller holds the registry lock)
+    def _grow(self, capacity):
+        self._lock_all()
+        try:
+            values = np.full((capacity, len(self.channels)), np.nan)
+            timestamps = np.full(capacity, np.nan)
+            values[:len(self._values)] = self._values
+            timestamps[:len(self._timestamps)] = self._timestamps
+            self._values = values
+            self._timestamps = timestamps
+        finally:
+            self._unlock_all()
+
+    # Store the latest telemetry of one drone; unknown channels are ignored
+    def update(self, drone_id, telemetry_data, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        slot = self._slots.get(drone_id)
+        if slot is None:
+            slot = self.register(drone_id, [telemetry_data.get(name, np.nan) for name in self.channels], timestamp)
+        with self._shard_locks[slot % len(self._shard_locks)]:
+            row = self._values[slot]
+            for name, value in telemetry_data.items():
+                index = self._channel_index.get(name)
+                if index is not None:
+                    row[index] = value
+            self._timestamps[slot] = timestamp
+
+    # Store a block of samples at once; `values` is (len(drone_ids), n_channels)
+    def update_many(self, drone_ids, values, timestamps=None):
+        values = np.asarray(values, dtype=np.float64)
+        if timestamps is None:
+            timestamps = time.time()
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (len(drone_ids),))
+        slots = np.fromiter(
+            (self._slots[drone_id] if drone_id in self._slots else self.register(drone_id, values[index], timestamps[index])
+             for index, drone_id in enumerate(drone_ids)),
+            dtype=np.intp, count=len(drone_ids)
+        )
+        self._lock_all()
+        try:
+            self._values[slots] = values
+            self._timestamps[slots] = timestamps
+        finally:
+            self._unlock_all()
+
+    # Get the latest telemetry of one drone as a dictionary
+    def get(self, drone_id):
+        slot = self._slots[drone_id]
+        with self._shard_locks[slot % len(self._shard_locks)]:
+            sample = dict(zip(self.channels, self._values[slot].tolist()))
+            sample["timestamp"] = float(self._timestamps[slot])
+        return sample
+
+    # Copy the telemetry of many drones (all by default) in one locked pass.
+    # Returns (drone_ids, values, timestamps) where values has one row per drone
+    # and one column per requested channel; channels the registry does not
+    # store are returned as NaN.
+    def snapshot(self, drone_ids=None, channels=None):
+        if drone_ids is None:
+            drone_ids = self.drone_ids()
+            slots = slice(0, len(drone_ids))
+        else:
+            slots = np.fromiter((self._slots[drone_id] for drone_id in drone_ids), dtype=np.intp, count=len(drone_ids))
+
+        self._lock_all()
+        try:
+            values = self._values[slots].copy()
+            timestamps = self._timestamps[slots].copy()
+        finally:
+            self._unlock_all()
+
+        if channels is not None and tuple(channels) != self.channels:
+            projected = np.full((len(values), len(channels)), np.nan)
+            for column, name in enumerate(channels):
+                index = self._channel_index.get(name)
+                if index is not None:
+                    projected[:, column] = values[:, index]
+            values = projected
+        return list(drone_ids), values, timestamps
+
+    # Get the latest telemetry of many drones as dictionaries keyed by drone ID
+    def snapshot_dicts(self, drone_ids=None):
+        drone_ids, values, timestamps = self.snapshot(drone_ids)
+        return {
+            drone_id: dict(zip(self.channels, row), timestamp=timestamp)
+            for drone_id, row, timestamp in zip(drone_ids, values.tolist(), timestamps.tolist())
+        }
+
+# Function to create a fleet registry from the [fleet] configuration
+def create_fleet_registry():
+    return FleetRegistry(
+        capacity=config.getint("fleet", "capacity", fallback=256),
+        shards=config.getint("fleet", "shards", fallback=16)
+    )
+
+# Shared registry used by the ground station subsystems
+fleet_registry = create_fleet_registry()
@@ -0,0 +1,167 @@
+import json
+import time
+import signal
+import functools
+import threading
+
+# Latency buckets are powers of two in nanoseconds: bucket 0 holds everything
+# up to 1024 ns (~1 µs), bucket i holds (2^(9+i), 2^(10+i)] ns, and the last
+# bucket (~34 s and up) is open-ended
+LATENCY_BUCKET_COUNT = 26
+
+# Bucket index for each possible bit length of (duration - 1) in nanoseconds;
+# subtracting one keeps exact powers of two in the bucket they bound
+_BUCKET_BY_BIT_LENGTH = tuple(min(max(bits - 10, 0), LATENCY_BUCKET_COUNT - 1) for bits in range(65))
+
+# Upper bound (seconds) of each bucket, for reporting
+LATENCY_BUCKET_BOUNDS = tuple(2 ** (10 + index) / 1e9 for index in range(LATENCY_BUCKET_COUNT - 1)) + (float("inf"),)
+
+# Class counting durations in fixed buckets.
+# Recording is a bit_length() table lookup plus a few integer updates and
+# takes no lock; concurrent writers can at worst lose an increment, which is
+# an accepted trade-off for keeping the hooks on in production.
+class LatencyHistogram:
+    __slots__ = ("name", "counts", "count", "total_ns", "max_ns", "overruns", "errors")
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = [0] * LATENCY_BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.overruns = 0
+        self.errors = 0
+
+    def record_ns(self, elapsed):
+        self.counts[_BUCKET_BY_BIT_LENGTH[(elapsed - 1).bit_length()]] += 1
+        self.count += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+
+    def record(self, seconds):
+        self.record_ns(max(int(seconds * 1e9), 0))
+
+    # Estimate a percentile (seconds) from the buckets: the upper bound of the bucket reached
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKET_BOUNDS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ns / 1e9)
+        return self.max_ns / 1e9
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "overruns": self.overruns,
+            "errors": self.errors,
+            "mean": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "max": self.max_ns / 1e9,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "buckets": {("inf" if bound == float("inf") else f"{bound:.3g}"): count for bound, count in zip(LATENCY_BUCKET_BOUNDS, self.counts) if count}
+        }
+
+# Context manager timing one block into a histogram
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.record_ns(time.perf_counter_ns() - self.started)
+        return False
+
+# Class holding named latency histograms for stages and loops
+class Instrumentation:
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    # Get (creating on first use) the histogram for a name
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(name))
+        return histogram
+
+    # Context manager: with instruments.timer("stage"): ...
+    # It costs a name lookup and an allocation per use; prefer timed() or
+    # histogram(name).record_ns() on per-sample paths.
+    def timer(self, name):
+        return _Timer(self.histogram(name))
+
+    # Decorator recording every call of the wrapped function under `name`
+    def timed(self, name=None):
+        def decorator(func):
+            histogram = self.histogram(name or func.__qualname__)
+            record_ns = histogram.record_ns
+            perf_counter_ns = time.perf_counter_ns
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    record_ns(perf_counter_ns() - started)
+            return wrapper
+        return decorator
+
+    # Record a duration measured elsewhere
+    def record(self, name, seconds):
+        self.histogram(name).record(seconds)
+
+    # Count a tick or loop iteration that overran its period
+    def count_overrun(self, name):
+        self.histogram(name).overruns += 1
+
+    # Count a call that raised instead of completing
+    def count_error(self, name):
+        self.histogram(name).errors += 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def to_dict(self):
+        # Copy the items under the lock: this also runs from the dump signal
+        # handler, possibly while another thread is adding a histogram
+        with self._lock:
+            items = sorted(self._histograms.items())
+        return {name: histogram.to_dict() for name, histogram in items}
+
+    def dump_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def dump_text(self):
+        lines = [f"{'name':<40} {'count':>9} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'overruns':>8} {'errors':>6}"]
+        for name, stats in self.to_dict().items():
+            lines.append(
+                f"{name:<40} {stats['count']:>9} {stats['mean'] * 1e3:>9.3f} {stats['p50'] * 1e3:>9.3f} "
+                f"{stats['p99'] * 1e3:>9.3f} {stats['max'] * 1e3:>9.3f} {stats['overruns']:>8} {stats['errors']:>6}"
+            )
+        return "\n".join(lines)
+
+    # Write the current statistics to a file (JSON if the name ends in .json, text otherwise)
+    def dump(self, path):
+        with open(path, "w") as file:
+            file.write(self.dump_json() if path.endswith(".json") else self.dump_text())
+
+    # Dump to `path` whenever the process receives `signum` (e.g. kill -USR1 <pid>)
+    def install_dump_signal(self, path, signum=getattr(signal, "SIGUSR1", None)):
+        if signum is not None:
+            signal.signal(signum, lambda received, frame: self.dump(path))
+
+# Shared instrumentation used by the control loop and background threads
+instruments = Instrumentation()
@@ -0,0 +1,145 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+# Function to decimate a series to at most `n_points` points keeping each bucket's min and max
+# plus the first and last points. Works on whole buckets with reshape, so it is
+# a single vectorized pass; the series is padded with its last value to fill
+# the final bucket, so samples at the end are never dropped.
+def minmax_decimate(x, y, n_points):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= n_points:
+        return x, y
+    n_buckets = max(1, (n_points - 2) // 2)
+    bucket = -(-len(y) // n_buckets)
+    padded = np.concatenate([y, np.full(bucket * n_buckets - len(y), y[-1], dtype=y.dtype)])
+    blocks = padded.reshape(n_buckets, bucket)
+    offsets = np.arange(n_buckets) * bucket
+    low = np.minimum(offsets + blocks.argmin(axis=1), len(y) - 1)
+    high = np.minimum(offsets + blocks.argmax(axis=1), len(y) - 1)
+    indices = np.unique(np.concatenate([[0], low, high, [len(y) - 1]]))
+    return x[indices], y[indices]
+
+# Function to downsample a series with Largest-Triangle-Three-Buckets.
+# The first and last points are kept and each bucket contributes the point
+# forming the largest triangle with the previous pick and the next bucket's mean.
+def lttb(x, y, n_points):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    length = len(y)
+    if n_points >= length or n_points < 3:
+        return x, y
+
+    every = (length - 2) / (n_points - 2)
+    bounds = (np.arange(n_points - 1) * every).astype(np.intp) + 1
+    bounds[-1] = length - 1
+    indices = np.empty(n_points, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = length - 1
+
+    # Mean of every bucket (the last one holds only the final point), computed in one pass
+    counts = np.diff(np.append(bounds, length))
+    mean_x = np.add.reduceat(x, bounds) / counts
+    mean_y = np.add.reduceat(y, bounds) / counts
+
+    previous = 0
+    for bucket in range(n_points - 2):
+        start, stop = bounds[bucket], bounds[bucket + 1]
+        next_x = mean_x[bucket + 1]
+        next_y = mean_y[bucket + 1]
+        px = x[previous]
+        py = y[previous]
+        areas = np.abs((px - next_x) * (y[start:stop] - py) - (px - x[start:stop]) * (next_y - py))
+        previous = start + int(areas.argmax())
+        indices[bucket + 1] = previous
+    return x[indices], y[indices]
+
+# Function to reduce a series to screen resolution.
+# Very long inputs are first min/max decimated to a few points per pixel so
+# the LTTB pass always sees a bounded number of points.
+def downsample(x, y, n_points, method="lttb"):
+    if len(y) <= n_points:
+        return np.asarray(x), np.asarray(y)
+    if method == "minmax":
+        return minmax_decimate(x, y, n_points)
+    x, y = minmax_decimate(x, y, 8 * n_points)
+    return lttb(x, y, n_points)
+
+# Class drawing a persistent figure whose lines are updated in place.
+# The figure and lines are created once; each refresh only swaps line data
+# (downsampled to `max_points`) and blits the axes over a cached background.
+# A full redraw happens only when the data leaves the current axis limits.
+# Min/max decimation is the default: it is one vectorized pass (about 1 ms
+# for 100k samples), while LTTB picks points one bucket at a time and costs
+# tens of milliseconds per series at 2000 points, too slow for every frame.
+class LivePlot:
+    def __init__(self, series, title, xlabel="Time", max_points=2000, method="minmax", figsize=(10, 8)):
+        self.series = list(series)
+        self.max_points = max_points
+        self.method = method
+        self.fig, axes = plt.subplots(nrows=len(self.series), ncols=1, figsize=figsize, sharex=True, squeeze=False)
+        self.axes = axes[:, 0]
+        self.lines = {}
+        for ax, (name, label, color) in zip(self.axes, self.series):
+            (line,) = ax.plot([], [], label=label, color=color, animated=True)
+            ax.set_ylabel(label)
+            ax.grid()
+            self.lines[name] = line
+        self.axes[-1].set_xlabel(xlabel)
+        self.fig.suptitle(title)
+        self.fig.tight_layout()
+        self._background = None
+        self._limits = {}
+
+    # Show the window without blocking the caller
+    def show(self):
+        plt.show(block=False)
+        self.redraw()
+
+    # Full redraw; caches the static background for blitting
+    def redraw(self):
+        canvas = self.fig.canvas
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    # Draw the animated lines on top of the cached background
+    def _draw_lines(self):
+        for ax, (name, _, _) in zip(self.axes, self.series):
+            ax.draw_artist(self.lines[name])
+        self.fig.canvas.blit(self.fig.bbox)
+
+    # Expand the limits of an axis (with headroom) if the data no longer fits
+    def _fit_limits(self, ax, name, x, y):
+        if not len(x):
+            return False
+        x_low, x_high = float(x[0]), float(x[-1])
+        y_low, y_high = float(np.nanmin(y)), float(np.nanmax(y))
+        limits = self._limits.get(name)
+        if limits and limits[0] <= x_low and x_high <= limits[1] and limits[2] <= y_low and y_high <= limits[3]:
+            return False
+        x_pad = max((x_high - x_low) * 0.1, 1e-9)
+        y_pad = max((y_high - y_low) * 0.1, abs(y_high) * 0.01, 1e-9)
+        limits = (x_low, x_high + x_pad, y_low - y_pad, y_high + y_pad)
+        ax.set_xlim(limits[0], limits[1])
+        ax.set_ylim(limits[2], limits[3])
+        self._limits[name] = limits
+        return True
+
+    # Replace the plotted data: `x` is shared, `columns` maps series name to y values
+    def update(self, x, columns):
+        rescaled = False
+        for ax, (name, _, _) in zip(self.axes, self.series):
+            plot_x, plot_y = downsample(x, columns[name], self.max_points, self.method)
+            self.lines[name].set_data(plot_x, plot_y)
+            rescaled |= self._fit_limits(ax, name, plot_x, plot_y)
+
+        if rescaled or self._background is None:
+            self.redraw()
+        else:
+            self.fig.canvas.restore_region(self._background)
+            self._draw_lines()
+        self.fig.canvas.flush_events()
+
+    def close(self):
+        plt.close(self.fig)
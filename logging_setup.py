@@ -0,0 +1,131 @@
+import json
+import queue
+import atexit
+import logging
+import itertools
+import threading
+import configparser
+from logging.handlers import QueueHandler, QueueListener
+
+# Load configuration from the "config.ini" file
+config = configparser.ConfigParser()
+config.read("config.ini")
+
+# Prefix of the loggers that carry per-sample telemetry records
+SAMPLE_LOGGER_PREFIX = "samples"
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+# Queue handler that leaves formatting to the listener thread.
+# The stock QueueHandler merges msg % args in the producer before enqueueing;
+# here the record is queued untouched so producers only pay for the put.
+# Records are dropped (and counted) instead of blocking when the queue is full.
+class DeferredQueueHandler(QueueHandler):
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+# Formatter rendering sample records as one compact "key=value" or JSON line
+class SampleFormatter(logging.Formatter):
+    def __init__(self, style="compact"):
+        super().__init__()
+        self.style = style
+
+    def format(self, record):
+        sample = getattr(record, "sample", None)
+        if sample is None:
+            return super().format(record)
+        source = getattr(record, "source", record.name)
+        if self.style == "json":
+            return json.dumps(dict(sample, t=round(record.created, 3), src=source), separators=(",", ":"))
+        fields = " ".join(f"{key}={value}" for key, value in sample.items())
+        return f"{record.created:.3f} {source} {fields}"
+
+# Filter that passes only (or never passes) per-sample records
+class SampleRecordFilter(logging.Filter):
+    def __init__(self, samples):
+        super().__init__()
+        self.samples = samples
+
+    def filter(self, record):
+        return record.name.startswith(SAMPLE_LOGGER_PREFIX) == self.samples
+
+# Function to route all logging through a queue to a background listener.
+# Safe to call from every module: only the first call installs the handlers.
+def configure_logging():
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        section = "logging"
+        log_queue = queue.Queue(maxsize=config.getint(section, "queue_size", fallback=10000))
+
+        file_handler = logging.FileHandler(config.get(section, "log_file", fallback="drone_power.log"))
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        file_handler.addFilter(SampleRecordFilter(samples=False))
+
+        sample_handler = logging.FileHandler(config.get(section, "sample_log_file", fallback="telemetry_samples.log"))
+        sample_handler.setFormatter(SampleFormatter(config.get(section, "sample_format", fallback="compact")))
+        sample_handler.addFilter(SampleRecordFilter(samples=True))
+
+        _queue_handler = DeferredQueueHandler(log_queue)
+        root = logging.getLogger()
+        root.setLevel(config.get(section, "level", fallback="INFO").upper())
+        root.addHandler(_queue_handler)
+        logging.getLogger(SAMPLE_LOGGER_PREFIX).setLevel(config.get(section, "sample_level", fallback="INFO").upper())
+
+        _listener = QueueListener(log_queue, file_handler, sample_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+# Function to drain the queue and stop the listener thread
+def stop_logging():
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+# Function to get the number of records dropped because the log queue was full
+def get_dropped_records():
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+# Class logging telemetry samples as structured records.
+# The level check and the 1-in-`every` sampling run before any record is
+# created, so a disabled or sampled-out call costs a counter increment.
+class SampleLogger:
+    def __init__(self, source, every=1, level=logging.INFO):
+        self.source = source
+        self.every = max(1, every)
+        self.level = level
+        self.logger = logging.getLogger(f"{SAMPLE_LOGGER_PREFIX}.{source}")
+        self._counter = itertools.count()
+
+    # Log one sample (a mapping of field name to value); the mapping must not be modified afterwards
+    def log(self, sample):
+        if next(self._counter) % self.every or not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(self.level, "sample", extra={"sample": sample, "source": self.source})
+
+# Function to create a sample logger using the [logging] sample_every setting
+def get_sample_logger(source):
+    configure_logging()
+    return SampleLogger(source, every=config.getint("logging", "sample_every", fallback=1))
@@ -1,5 +1,6 @@
 # Import required modules
 import time
+import argparse
 import threading
 import user_interface
 import telemetry
@@ -15,10 +16,17 @@ import firmware_update
 import authentication
 import logging
 import drone_management
+import async_runtime
+import configparser
+from control_scheduler import ControlLoopScheduler
+from instrumentation import instruments
 
-# Main function
-def main():
-    # Initialize system components and variables
+# Load configuration from the "config.ini" file
+config = configparser.ConfigParser()
+config.read("config.ini")
+
+# Initialize system components and variables; both run modes call this first
+def init_components():
     user_interface.init()
     telemetry.init()
     data_transmitter.init()
@@ -34,6 +42,10 @@ def main():
     logging.init()
     drone_management.init()
 
+# Main function
+def main():
+    init_components()
+
     # Create threads for real-time data transmission and user interface update
     telemetry_thread = threading.Thread(target=telemetry_data_transmission)
     user_interface_thread = threading.Thread(target=update_user_interface)
@@ -42,62 +54,132 @@ def main():
     telemetry_thread.start()
     user_interface_thread.start()
 
-    try:
-        # Start the main control loop
-        while True:
-            # Update telemetry data
-            telemetry_data = telemetry.update()
-
-            # Analyze power supply performance
-            power_analysis_result = power_analysis.analyze(telemetry_data)
-
-            # Detect and handle power supply faults
-            fault_detection.detect_and_handle_faults(power_analysis_result)
-
-            # Check for remote commands and adjust power parameters if needed
-            remote_commands = user_interface.get_remote_commands()
-            if remote_commands:
-                remote_power_adjustment.adjust_power_parameters(remote_commands)
-
-            # Implement power augmentation strategies
-            power_augmentation.apply_strategies(power_analysis_result)
+    # Dump stage latency histograms on SIGUSR1 (kill -USR1 <pid>)
+    instruments.install_dump_signal(config.get("control_loop", "instrumentation_dump", fallback="control_loop_latency.json"))
 
-            # Update and transmit telemetry data
-            telemetry.update_and_transmit(telemetry_data)
-
-            # Check for firmware updates and apply if available
-            firmware_update.check_and_apply_firmware_updates()
-
-            # Check for authentication and access control
-            authenticated_user = authentication.authenticate_user()
-            if authenticated_user:
-                user_interface.allow_access(authenticated_user)
-            else:
-                user_interface.deny_access()
-
-            # Logging system events
-            logging.log_system_events()
-
-            # Sleep for a short duration before the next iteration
-            time.sleep(0.1)
+    try:
+        # Start the main control loop; each stage runs on its own deadline
+        build_control_scheduler().run()
 
     except KeyboardInterrupt:
         # Handle KeyboardInterrupt (e.g., when the user stops the program)
         print("Program stopped by the user.")
 
-def telemetry_data_transmission():
+# Control loop stages; they share results through the context dictionary
+def update_telemetry_stage(context):
+    # Update telemetry data
+    context["telemetry_data"] = telemetry.update()
+
+def analyze_power_stage(context):
+    # Analyze power supply performance
+    context["power_analysis_result"] = power_analysis.analyze(context.get("telemetry_data"))
+
+def handle_faults_stage(context):
+    # Detect and handle power supply faults
+    fault_detection.detect_and_handle_faults(context.get("power_analysis_result"))
+
+def remote_commands_stage(context):
+    # Check for remote commands and adjust power parameters if needed
+    remote_commands = user_interface.get_remote_commands()
+    if remote_commands:
+        remote_power_adjustment.adjust_power_parameters(remote_commands)
+
+def power_augmentation_stage(context):
+    # Implement power augmentation strategies
+    power_augmentation.apply_strategies(context.get("power_analysis_result"))
+
+def transmit_telemetry_stage(context):
+    # Update and transmit telemetry data
+    telemetry.update_and_transmit(context.get("telemetry_data"))
+
+def firmware_update_stage(context):
+    # Check for firmware updates and apply if available
+    firmware_update.check_and_apply_firmware_updates()
+
+def authentication_stage(context):
+    # Check for authentication and access control
+    authenticated_user = authentication.authenticate_user()
+    if authenticated_user:
+        user_interface.allow_access(authenticated_user)
+    else:
+        user_interface.deny_access()
+
+def system_logging_stage(context):
+    # Logging system events
+    logging.log_system_events()
+
+# Stage table: (name, function, default period in seconds, priority, critical).
+# Lower priority numbers run first; telemetry, analysis and fault handling are
+# critical and run every tick even when slower stages overrun the budget.
+CONTROL_STAGES = (
+    ("telemetry", update_telemetry_stage, 0.1, 0, True),
+    ("analysis", analyze_power_stage, 0.1, 1, True),
+    ("fault_handling", handle_faults_stage, 0.1, 2, True),
+    ("remote_commands", remote_commands_stage, 0.1, 3, False),
+    ("augmentation", power_augmentation_stage, 0.2, 4, False),
+    ("transmit", transmit_telemetry_stage, 0.5, 5, False),
+    ("logging", system_logging_stage, 1.0, 6, False),
+    ("authentication", authentication_stage, 5.0, 7, False),
+    ("firmware_check", firmware_update_stage, 60.0, 8, False)
+)
+
+def build_control_scheduler():
+    # Periods can be overridden per stage with "<name>_period" in [control_loop]
+    scheduler = ControlLoopScheduler(tick_budget=config.getfloat("control_loop", "tick_budget", fallback=0.1), instruments=instruments)
+    for name, func, period, priority, critical in CONTROL_STAGES:
+        scheduler.add_stage(name, func, config.getfloat("control_loop", f"{name}_period", fallback=period), priority, critical)
+    return scheduler
+
+@instruments.timed("telemetry_transmission")
+def transmit_latest_telemetry():
+    # Transmit the latest telemetry data to the user interface
+    telemetry_data = telemetry.get_latest_telemetry_data()
+    data_transmitter.send_telemetry_data(telemetry_data)
+
+@instruments.timed("user_interface")
+def refresh_user_interface():
+    # Update the user interface with the latest real-time data
+    telemetry_data = telemetry.get_latest_telemetry_data()
+    user_interface.update_display(telemetry_data)
+
+def run_instrumented_loop(name, func, interval):
+    # Call func every interval seconds, counting iterations that overrun it.
+    # A failing iteration is logged and counted; the loop keeps running.
+    histogram = instruments.histogram(name)
     while True:
-        # Continuously transmit telemetry data to the user interface
-        telemetry_data = telemetry.get_latest_telemetry_data()
-        data_transmitter.transmit_telemetry_data(telemetry_data)
-        time.sleep(0.5)  # Adjust the interval as needed
+        started = time.monotonic()
+        try:
+            func()
+        except Exception as e:
+            histogram.errors += 1
+            logging.error(f"Error in {name} loop: {str(e)}")
+        elapsed = time.monotonic() - started
+        if elapsed > interval:
+            histogram.overruns += 1
+        time.sleep(max(0.0, interval - elapsed))
+
+def telemetry_data_transmission():
+    # Continuously transmit telemetry data to the user interface
+    run_instrumented_loop("telemetry_transmission", transmit_latest_telemetry, 0.5)  # Adjust the interval as needed
 
 def update_user_interface():
-    while True:
-        # Continuously update the user interface with real-time data
-        telemetry_data = telemetry.get_latest_telemetry_data()
-        user_interface.update_display(telemetry_data)
-        time.sleep(0.2)  # Adjust the interval as needed
+    # Continuously update the user interface with real-time data
+    run_instrumented_loop("user_interface", refresh_user_interface, 0.2)  # Adjust the interval as needed
+
+def create_runtime():
+    # Register the background loops and the subsystem loops on one event loop
+    init_components()
+    runtime = async_runtime.create_default_runtime()
+    runtime.add_task("telemetry_transmission", transmit_latest_telemetry, 0.5)
+    runtime.add_task("user_interface", refresh_user_interface, 0.2)
+    return runtime
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Drone power supply management system.")
+    parser.add_argument("--async-runtime", action="store_true",
+                        help="run the subsystem loops as periodic tasks on one asyncio event loop instead of the control-loop scheduler")
+    args = parser.parse_args()
+    if args.async_runtime:
+        create_runtime().run()
+    else:
+        main()
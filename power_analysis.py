@@ -2,69 +2,136 @@ import time
 import threading
 import logging
 import configparser
+from logging_setup import configure_logging, get_sample_logger
 import numpy as np
 import matplotlib.pyplot as plt
 from data_transmitter import get_telemetry_data
+from ring_buffer import TimeSeriesRingBuffer
+from fleet_registry import fleet_registry
+from rolling_stats import RollingStatistics
+from live_plot import LivePlot
 
-# Initialize a logger to record power analysis results and errors
-logging.basicConfig(filename="power_analysis.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Initialize a logger to record power analysis results and errors (written by a background listener)
+configure_logging()
+sample_logger = get_sample_logger("power_analysis")
 
 # Load configuration from the "config.ini" file
 config = configparser.ConfigParser()
 config.read("config.ini")
 
 # Define global variables for power analysis data and thread control
-power_analysis_data = {
-    "voltage": [],
-    "current": [],
-    "power": [],
-    "efficiency": []
-}
+# The history is a bounded ring buffer so memory stays fixed on long flights
+power_analysis_data = TimeSeriesRingBuffer(config.getint("power_analysis", "history_capacity", fallback=36000))
 plot_update_flag = threading.Event()
 
-# Define a lock for thread safety when accessing power analysis data
-power_analysis_lock = threading.Lock()
+# Define incremental rolling statistics for this drone and for the whole fleet
+# (window lengths are counted in samples)
+POWER_STATISTICS_CHANNELS = ("voltage", "current", "power", "efficiency")
+statistics_windows = [int(length) for length in config.get("power_analysis", "statistics_windows", fallback="60").split(",")]
+statistics_ewma_alpha = config.getfloat("power_analysis", "ewma_alpha", fallback=0.1)
+power_statistics = RollingStatistics(POWER_STATISTICS_CHANNELS, windows=statistics_windows, ewma_alpha=statistics_ewma_alpha)
+fleet_statistics = RollingStatistics(POWER_STATISTICS_CHANNELS, n_drones=0, windows=statistics_windows, ewma_alpha=statistics_ewma_alpha)
+power_statistics_lock = threading.Lock()
+
+# Function to run one power analysis pass on the latest telemetry data
+def run_power_analysis_cycle():
+    # Retrieve the latest telemetry data from the data_transmitter script
+    telemetry_data = get_telemetry_data()
+
+    # Extract voltage and current from telemetry data
+    voltage = telemetry_data.get("voltage", 0.0)
+    current = telemetry_data.get("current", 0.0)
+
+    # Calculate power and efficiency
+    power = voltage * current
+    efficiency = (power / (voltage * current)) * 100 if current != 0 else 0.0
+
+    # Record the sample in the power analysis history and rolling statistics
+    timestamp = time.time()
+    power_analysis_data.append(timestamp, voltage, current, power, efficiency)
+    with power_statistics_lock:
+        power_statistics.update((voltage, current, power, efficiency), timestamp)
+
+    # Log the power analysis results
+    sample_logger.log({"power": power, "efficiency": efficiency})
 
 # Function to perform power analysis on telemetry data
 def perform_power_analysis():
     while not plot_update_flag.is_set():
         try:
-            # Retrieve the latest telemetry data from the data_transmitter script
-            telemetry_data = get_telemetry_data()
-
-            # Extract voltage and current from telemetry data
-            voltage = telemetry_data.get("voltage", 0.0)
-            current = telemetry_data.get("current", 0.0)
-
-            # Calculate power and efficiency
-            power = voltage * current
-            efficiency = (power / (voltage * current)) * 100 if current != 0 else 0.0
-
-            # Update the power analysis data dictionary
-            with power_analysis_lock:
-                power_analysis_data["voltage"].append(voltage)
-                power_analysis_data["current"].append(current)
-                power_analysis_data["power"].append(power)
-                power_analysis_data["efficiency"].append(efficiency)
-
-            # Log the power analysis results
-            logging.info(f"Power: {power} W, Efficiency: {efficiency:.2f}%")
-
+            run_power_analysis_cycle()
             time.sleep(config.getfloat("power_analysis", "update_interval"))
 
         except Exception as e:
             logging.error(f"Failed to perform power analysis: {str(e)}")
             time.sleep(1)  # Wait for a short duration before retrying
 
+# Function to get the live rolling statistics of this drone
+def get_power_statistics(window=None):
+    with power_statistics_lock:
+        return power_statistics.get_drone_stats(0, window)
+
+# Function to get the live rolling statistics of the fleet as (n_drones, n_channels) arrays
+def get_fleet_statistics(window=None):
+    with power_statistics_lock:
+        return fleet_statistics.get_stats(window)
+
+# Function to compute power and efficiency for every drone in the fleet at once
+def analyze_fleet(registry=fleet_registry, update_statistics=True):
+    drone_ids, values, timestamps = registry.snapshot(channels=("voltage", "current"))
+    voltage = values[:, 0]
+    current = values[:, 1]
+    power = voltage * current
+    efficiency = np.where(current != 0, 100.0, 0.0)
+    if update_statistics:
+        # Registry slots are append-only, so row i is the same drone on every tick
+        with power_statistics_lock:
+            fleet_statistics.resize(len(drone_ids))
+            fleet_statistics.update(np.column_stack([voltage, current, power, efficiency]), time.time())
+    return {
+        "drone_id": drone_ids,
+        "timestamp": timestamps,
+        "voltage": voltage,
+        "current": current,
+        "power": power,
+        "efficiency": efficiency
+    }
+
+# Function to continuously plot power analysis results in a persistent, blitted window
+def plot_power_analysis_live():
+    live_plot = LivePlot(
+        [("power", "Power (W)", "blue"), ("efficiency", "Efficiency (%)", "green")],
+        "Power Analysis Results",
+        max_points=config.getint("power_analysis", "plot_max_points", fallback=2000),
+        method=config.get("power_analysis", "plot_method", fallback="minmax")
+    )
+    live_plot.show()
+    try:
+        while not plot_update_flag.is_set():
+            try:
+                history = power_analysis_data.window(copy=True)
+                live_plot.update(history["timestamp"], history)
+                plot_update_flag.wait(timeout=config.getfloat("power_analysis", "live_plot_interval", fallback=0.1))
+
+            except Exception as e:
+                logging.error(f"Failed to update live power analysis plot: {str(e)}")
+                time.sleep(1)  # Wait for a short duration before retrying
+    finally:
+        live_plot.close()
+
 # Function to continuously plot power analysis results
 def plot_power_analysis():
+    if config.getboolean("power_analysis", "live_plot", fallback=False):
+        return plot_power_analysis_live()
+
     while not plot_update_flag.is_set():
         try:
-            # Extract power analysis data for plotting
-            with power_analysis_lock:
-                voltages = np.array(power_analysis_data["voltage"])
-                powers = np.array(power_analysis_data["power"])
-                efficiencies = np.array(power_analysis_data["efficiency"])
+            # Extract power analysis data for plotting (copied under the history lock,
+            # since the analysis thread keeps appending while the figure is drawn)
+            history = power_analysis_data.window(copy=True)
+            voltages = history["voltage"]
+            powers = history["power"]
+            efficiencies = history["efficiency"]
 
             # Create subplots for power and efficiency
             fig, axes = plt.subplots(nrows=2, ncols=1, figsize=(10, 8), sharex=True)
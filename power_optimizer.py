@@ -0,0 +1,161 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Function to derive per-device power limits (W) from power_range dictionaries
+def device_limits_from_power_ranges(power_ranges):
+    min_power = np.array([power_range["min_voltage"] * power_range["min_current"] for power_range in power_ranges])
+    max_power = np.array([power_range["max_voltage"] * power_range["max_current"] for power_range in power_ranges])
+    return min_power, max_power
+
+# Function to share one supply power_range across `n_devices` devices (W).
+# The range limits the supply as a whole, so together the devices must draw
+# at least its minimum (split evenly) and one device can take at most its maximum.
+def device_limits_from_supply_range(power_range, n_devices):
+    min_power = power_range["min_voltage"] * power_range["min_current"] / n_devices
+    max_power = power_range["max_voltage"] * power_range["max_current"]
+    return np.full(n_devices, min_power), np.full(n_devices, max_power)
+
+# Function to get the power budget (W) available from power_settings
+def budget_from_power_settings(power_settings):
+    return power_settings["voltage"] * power_settings["current"]
+
+# Smallest demand (W) used as a denominator, so idle devices (zero demand) score no shortfall
+MIN_DEMAND = 1e-9
+
+# Default fitness: priority-weighted squared relative shortfall against demand.
+# Takes the whole (population, devices) matrix and returns one score per row.
+def demand_shortfall_fitness(population, demand, priority):
+    shortfall = np.maximum(demand - population, 0.0) / np.maximum(demand, MIN_DEMAND)
+    return -(priority * shortfall * shortfall).sum(axis=1)
+
+# Evaluate one slice of the population (runs inside pool workers)
+def _evaluate_chunk(fitness, chunk, fitness_args):
+    return fitness(chunk, *fitness_args)
+
+# Class allocating a power budget across devices with a genetic algorithm.
+# Individuals are rows of a (population_size, n_devices) matrix of per-device
+# power in [min_power, max_power]. Selection (tournament), crossover (blend),
+# mutation (Gaussian) and budget repair all operate on the whole matrix, and
+# fitness is a function of that matrix returning one score per row. With
+# `processes` > 0 the population is split into chunks evaluated in a process
+# pool, which only pays off for expensive fitness functions.
+class GeneticPowerOptimizer:
+    def __init__(self, min_power, max_power, budget, demand=None, priority=None, fitness=None, fitness_args=None,
+                 population_size=100, mutation_rate=0.1, mutation_scale=0.1, crossover_rate=0.9,
+                 elite=2, tournament_size=3, seed=None, processes=0):
+        self.min_power = np.asarray(min_power, dtype=np.float64)
+        self.max_power = np.asarray(max_power, dtype=np.float64)
+        self.budget = float(budget)
+        if self.min_power.sum() > self.budget:
+            raise ValueError("Power budget cannot cover the minimum power of every device")
+        if np.any(self.min_power > self.max_power):
+            raise ValueError("Device minimum power exceeds its maximum power")
+
+        n_devices = len(self.min_power)
+        if fitness is None:
+            demand = self.max_power if demand is None else np.asarray(demand, dtype=np.float64)
+            priority = np.ones(n_devices) if priority is None else np.asarray(priority, dtype=np.float64)
+            fitness = demand_shortfall_fitness
+            fitness_args = (demand, priority)
+        self.fitness = fitness
+        self.fitness_args = tuple(fitness_args or ())
+
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.crossover_rate = crossover_rate
+        self.elite = elite
+        self.tournament_size = tournament_size
+        self.processes = processes
+        self.rng = np.random.default_rng(seed)
+        self._executor = None
+
+        self.population = self.repair(self.rng.uniform(self.min_power, self.max_power, size=(population_size, n_devices)))
+        self.scores = None
+        self.best_allocation = None
+        self.best_fitness = -np.inf
+        self.history = []
+
+    # Scale every row down toward the device minimums until it fits the budget
+    def repair(self, population):
+        population = np.clip(population, self.min_power, self.max_power)
+        headroom = population - self.min_power
+        available = self.budget - self.min_power.sum()
+        used = headroom.sum(axis=1, keepdims=True)
+        scale = np.where(used > available, available / np.where(used > 0, used, 1.0), 1.0)
+        return self.min_power + headroom * scale
+
+    # Score the whole population (optionally in a process pool)
+    def evaluate(self, population):
+        if self.processes <= 0:
+            return np.asarray(self.fitness(population, *self.fitness_args), dtype=np.float64)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        chunks = np.array_split(population, self.processes)
+        futures = [self._executor.submit(_evaluate_chunk, self.fitness, chunk, self.fitness_args) for chunk in chunks]
+        return np.concatenate([np.asarray(future.result(), dtype=np.float64) for future in futures])
+
+    # Pick parents by tournament: the best of `tournament_size` random rows
+    def select(self, count):
+        contenders = self.rng.integers(0, len(self.population), size=(count, self.tournament_size))
+        winners = contenders[np.arange(count), self.scores[contenders].argmax(axis=1)]
+        return self.population[winners]
+
+    # Produce the next generation
+    def step(self):
+        if self.scores is None:
+            self.scores = self.evaluate(self.population)
+
+        order = np.argsort(self.scores)[::-1]
+        elites = self.population[order[:self.elite]]
+        offspring_count = self.population_size - len(elites)
+
+        mothers = self.select(offspring_count)
+        fathers = self.select(offspring_count)
+        blend = self.rng.random((offspring_count, 1))
+        crossover = self.rng.random((offspring_count, 1)) < self.crossover_rate
+        children = np.where(crossover, blend * mothers + (1.0 - blend) * fathers, mothers)
+
+        mutate = self.rng.random(children.shape) < self.mutation_rate
+        noise = self.rng.normal(0.0, self.mutation_scale, children.shape) * (self.max_power - self.min_power)
+        children = self.repair(children + mutate * noise)
+
+        self.population = np.vstack([elites, children])
+        self.scores = np.concatenate([self.scores[order[:self.elite]], self.evaluate(children)])
+
+        best = int(self.scores.argmax())
+        if self.scores[best] > self.best_fitness:
+            self.best_fitness = float(self.scores[best])
+            self.best_allocation = self.population[best].copy()
+        self.history.append(self.best_fitness)
+        return self.best_fitness
+
+    # Run a number of generations and return (best allocation, best fitness)
+    def run(self, generations=200, tolerance=None, patience=20):
+        try:
+            for generation in range(generations):
+                self.step()
+                if tolerance is not None and len(self.history) > patience and self.history[-1] - self.history[-1 - patience] < tolerance:
+                    break
+        finally:
+            self.close()
+        return self.best_allocation, self.best_fitness
+
+    # Shut down the process pool, if one was started
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+# Function to distribute the power available from power_settings across devices.
+# `power_ranges` is a list with one power_range per device, or the drone's
+# single power_range shared by `n_devices` devices.
+def optimize_power_distribution(power_settings, power_ranges, demand=None, priority=None, generations=200, n_devices=None, **options):
+    if isinstance(power_ranges, dict):
+        if n_devices is None:
+            raise ValueError("n_devices is required to share a single power_range")
+        min_power, max_power = device_limits_from_supply_range(power_ranges, n_devices)
+    else:
+        min_power, max_power = device_limits_from_power_ranges(power_ranges)
+    optimizer = GeneticPowerOptimizer(min_power, max_power, budget_from_power_settings(power_settings), demand=demand, priority=priority, **options)
+    return optimizer.run(generations)
@@ -0,0 +1,58 @@
+import numpy as np
+
+# Power held back to reach within 1 kilometer of the origination in combat mode
+COMBAT_MODE_POWER_RESERVE = 1.5
+
+# Function to plan reserved power settings for many drones or scenarios in one pass.
+# Mirrors remote_power_adjustment.reserve_power element by element: every
+# argument may be an array or a scalar and they are broadcast together.
+# Returns the planned voltage and current plus two flags:
+#   combat_infeasible - combat mode was requested but its reserve would leave
+#                       the range, so only the telemetry reserve was applied
+#   clamped           - the reserved setting fell below the range minimum and
+#                       was raised back to it (the reserve is not fully met)
+def plan_power_reserve(voltage, current, min_voltage, max_voltage, min_current, max_current,
+                       telemetry_reserve, combat_mode=False, combat_reserve=COMBAT_MODE_POWER_RESERVE):
+    voltage, current, min_voltage, max_voltage, min_current, max_current, telemetry_reserve, combat_mode, combat_reserve = np.broadcast_arrays(
+        np.asarray(voltage, dtype=np.float64), np.asarray(current, dtype=np.float64),
+        np.asarray(min_voltage, dtype=np.float64), np.asarray(max_voltage, dtype=np.float64),
+        np.asarray(min_current, dtype=np.float64), np.asarray(max_current, dtype=np.float64),
+        np.asarray(telemetry_reserve, dtype=np.float64), np.asarray(combat_mode, dtype=bool),
+        np.asarray(combat_reserve, dtype=np.float64)
+    )
+
+    # Settings that keep only the telemetry reserve
+    telemetry_voltage = np.minimum(voltage - telemetry_reserve, max_voltage)
+    telemetry_current = np.minimum(current - telemetry_reserve, max_current)
+
+    # Settings that also keep the combat mode reserve, where they fit the range
+    combat_voltage = voltage - combat_reserve
+    combat_current = current - combat_reserve
+    combat_fits = (combat_voltage >= min_voltage) & (combat_current >= min_current)
+    use_combat = combat_mode & combat_fits
+
+    planned_voltage = np.where(use_combat, combat_voltage, telemetry_voltage)
+    planned_current = np.where(use_combat, combat_current, telemetry_current)
+
+    # Ensure that power settings stay within the specified power range
+    clamped = (planned_voltage < min_voltage) | (planned_current < min_current)
+    planned_voltage = np.maximum(min_voltage, planned_voltage)
+    planned_current = np.maximum(min_current, planned_current)
+
+    return {
+        "voltage": planned_voltage,
+        "current": planned_current,
+        "combat_infeasible": combat_mode & ~combat_fits,
+        "clamped": clamped
+    }
+
+# Function to plan reserved power for a list of power_settings dictionaries sharing one power_range
+def plan_power_settings(power_settings_list, power_range, telemetry_reserve, combat_mode=False):
+    voltage = np.fromiter((settings["voltage"] for settings in power_settings_list), dtype=np.float64, count=len(power_settings_list))
+    current = np.fromiter((settings["current"] for settings in power_settings_list), dtype=np.float64, count=len(power_settings_list))
+    return plan_power_reserve(
+        voltage, current,
+        power_range["min_voltage"], power_range["max_voltage"],
+        power_range["min_current"], power_range["max_current"],
+        telemetry_reserve, combat_mode
+    )
@@ -0,0 +1,85 @@
+import time
+import threading
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+# Default GUI repaint rate (frames per second)
+DEFAULT_FRAME_RATE = 60.0
+
+# Function to prepare the label texts shown for one telemetry sample
+def format_telemetry_display(telemetry_data):
+    voltage = telemetry_data.get("voltage", 0.0)
+    current = telemetry_data.get("current", 0.0)
+    return {
+        "voltage": f"Voltage: {voltage:.2f} V",
+        "current": f"Current: {current:.2f} A",
+        "power": f"Power: {telemetry_data.get('power', voltage * current):.2f} W",
+        "temperature": f"Temperature: {telemetry_data.get('temperature', 0.0):.1f} °C"
+    }
+
+# Class handing telemetry from producer threads to the Qt GUI thread.
+# submit() may be called from any thread at any rate: it prepares the data on
+# the calling thread, keeps only the newest result and emits a cross-thread
+# (queued) signal only when no frame is already pending. On the GUI thread a
+# single-shot timer then delivers the newest prepared data through
+# frame_ready at most once per frame interval, so widgets repaint at the frame
+# rate however fast samples arrive and the GUI thread never formats data.
+# The bridge must be created on the GUI thread.
+class TelemetryBridge(QObject):
+    frame_ready = pyqtSignal(object)
+    _data_available = pyqtSignal()
+
+    def __init__(self, prepare=format_telemetry_display, frame_rate=DEFAULT_FRAME_RATE, parent=None):
+        super().__init__(parent)
+        self.prepare = prepare
+        self.frame_interval = 1.0 / frame_rate
+        self._lock = threading.Lock()
+        self._latest = None
+        self._pending = False
+        self._last_frame = -self.frame_interval
+        self.submitted = 0
+        self.delivered = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._deliver)
+        self._data_available.connect(self._schedule)
+
+    # Hand one sample to the GUI; safe to call from any thread
+    def submit(self, data):
+        prepared = self.prepare(data) if self.prepare is not None else data
+        with self._lock:
+            self._latest = prepared
+            self.submitted += 1
+            if self._pending:
+                return
+            self._pending = True
+        self._data_available.emit()
+
+    # True while a frame is waiting for the GUI; producers that prepare
+    # expensive frames can skip work that would only be coalesced away
+    @property
+    def pending(self):
+        return self._pending
+
+    # GUI thread: deliver at the next frame boundary
+    def _schedule(self):
+        if self._timer.isActive():
+            return
+        delay = self._last_frame + self.frame_interval - time.monotonic()
+        self._timer.start(max(0, int(delay * 1000.0 + 0.999)))
+
+    # GUI thread: hand the newest prepared data to the widgets
+    def _deliver(self):
+        with self._lock:
+            prepared = self._latest
+            self._pending = False
+        self._last_frame = time.monotonic()
+        self.delivered += 1
+        self.frame_ready.emit(prepared)
+
+    # Get submitted, delivered and coalesced (never shown) sample counts
+    def get_stats(self):
+        with self._lock:
+            submitted = self.submitted
+        return {"submitted": submitted, "delivered": self.delivered, "coalesced": submitted - self.delivered}
@@ -4,11 +4,17 @@ import threading
 import logging
 import configparser
 import random
-import requests
-from urllib3.exceptions import NewConnectionError
+from logging_setup import configure_logging
+from command_channel import PowerCommandChannel
+from power_planner import COMBAT_MODE_POWER_RESERVE
 
-# Initialize a logger for recording power adjustments and errors
-logging.basicConfig(filename="power_adjustment.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Initialize a logger for recording power adjustments and errors (written by a background listener)
+configure_logging()
+
+# Identifier of this drone in power commands (same setting as data_transmitter)
+config = configparser.ConfigParser()
+config.read("config.ini")
+DRONE_ID = config.get("fleet", "drone_id", fallback="drone-0")
 
 # Function to load configuration from the "config.ini" file
 def load_configuration():
@@ -34,30 +40,46 @@ def load_configuration():
 
     return power_settings, power_range, adjustment_interval, telemetry_power_reserve
 
-# Function to adjust the drone's power settings using HTTP request
-def adjust_power_http(voltage, current):
-    global power_settings
-    logging.info(f"Adjusting power settings: Voltage={voltage} V, Current={current} A")
-
-    # Replace the URL and API endpoint with the actual API endpoint of the drone's control system
-    api_url = "https://drone-control-api.example.com/adjust_power"
-    payload = {
-        "voltage": voltage,
-        "current": current
-    }
-
-    try:
-        response = requests.post(api_url, json=payload)
+# Function to record a setpoint once the drone's control system has accepted it
+def apply_confirmed_power_settings(drone_id, voltage, current):
+    power_settings["voltage"] = voltage
+    power_settings["current"] = current
 
-        if response.status_code == 200:
-            power_settings["voltage"] = voltage
-            power_settings["current"] = current
-            logging.info("Power settings adjusted successfully.")
-        else:
-            logging.error(f"Failed to adjust power settings. Status code: {response.status_code}")
-
-    except (requests.exceptions.RequestException, NewConnectionError) as e:
-        logging.error(f"Failed to make the HTTP request: {str(e)}")
+# Function to create the power command channel from the [power_adjustment] configuration
+def create_command_channel(on_success=apply_confirmed_power_settings):
+    config = configparser.ConfigParser()
+    config.read("config.ini")
+    section = "power_adjustment"
+    return PowerCommandChannel(
+        # Replace the URL and API endpoint with the actual API endpoint of the drone's control system
+        config.get(section, "api_url", fallback="https://drone-control-api.example.com/adjust_power"),
+        timeout=(config.getfloat(section, "connect_timeout", fallback=3.0), config.getfloat(section, "request_timeout", fallback=5.0)),
+        max_retries=config.getint(section, "max_retries", fallback=3),
+        backoff_base=config.getfloat(section, "backoff_base", fallback=0.1),
+        backoff_max=config.getfloat(section, "backoff_max", fallback=2.0),
+        workers=config.getint(section, "command_workers", fallback=2),
+        on_success=on_success
+    )
+
+command_channel = None
+command_channel_lock = threading.Lock()
+
+# Function to get the shared power command channel
+def get_command_channel():
+    global command_channel
+    with command_channel_lock:
+        if command_channel is None:
+            command_channel = create_command_channel()
+        return command_channel
+
+# Function to adjust the drone's power settings using HTTP request.
+# The command is queued; only the latest setpoint per drone is sent and
+# power_settings is updated once the drone confirms it.
+def adjust_power_http(voltage, current, drone_id=None):
+    if drone_id is None:
+        drone_id = DRONE_ID
+    logging.info("Adjusting power settings: Voltage=%s V, Current=%s A", voltage, current)
+    return get_command_channel().submit(drone_id, voltage, current)
 
 # Function to reserve power for telemetry transmission and combat mode
 def reserve_power(telemetry_distance, combat_mode=False):
@@ -69,7 +91,7 @@ def reserve_power(telemetry_distance, combat_mode=False):
 
     # Calculate the power required to reach within 1 kilometer of the origination in combat mode
     if combat_mode:
-        combat_mode_power_reserve = 1.5  # Adjust this value based on combat mode requirements
+        combat_mode_power_reserve = COMBAT_MODE_POWER_RESERVE  # Adjust this value based on combat mode requirements
         min_voltage_combat_mode = power_settings["voltage"] - combat_mode_power_reserve
         min_current_combat_mode = power_settings["current"] - combat_mode_power_reserve
 
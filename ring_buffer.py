@@ -0,0 +1,115 @@
+import threading
+import numpy as np
+
+# Default columns stored for power analysis history
+POWER_ANALYSIS_FIELDS = ("timestamp", "voltage", "current", "power", "efficiency")
+
+# Preallocated columnar ring buffer for time-series samples.
+# Every sample is written twice, at index i and i + capacity, so the most
+# recent window of any length is always one contiguous slice and can be
+# returned as a zero-copy NumPy view instead of a concatenated copy.
+class TimeSeriesRingBuffer:
+    def __init__(self, capacity, fields=POWER_ANALYSIS_FIELDS, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        if "timestamp" not in fields:
+            raise ValueError("Ring buffer fields must include 'timestamp'")
+
+        self.capacity = int(capacity)
+        self.fields = tuple(fields)
+        self.lock = threading.Lock()
+        self._columns = {name: index for index, name in enumerate(self.fields)}
+        self._data = np.zeros((len(self.fields), 2 * self.capacity), dtype=dtype)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    # Append one sample; values are given in the same order as the fields
+    def append(self, *values):
+        if len(values) != len(self.fields):
+            raise ValueError(f"Expected {len(self.fields)} values, got {len(values)}")
+
+        with self.lock:
+            data = self._data
+            low = self._next
+            high = low + self.capacity
+            for row, value in enumerate(values):
+                data[row, low] = value
+                data[row, high] = value
+            self._next = (low + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    # Append many samples at once; one array per field, in field order
+    def extend(self, *columns):
+        if len(columns) != len(self.fields):
+            raise ValueError(f"Expected {len(self.fields)} columns, got {len(columns)}")
+        block = np.array(columns, dtype=self._data.dtype, ndmin=2)
+        count = block.shape[1]
+        if count == 0:
+            return
+
+        with self.lock:
+            # Only the newest `capacity` samples can survive
+            skipped = max(0, count - self.capacity)
+            block = block[:, skipped:]
+            low = (self._next + skipped) % self.capacity
+            first = min(len(block[0]), self.capacity - low)
+            for offset in (0, self.capacity):
+                self._data[:, offset + low:offset + low + first] = block[:, :first]
+                self._data[:, offset:offset + len(block[0]) - first] = block[:, first:]
+            self._next = (low + len(block[0])) % self.capacity
+            self._count = min(self.capacity, self._count + count)
+
+    # Return the (start, stop) slice bounds of the latest n samples
+    def _bounds(self, n):
+        count = self._count if n is None else max(0, min(int(n), self._count))
+        stop = self._next + self.capacity if self._count == self.capacity else self._next
+        return stop - count, stop
+
+    # Get zero-copy views of the latest n samples (all samples if n is None).
+    # The views alias the buffer, so they are overwritten as new samples
+    # arrive; pass copy=True to get copies taken under the lock when the
+    # data is used while other threads keep appending.
+    def window(self, n=None, copy=False):
+        with self.lock:
+            start, stop = self._bounds(n)
+            if copy:
+                return {name: self._data[row, start:stop].copy() for name, row in self._columns.items()}
+            return {name: self._data[row, start:stop] for name, row in self._columns.items()}
+
+    # Get a zero-copy view of a single column for the latest n samples
+    def column(self, name, n=None):
+        row = self._columns[name]
+        with self.lock:
+            start, stop = self._bounds(n)
+            return self._data[row, start:stop]
+
+    # Get zero-copy views of the samples recorded in the last `seconds`
+    # seconds up to `now` (default: the newest timestamp); timestamps
+    # are expected to be appended in non-decreasing order
+    def last_seconds(self, seconds, now=None):
+        with self.lock:
+            start, stop = self._bounds(None)
+            timestamps = self._data[self._columns["timestamp"], start:stop]
+            if now is None:
+                now = timestamps[-1] if len(timestamps) else 0.0
+            first = start + int(np.searchsorted(timestamps, now - seconds, side="left"))
+            last = start + int(np.searchsorted(timestamps, now, side="right"))
+            return {name: self._data[row, first:last] for name, row in self._columns.items()}
+
+    # Get the most recent sample as a dictionary, or None if the buffer is empty
+    def latest(self):
+        with self.lock:
+            if self._count == 0:
+                return None
+            index = (self._next - 1) % self.capacity
+            return {name: float(self._data[row, index]) for name, row in self._columns.items()}
+
+    # Discard all stored samples without releasing the preallocated memory
+    def clear(self):
+        with self.lock:
+            self._next = 0
+            self._count = 0
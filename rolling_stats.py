@@ -0,0 +1,182 @@
+import numpy as np
+
+# Class tracking sliding-window statistics for many series at once.
+# Sum and sum of squares are updated incrementally from a ring of the last
+# `length` values and recomputed exactly once per ring cycle to cancel
+# rounding drift. Min/max use the van Herk/Gil-Werman scheme: the window is
+# the suffix of the previous block plus the prefix of the current block, and
+# block suffixes are rebuilt once per `length` samples, so every statistic
+# costs amortized O(1) per sample regardless of the window length.
+class RollingWindow:
+    def __init__(self, length, size):
+        if length <= 0:
+            raise ValueError("Window length must be positive")
+        self.length = int(length)
+        self._position = 0
+        self._ring = np.zeros((self.length, size))
+        self._valid = np.zeros((self.length, size), dtype=bool)
+        self._sum = np.zeros(size)
+        self._sum_sq = np.zeros(size)
+        self._count = np.zeros(size, dtype=np.int64)
+        self._block_min = np.full((self.length, size), np.inf)
+        self._block_max = np.full((self.length, size), -np.inf)
+        self._suffix_min = np.full((self.length + 1, size), np.inf)
+        self._suffix_max = np.full((self.length + 1, size), -np.inf)
+        self._prefix_min = np.full(size, np.inf)
+        self._prefix_max = np.full(size, -np.inf)
+
+    # Grow the number of tracked series; new series start empty
+    def resize(self, size):
+        extra = size - len(self._sum)
+        if extra <= 0:
+            return
+        self.select(np.concatenate([np.arange(len(self._sum)), np.full(extra, -1)]))
+
+    # Rearrange the tracked series: series i of the result is old series
+    # columns[i], or a new empty series where columns[i] is -1
+    def select(self, columns):
+        columns = np.asarray(columns, dtype=np.intp)
+        kept = columns >= 0
+
+        def take(array, value):
+            result = np.full(array.shape[:-1] + (len(columns),), value, dtype=array.dtype)
+            result[..., kept] = array[..., columns[kept]]
+            return result
+
+        self._ring = take(self._ring, 0.0)
+        self._valid = take(self._valid, False)
+        self._sum = take(self._sum, 0.0)
+        self._sum_sq = take(self._sum_sq, 0.0)
+        self._count = take(self._count, 0)
+        self._block_min = take(self._block_min, np.inf)
+        self._block_max = take(self._block_max, -np.inf)
+        self._suffix_min = take(self._suffix_min, np.inf)
+        self._suffix_max = take(self._suffix_max, -np.inf)
+        self._prefix_min = take(self._prefix_min, np.inf)
+        self._prefix_max = take(self._prefix_max, -np.inf)
+
+    # Add one value per series; NaN marks a missing sample for that series
+    def update(self, values):
+        j = self._position
+        valid = ~np.isnan(values)
+        clean = np.where(valid, values, 0.0)
+
+        old = self._ring[j]
+        old_valid = self._valid[j]
+        self._sum += clean - old
+        self._sum_sq += clean * clean - old * old
+        self._count += valid.astype(np.int64) - old_valid
+        self._ring[j] = clean
+        self._valid[j] = valid
+
+        low = np.where(valid, values, np.inf)
+        high = np.where(valid, values, -np.inf)
+        self._block_min[j] = low
+        self._block_max[j] = high
+        if j == 0:
+            self._prefix_min[:] = low
+            self._prefix_max[:] = high
+        else:
+            np.minimum(self._prefix_min, low, out=self._prefix_min)
+            np.maximum(self._prefix_max, high, out=self._prefix_max)
+
+        if j == self.length - 1:
+            # Block complete: rebuild suffixes and resynchronize the sums
+            self._suffix_min[:self.length] = np.minimum.accumulate(self._block_min[::-1])[::-1]
+            self._suffix_max[:self.length] = np.maximum.accumulate(self._block_max[::-1])[::-1]
+            self._sum = self._ring.sum(axis=0)
+            self._sum_sq = (self._ring * self._ring).sum(axis=0)
+        self._position = (j + 1) % self.length
+
+    # Get the current statistics of every series
+    def get_stats(self):
+        j = self._position
+        count = self._count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, self._sum / count, np.nan)
+            variance = np.where(count > 1, (self._sum_sq - count * mean * mean) / (count - 1), np.nan)
+        variance = np.maximum(variance, 0.0, where=~np.isnan(variance), out=variance)
+        if j == 0:
+            # The latest block just completed, so its suffix covers the window
+            low = self._suffix_min[0]
+            high = self._suffix_max[0]
+        else:
+            low = np.minimum(self._suffix_min[j], self._prefix_min)
+            high = np.maximum(self._suffix_max[j], self._prefix_max)
+        return {
+            "count": count.copy(),
+            "mean": mean,
+            "variance": variance,
+            "std": np.sqrt(variance),
+            "min": np.where(count > 0, low, np.nan),
+            "max": np.where(count > 0, high, np.nan)
+        }
+
+# Class maintaining live per-channel statistics for one drone or a fleet.
+# Each update takes one (n_drones, n_channels) block and costs O(1) per
+# value for every configured window, plus a per-channel EWMA and the energy
+# integral (Wh) of voltage * current over the update timestamps.
+class RollingStatistics:
+    def __init__(self, channels, n_drones=1, windows=(60,), ewma_alpha=0.1, power_channels=("voltage", "current")):
+        self.channels = tuple(channels)
+        self.n_drones = n_drones
+        self.ewma_alpha = ewma_alpha
+        self.windows = {int(length): RollingWindow(length, n_drones * len(self.channels)) for length in windows}
+        self._ewma = np.full((n_drones, len(self.channels)), np.nan)
+        self._energy_wh = np.zeros(n_drones)
+        self._last_power = np.full(n_drones, np.nan)
+        self._last_timestamp = None
+        if power_channels and all(name in self.channels for name in power_channels):
+            self._power_columns = [self.channels.index(name) for name in power_channels]
+        else:
+            self._power_columns = None
+
+    # Grow the number of tracked drones; new drones start with empty statistics
+    def resize(self, n_drones):
+        extra = n_drones - self.n_drones
+        if extra <= 0:
+            return
+        for window in self.windows.values():
+            window.resize(n_drones * len(self.channels))
+        self._ewma = np.vstack([self._ewma, np.full((extra, len(self.channels)), np.nan)])
+        self._energy_wh = np.concatenate([self._energy_wh, np.zeros(extra)])
+        self._last_power = np.concatenate([self._last_power, np.full(extra, np.nan)])
+        self.n_drones = n_drones
+
+    # Add one sample per drone; `values` is (n_drones, n_channels) or (n_channels,)
+    def update(self, values, timestamp):
+        values = np.asarray(values, dtype=np.float64).reshape(self.n_drones, len(self.channels))
+        flat = values.ravel()
+        for window in self.windows.values():
+            window.update(flat)
+
+        alpha = self.ewma_alpha
+        updated = np.where(np.isnan(self._ewma), values, alpha * values + (1.0 - alpha) * self._ewma)
+        self._ewma = np.where(np.isnan(values), self._ewma, updated)
+
+        if self._power_columns is not None:
+            power = values[:, self._power_columns[0]] * values[:, self._power_columns[1]]
+            if self._last_timestamp is not None:
+                elapsed = timestamp - self._last_timestamp
+                increment = 0.5 * (self._last_power + power) * elapsed / 3600.0
+                self._energy_wh += np.where(np.isnan(increment), 0.0, increment)
+            self._last_power = power
+        self._last_timestamp = timestamp
+
+    # Get statistics as (n_drones, n_channels) arrays for one window
+    # (the shortest window by default), plus EWMA and energy in Wh
+    def get_stats(self, window=None):
+        length = min(self.windows) if window is None else window
+        stats = {name: array.reshape(self.n_drones, len(self.channels)) for name, array in self.windows[length].get_stats().items()}
+        stats["ewma"] = self._ewma.copy()
+        stats["energy_wh"] = self._energy_wh.copy()
+        return stats
+
+    # Get the statistics of one drone as {channel: {statistic: value}}
+    def get_drone_stats(self, drone_index=0, window=None):
+        stats = self.get_stats(window)
+        result = {}
+        for column, name in enumerate(self.channels):
+            result[name] = {key: float(value[drone_index, column]) for key, value in stats.items() if key != "energy_wh"}
+        result["energy_wh"] = float(stats["energy_wh"][drone_index])
+        return result
@@ -0,0 +1,74 @@
+import time
+import threading
+
+# Read-only dictionary used for published telemetry samples.
+# It is a real dict, so readers keep using .get() and it serializes to JSON,
+# but any attempt to modify it raises TypeError.
+class FrozenSample(dict):
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Published telemetry samples are read-only; copy with dict(sample) first")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (FrozenSample, (dict(self),))
+
+# Immutable, versioned telemetry snapshot
+class TelemetrySnapshot:
+    __slots__ = ("version", "timestamp", "data")
+
+    def __init__(self, version, timestamp, data):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "timestamp", timestamp)
+        object.__setattr__(self, "data", data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TelemetrySnapshot is immutable")
+
+    def __repr__(self):
+        return f"TelemetrySnapshot(version={self.version}, timestamp={self.timestamp}, data={dict(self.data)})"
+
+# Class publishing telemetry by atomic reference swap.
+# The producer builds a new immutable snapshot and rebinds a single attribute,
+# which is atomic in CPython; readers just load that reference and therefore
+# never block or copy. A writer-side lock only orders concurrent producers.
+class SnapshotPublisher:
+    def __init__(self, initial_data=None):
+        self._write_lock = threading.Lock()
+        self._current = TelemetrySnapshot(0, time.time(), FrozenSample(initial_data or {}))
+
+    # Publish a new sample and return its snapshot
+    def publish(self, data, timestamp=None):
+        sample = FrozenSample(data)
+        with self._write_lock:
+            snapshot = TelemetrySnapshot(self._current.version + 1, time.time() if timestamp is None else timestamp, sample)
+            self._current = snapshot
+        return snapshot
+
+    # Get the latest snapshot without locking
+    def latest(self):
+        return self._current
+
+    # Get the latest sample data without locking or copying
+    def latest_data(self):
+        return self._current.data
+
+    # Get the current version number (increments on every publish)
+    @property
+    def version(self):
+        return self._current.version
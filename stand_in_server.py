@@ -0,0 +1,268 @@
+import gzip
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import configparser
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Raw latency samples kept for percentiles; later samples only update the counters
+MAX_LATENCY_SAMPLES = 1000000
+
+# Threaded HTTP server with a deeper accept backlog for many client connections
+class StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+# Request handler shared by both endpoints; the owning StandInServer does the work
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, payload = self.server.stand_in.handle_post(self.path, self.headers, body)
+        self._reply(status, payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._reply(200, self.server.stand_in.get_stats())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Class serving local stand-ins for the telemetry server ([server] endpoint)
+# and the drone control API (/adjust_power).
+# Every request first waits `latency` seconds (plus up to `latency_jitter`),
+# is refused with 429 when more than `max_requests_per_second` arrive (token
+# bucket, 0 disables the cap), and fails with 503 with probability
+# `error_rate`. Telemetry bodies may be single samples or gzip-compressed
+# {"samples": [...]} batches; the age of each sample's timestamp on arrival is
+# recorded as its end-to-end latency. Power commands honour Idempotency-Key so
+# a retried command is applied once, and the latest setpoint per drone is kept.
+class StandInServer:
+    def __init__(self, host="127.0.0.1", port=8080, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 max_requests_per_second=0.0, telemetry_path="/telemetry", command_path="/adjust_power", seed=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.max_requests_per_second = max_requests_per_second
+        self.telemetry_path = telemetry_path
+        self.command_path = command_path
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max_requests_per_second
+        self._refilled = time.monotonic()
+        self._httpd = None
+        self._thread = None
+        self.reset()
+
+    # Clear counters, latency samples and stored setpoints
+    def reset(self):
+        with self._lock:
+            self.setpoints = {}
+            self._applied_keys = set()
+            self._sample_latencies = []
+            self._stats = {
+                "requests": 0,
+                "status": {},
+                "telemetry_requests": 0,
+                "samples_received": 0,
+                "bytes_received": 0,
+                "commands_applied": 0,
+                "duplicate_commands": 0,
+                "rejected_throttled": 0,
+                "rejected_errors": 0
+            }
+            self._started = time.monotonic()
+
+    # Start serving on a background thread (port 0 picks a free port)
+    def start(self):
+        if self._httpd is not None:
+            return
+        self._httpd = StandInHTTPServer((self.host, self.port), StandInRequestHandler)
+        self._httpd.stand_in = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="StandInServer", daemon=True)
+        self._thread.start()
+        logging.info("Stand-in server listening on http://%s:%s", self.host, self.port)
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    @property
+    def telemetry_url(self):
+        return f"http://{self.host}:{self.port}{self.telemetry_path}"
+
+    @property
+    def command_url(self):
+        return f"http://{self.host}:{self.port}{self.command_path}"
+
+    # Take one token from the request-rate bucket; False means throttle
+    def _take_token(self):
+        if self.max_requests_per_second <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.max_requests_per_second, self._tokens + (now - self._refilled) * self.max_requests_per_second)
+        self._refilled = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    # Handle one POST; returns (status, JSON payload)
+    def handle_post(self, path, headers, body):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes_received"] += len(body)
+            delay = self.latency + (self._random.uniform(0.0, self.latency_jitter) if self.latency_jitter else 0.0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            throttled = not self._take_token()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if throttled:
+            status, payload = 429, {"error": "throughput cap exceeded"}
+        elif failed:
+            status, payload = 503, {"error": "injected failure"}
+        elif path == self.telemetry_path:
+            status, payload = self._handle_telemetry(headers, body)
+        elif path == self.command_path:
+            status, payload = self._handle_command(headers, body)
+        else:
+            status, payload = 404, {"error": "not found"}
+
+        with self._lock:
+            self._stats["status"][status] = self._stats["status"].get(status, 0) + 1
+            if throttled:
+                self._stats["rejected_throttled"] += 1
+            elif failed:
+                self._stats["rejected_errors"] += 1
+        return status, payload
+
+    def _handle_telemetry(self, headers, body):
+        try:
+            if headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            document = json.loads(body)
+        except (OSError, ValueError):
+            return 400, {"error": "malformed telemetry"}
+        samples = document.get("samples", [document]) if isinstance(document, dict) else document
+
+        now = time.time()
+        latencies = [now - sample["timestamp"] for sample in samples if isinstance(sample, dict) and "timestamp" in sample]
+        with self._lock:
+            self._stats["telemetry_requests"] += 1
+            self._stats["samples_received"] += len(samples)
+            room = MAX_LATENCY_SAMPLES - len(self._sample_latencies)
+            self._sample_latencies.extend(latencies[:max(room, 0)])
+        return 200, {"received": len(samples)}
+
+    def _handle_command(self, headers, body):
+        try:
+            command = json.loads(body)
+            drone_id = command["drone_id"]
+            voltage = float(command["voltage"])
+            current = float(command["current"])
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "malformed command"}
+
+        key = headers.get("Idempotency-Key") or command.get("command_id")
+        with self._lock:
+            if key is not None and key in self._applied_keys:
+                self._stats["duplicate_commands"] += 1
+                return 200, {"applied": False, "duplicate": True}
+            if key is not None:
+                self._applied_keys.add(key)
+            self.setpoints[drone_id] = (voltage, current)
+            self._stats["commands_applied"] += 1
+        return 200, {"applied": True}
+
+    # Get counters plus end-to-end telemetry latency percentiles (milliseconds)
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["status"] = {str(status): count for status, count in self._stats["status"].items()}
+            stats["elapsed"] = time.monotonic() - self._started
+            stats["drones_commanded"] = len(self.setpoints)
+            latencies = np.array(self._sample_latencies)
+        if latencies.size:
+            p50, p99, p999 = np.percentile(latencies, (50, 99, 99.9)) * 1e3
+            stats["sample_latency_ms"] = {"p50": p50, "p99": p99, "p999": p999, "max": latencies.max() * 1e3, "count": int(latencies.size)}
+        return stats
+
+# Function to create a stand-in server from the [stand_in_server] configuration;
+# keyword arguments override individual settings
+def create_stand_in_server(config, **overrides):
+    section = "stand_in_server"
+    settings = {
+        "host": config.get(section, "host", fallback="127.0.0.1"),
+        "port": config.getint(section, "port", fallback=8080),
+        "latency": config.getfloat(section, "latency", fallback=0.0),
+        "latency_jitter": config.getfloat(section, "latency_jitter", fallback=0.0),
+        "error_rate": config.getfloat(section, "error_rate", fallback=0.0),
+        "max_requests_per_second": config.getfloat(section, "max_requests_per_second", fallback=0.0)
+    }
+    settings.update((name, value) for name, value in overrides.items() if value is not None)
+    return StandInServer(**settings)
+
+if __name__ == "__main__":
+    # Load configuration from the "config.ini" file; command-line options override it
+    config = configparser.ConfigParser()
+    config.read("config.ini")
+
+    parser = argparse.ArgumentParser(description="Serve local stand-ins for the telemetry server and drone control API.")
+    parser.add_argument("--host", help="default: [stand_in_server] host")
+    parser.add_argument("--port", type=int, help="default: [stand_in_server] port")
+    parser.add_argument("--latency", type=float, help="seconds added to every request")
+    parser.add_argument("--latency-jitter", type=float, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, help="fraction of requests answered with 503")
+    parser.add_argument("--max-rps", type=float, help="requests per second before answering 429 (0 = unlimited)")
+    args = parser.parse_args()
+
+    server = create_stand_in_server(config, host=args.host, port=args.port, latency=args.latency, latency_jitter=args.latency_jitter,
+                                    error_rate=args.error_rate, max_requests_per_second=args.max_rps)
+    logging.basicConfig(level=logging.INFO)
+    server.start()
+    print(f"Telemetry endpoint: {server.telemetry_url}")
+    print(f"Power command endpoint: {server.command_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stand-in server stopped by the user.")
+    finally:
+        server.stop()
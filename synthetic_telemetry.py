@@ -0,0 +1,173 @@
+import time
+import numpy as np
+
+# Open-circuit voltage of a Li-ion cell against state of charge (0 = empty,
+# 1 = full), normalized to 0..1 and scaled onto the configured voltage range
+DISCHARGE_CURVE_SOC = np.array([0.0, 0.05, 0.1, 0.2, 0.4, 0.6, 0.8, 0.95, 1.0])
+DISCHARGE_CURVE_OCV = (np.array([3.0, 3.3, 3.45, 3.6, 3.7, 3.8, 3.95, 4.1, 4.2]) - 3.0) / 1.2
+
+# Injected fault kinds; bit i of a sample's fault mask is set while FAULT_KINDS[i] is active
+FAULT_KINDS = ("voltage_sag", "overcurrent", "overheat")
+
+# Columns of the generated value blocks
+SYNTHETIC_CHANNELS = ("voltage", "current", "temperature")
+
+# Class generating telemetry for a whole fleet, one (n_drones, 3) block per step.
+# Every operation is vectorized across drones and all randomness comes from
+# one seeded NumPy Generator, so a seed reproduces the same fleet exactly.
+# Models:
+#   battery   - coulomb counting drains each drone's state of charge; voltage
+#               follows a Li-ion discharge curve minus the I*R drop, and a
+#               drone that reaches `recharge_soc` gets a fresh battery
+#   current   - per-drone base load plus mean-reverting noise and random
+#               spikes (Poisson arrivals, exponential size, decaying)
+#   thermal   - temperature approaches ambient + `thermal_gain` * I^2 with a
+#               first-order lag of `thermal_tau` seconds
+#   faults    - voltage sags, overcurrent and overheating start at
+#               `fault_rate` per drone per second (or via inject_fault) and
+#               last `fault_duration` seconds; the returned masks are the
+#               ground truth for scoring detectors
+class SyntheticFleetGenerator:
+    def __init__(self, n_drones, rate=10.0, seed=None, start_time=None,
+                 min_voltage=10.0, max_voltage=13.0, min_current=1.5, max_current=2.5, ambient_temperature=(25.0, 30.0),
+                 flight_time=1800.0, internal_resistance=0.05, voltage_noise=0.01, current_noise=0.05, current_tau=2.0,
+                 spike_rate=0.01, spike_magnitude=0.5, spike_tau=0.5, thermal_tau=60.0, thermal_gain=1.0,
+                 fault_rate=0.0, fault_duration=(5.0, 30.0), voltage_sag=1.5, overcurrent=1.5, overheat=15.0, recharge_soc=0.05):
+        self.n_drones = n_drones
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.channels = SYNTHETIC_CHANNELS
+        self.rng = np.random.default_rng(seed)
+        self.start_time = time.time() if start_time is None else start_time
+        self.steps = 0
+
+        self.min_voltage = min_voltage
+        self.voltage_span = max_voltage - min_voltage
+        self.internal_resistance = internal_resistance
+        self.voltage_noise = voltage_noise
+        self.current_noise = current_noise
+        self.spike_rate = spike_rate
+        self.spike_magnitude = spike_magnitude
+        self.thermal_gain = thermal_gain
+        self.fault_rate = fault_rate
+        self.fault_duration = fault_duration
+        self.fault_offsets = np.array([voltage_sag, overcurrent, overheat])
+        self.recharge_soc = recharge_soc
+        self._fault_bits = (1 << np.arange(len(FAULT_KINDS))).astype(np.uint8)
+
+        # Per-step decay factors of the noise, spike and thermal models
+        self._current_decay = np.exp(-self.dt / current_tau)
+        self._current_innovation = np.sqrt(1.0 - self._current_decay ** 2) * current_noise
+        self._spike_decay = np.exp(-self.dt / spike_tau)
+        self._thermal_step = 1.0 - np.exp(-self.dt / thermal_tau)
+
+        # Per-drone state; base loads keep clear of the current limits
+        span = max_current - min_current
+        rng = self.rng
+        self.base_current = rng.uniform(min_current + 0.2 * span, max_current - 0.3 * span, n_drones)
+        self.capacity = self.base_current * flight_time * rng.uniform(0.9, 1.1, n_drones)
+        self.soc = rng.uniform(0.3, 1.0, n_drones)
+        self.ambient = rng.uniform(ambient_temperature[0], ambient_temperature[1], n_drones)
+        self.temperature = self.ambient + thermal_gain * self.base_current ** 2
+        self.current_noise_state = np.zeros(n_drones)
+        self.spike = np.zeros(n_drones)
+        self.fault_remaining = np.zeros((n_drones, len(FAULT_KINDS)))
+
+    # Build a generator from the [data_generation] configuration
+    @classmethod
+    def from_config(cls, config, n_drones=1, seed=None, section="data_generation"):
+        min_temperature = config.getfloat(section, "min_temperature", fallback=25.0)
+        max_temperature = config.getfloat(section, "max_temperature", fallback=35.0)
+        return cls(
+            n_drones,
+            rate=1.0 / config.getfloat(section, "update_interval", fallback=0.5),
+            seed=config.getint(section, "seed", fallback=None) if seed is None else seed,
+            min_voltage=config.getfloat(section, "min_voltage", fallback=10.0),
+            max_voltage=config.getfloat(section, "max_voltage", fallback=13.0),
+            min_current=config.getfloat(section, "min_current", fallback=1.5),
+            max_current=config.getfloat(section, "max_current", fallback=2.5),
+            ambient_temperature=(min_temperature, min_temperature + (max_temperature - min_temperature) / 2),
+            flight_time=config.getfloat(section, "flight_time", fallback=1800.0),
+            spike_rate=config.getfloat(section, "spike_rate", fallback=0.01),
+            fault_rate=config.getfloat(section, "fault_rate", fallback=0.0)
+        )
+
+    # Start a fault on one drone for `duration` seconds
+    def inject_fault(self, drone_index, kind, duration):
+        self.fault_remaining[drone_index, FAULT_KINDS.index(kind)] = duration
+
+    # Advance one sample period; returns (timestamp, values, fault_masks) where
+    # values has one row per drone with columns SYNTHETIC_CHANNELS
+    def step(self, out=None):
+        rng = self.rng
+        n_drones = self.n_drones
+        dt = self.dt
+
+        # Faults start as Poisson arrivals per drone and kind
+        if self.fault_rate > 0:
+            starts = np.flatnonzero(rng.random(self.fault_remaining.size) < self.fault_rate * dt / len(FAULT_KINDS))
+            if len(starts):
+                remaining = self.fault_remaining.reshape(-1)
+                remaining[starts] = np.maximum(remaining[starts], rng.uniform(self.fault_duration[0], self.fault_duration[1], len(starts)))
+        # Allow for rounding left over from repeatedly subtracting dt, so a
+        # fault of duration d covers exactly ceil(d / dt) samples
+        active = self.fault_remaining > 1e-6 * dt
+        np.maximum(self.fault_remaining - dt, 0.0, out=self.fault_remaining)
+        offsets = active * self.fault_offsets
+
+        # Current: base load, mean-reverting noise and decaying spikes
+        self.current_noise_state *= self._current_decay
+        self.current_noise_state += self._current_innovation * rng.standard_normal(n_drones)
+        self.spike *= self._spike_decay
+        arrivals = np.flatnonzero(rng.random(n_drones) < self.spike_rate * dt)
+        if len(arrivals):
+            self.spike[arrivals] += rng.exponential(self.spike_magnitude, len(arrivals))
+        current = self.base_current + self.current_noise_state + self.spike + offsets[:, 1]
+
+        # Battery: drain the charge, swap empty batteries, read the discharge curve
+        self.soc -= current * dt / self.capacity
+        self.soc[self.soc <= self.recharge_soc] = 1.0
+        voltage = self.min_voltage + self.voltage_span * np.interp(self.soc, DISCHARGE_CURVE_SOC, DISCHARGE_CURVE_OCV)
+        voltage -= current * self.internal_resistance + offsets[:, 0]
+        voltage += self.voltage_noise * rng.standard_normal(n_drones)
+
+        # Temperature lags behind the heating from the current draw
+        target = self.ambient + self.thermal_gain * current * current + offsets[:, 2]
+        self.temperature += (target - self.temperature) * self._thermal_step
+
+        if out is None:
+            out = np.empty((n_drones, len(self.channels)))
+        out[:, 0] = voltage
+        out[:, 1] = current
+        out[:, 2] = self.temperature
+        fault_masks = (active * self._fault_bits).sum(axis=1, dtype=np.uint8)
+
+        timestamp = self.start_time + self.steps * dt
+        self.steps += 1
+        return timestamp, out, fault_masks
+
+    # Generate `steps` consecutive blocks; returns (timestamps, values, fault_masks)
+    # shaped (steps,), (steps, n_drones, 3) and (steps, n_drones)
+    def generate(self, steps):
+        timestamps = np.empty(steps)
+        values = np.empty((steps, self.n_drones, len(self.channels)))
+        fault_masks = np.empty((steps, self.n_drones), dtype=np.uint8)
+        for index in range(steps):
+            timestamps[index], _, fault_masks[index] = self.step(out=values[index])
+        return timestamps, values, fault_masks
+
+# Function to feed a fleet registry from a generator at the generator's rate until stop_event is set
+def run_synthetic_fleet(generator, registry, stop_event, drone_ids=None):
+    if drone_ids is None:
+        drone_ids = [f"drone-{index}" for index in range(generator.n_drones)]
+    next_step = time.monotonic()
+    while not stop_event.is_set():
+        _, values, _ = generator.step()
+        registry.update_many(drone_ids, values)
+        next_step += generator.dt
+        delay = next_step - time.monotonic()
+        if delay > 0:
+            stop_event.wait(delay)
+        else:
+            # Fell behind: skip the missed steps rather than bursting
+            next_step = time.monotonic()
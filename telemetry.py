@@ -1,68 +1,110 @@
 import random
 import time
+import argparse
 import threading
+import atexit
 import logging
 import numpy as np
 import matplotlib.pyplot as plt
+from telemetry_archive import TelemetryArchiveWriter, load_archive_range
+from snapshot import SnapshotPublisher
+from ring_buffer import TimeSeriesRingBuffer
+from live_plot import LivePlot
+from event_bus import TelemetryEventBus, channel_range, channel_delta, outside_range
+from fleet_registry import fleet_registry
+from logging_setup import configure_logging, get_sample_logger
 
-telemetry_data = {
+TELEMETRY_ARCHIVE_PATH = "telemetry_data.bin"
+
+telemetry_publisher = SnapshotPublisher({
     "voltage": 0.0,
     "current": 0.0,
     "temperature": 0.0
-}
+})
+
+telemetry_history = TimeSeriesRingBuffer(36000, fields=("timestamp", "voltage", "current", "temperature"))
+
+# Telemetry events: subscribers register predicates on the bus, samples are published in batches
+telemetry_event_bus = TelemetryEventBus(("voltage", "current", "temperature"))
+telemetry_events_published = -np.inf
 
-telemetry_lock = threading.Lock()
+# Predicates of the standard telemetry events
+VOLTAGE_IN_RANGE = channel_range("voltage", 10.5, 12.5)
+TEMPERATURE_HIGH = outside_range("temperature", high=30.0)
+VOLTAGE_CHANGED = channel_delta("voltage", 0.1)
+TEMPERATURE_CHANGED = channel_delta("temperature", 0.5)
+
+configure_logging()
 telemetry_logger = logging.getLogger("TelemetryDataLogger")
-telemetry_logger.setLevel(logging.INFO)
-telemetry_file_handler = logging.FileHandler("telemetry_data.log")
-telemetry_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-telemetry_file_handler.setFormatter(telemetry_formatter)
-telemetry_logger.addHandler(telemetry_file_handler)
+telemetry_sample_logger = get_sample_logger("telemetry")
+telemetry_archive_writer = None
+telemetry_archive_lock = threading.Lock()
 
 def update_telemetry_data():
-    global telemetry_data
     while True:
         voltage = round(random.uniform(10.0, 13.0), 2)
         current = round(random.uniform(1.5, 2.5), 2)
         temperature = round(random.uniform(25.0, 35.0), 1)
-        with telemetry_lock:
-            telemetry_data["voltage"] = voltage
-            telemetry_data["current"] = current
-            telemetry_data["temperature"] = temperature
-        telemetry_logger.info(f"Voltage: {voltage} V, Current: {current} A, Temperature: {temperature} °C")
+        snapshot = telemetry_publisher.publish({"voltage": voltage, "current": current, "temperature": temperature})
+        telemetry_history.append(snapshot.timestamp, voltage, current, temperature)
+        telemetry_sample_logger.log(snapshot.data)
         time.sleep(0.5)
 
 def get_telemetry_data():
-    global telemetry_data
-    with telemetry_lock:
-        return telemetry_data.copy()
+    return telemetry_publisher.latest_data()
+
+def get_telemetry_snapshot():
+    return telemetry_publisher.latest()
 
 def start_telemetry_update_thread():
     telemetry_thread = threading.Thread(target=update_telemetry_data)
     telemetry_thread.start()
 
-def voltage_filter(key, value):
-    return 10.5 <= value <= 12.5
-
-def temperature_filter(key, value):
-    return value > 30.0
-
-def handle_telemetry_event(event_callback):
-    event = random.choice(["voltage_change", "temperature_change"])
-    if event == "voltage_change":
-        voltage = round(random.uniform(10.0, 13.0), 2)
-        event_callback(event, voltage)
-    elif event == "temperature_change":
-        temperature = round(random.uniform(25.0, 35.0), 1)
-        event_callback(event, temperature)
+# Function to subscribe event_callback(event, value) to the standard telemetry events;
+# the callback is invoked once per matching sample with the event's channel value
+def subscribe_telemetry_events(event_callback):
+    def per_event(channel):
+        def dispatch(events):
+            column = events["channels"].index(channel)
+            for value in events["values"][:, column].tolist():
+                event_callback(events["name"], value)
+        return dispatch
+
+    return [
+        telemetry_event_bus.subscribe(per_event("voltage"), VOLTAGE_CHANGED, VOLTAGE_IN_RANGE, name="voltage_change"),
+        telemetry_event_bus.subscribe(per_event("temperature"), TEMPERATURE_CHANGED, TEMPERATURE_HIGH, name="temperature_change")
+    ]
+
+# Function to publish the telemetry history recorded since the previous call
+def publish_telemetry_events():
+    global telemetry_events_published
+    history = telemetry_history.window()
+    first = int(np.searchsorted(history["timestamp"], telemetry_events_published, side="right"))
+    if first == len(history["timestamp"]):
+        return 0
+    values = np.column_stack([history[name][first:] for name in telemetry_event_bus.channels])
+    telemetry_events_published = float(history["timestamp"][-1])
+    return telemetry_event_bus.publish(values, timestamps=history["timestamp"][first:])
+
+# Function to publish the latest telemetry of every drone; drones without a new sample are skipped
+def publish_fleet_events(registry=fleet_registry):
+    drone_ids, values, timestamps = registry.snapshot(channels=telemetry_event_bus.channels)
+    return telemetry_event_bus.publish(values, drone_ids, timestamps)
+
+def log_telemetry_event(event, value):
+    telemetry_logger.info("Telemetry event %s: %s", event, value)
 
 def start_telemetry_event_handler_thread(event_callback):
-    event_handler_thread = threading.Thread(target=telemetry_event_handler, args=(event_callback,))
+    subscribe_telemetry_events(event_callback)
+    event_handler_thread = threading.Thread(target=telemetry_event_handler)
     event_handler_thread.start()
 
-def telemetry_event_handler(event_callback):
+def telemetry_event_handler():
     while True:
-        handle_telemetry_event(event_callback)
+        try:
+            publish_telemetry_events()
+        except Exception as e:
+            logging.error(f"Failed to publish telemetry events: {str(e)}")
         time.sleep(5)
 
 def perform_power_analysis(telemetry_data):
@@ -111,68 +153,100 @@ def plot_telemetry_data():
         ax.grid()
     plt.show()
 
+def get_telemetry_archive_writer():
+    global telemetry_archive_writer
+    with telemetry_archive_lock:
+        if telemetry_archive_writer is None:
+            telemetry_archive_writer = TelemetryArchiveWriter(TELEMETRY_ARCHIVE_PATH)
+            atexit.register(telemetry_archive_writer.close)
+        return telemetry_archive_writer
+
+def plot_telemetry_data_live(stop_event, interval=0.1, max_points=2000, method="minmax"):
+    live_plot = LivePlot(
+        [("voltage", "Voltage (V)", "blue"), ("current", "Current (A)", "green"), ("temperature", "Temperature (°C)", "red")],
+        "Telemetry Data Over Time",
+        max_points=max_points,
+        method=method
+    )
+    live_plot.show()
+    try:
+        while not stop_event.is_set():
+            history = telemetry_history.window(copy=True)
+            live_plot.update(history["timestamp"], history)
+            stop_event.wait(timeout=interval)
+    finally:
+        live_plot.close()
+
 def log_telemetry_data(telemetry_data):
     try:
-        with open("telemetry_data.csv", "a") as file:
-            timestamp = time.time()
-            voltage = telemetry_data.get("voltage", 0.0)
-            current = telemetry_data.get("current", 0.0)
-            temperature = telemetry_data.get("temperature", 0.0)
-            file.write(f"{timestamp},{voltage},{current},{temperature}\n")
+        get_telemetry_archive_writer().append(telemetry_data)
 
     except Exception as e:
         logging.error(f"Failed to log telemetry data: {str(e)}")
 
-def visualize_telemetry_data():
+def visualize_telemetry_data(start=None, end=None, max_points=100000):
     try:
-        with open("telemetry_data.csv", "r") as file:
-            data = np.loadtxt(file, delimiter=",", skiprows=1)
-            timestamps = data[:, 0]
-            voltages = data[:, 1]
-            currents = data[:, 2]
-            temperatures = data[:, 3]
-            plt.figure(figsize=(12, 6))
-            plt.subplot(3, 1, 1)
-            plt.plot(timestamps, voltages, label="Voltage (V)")
-            plt.xlabel("Timestamp")
-            plt.ylabel("Voltage (V)")
-            plt.legend()
-            plt.subplot(3, 1, 2)
-            plt.plot(timestamps, currents, label="Current (A)")
-            plt.xlabel("Timestamp")
-            plt.ylabel("Current (A)")
-            plt.legend()
-            plt.subplot(3, 1, 3)
-            plt.plot(timestamps, temperatures, label="Temperature (°C)")
-            plt.xlabel("Timestamp")
-            plt.ylabel("Temperature (°C)")
-            plt.legend()
-            plt.tight_layout()
-            plt.show()
+        if telemetry_archive_writer is not None:
+            telemetry_archive_writer.flush()
+        # Stream only the requested time range of the archive, decimated to max_points
+        data = load_archive_range(TELEMETRY_ARCHIVE_PATH, start, end, max_points=max_points)
+        timestamps = data["timestamp"]
+        voltages = data["voltage"]
+        currents = data["current"]
+        temperatures = data["temperature"]
+        plt.figure(figsize=(12, 6))
+        plt.subplot(3, 1, 1)
+        plt.plot(timestamps, voltages, label="Voltage (V)")
+        plt.xlabel("Timestamp")
+        plt.ylabel("Voltage (V)")
+        plt.legend()
+        plt.subplot(3, 1, 2)
+        plt.plot(timestamps, currents, label="Current (A)")
+        plt.xlabel("Timestamp")
+        plt.ylabel("Current (A)")
+        plt.legend()
+        plt.subplot(3, 1, 3)
+        plt.plot(timestamps, temperatures, label="Temperature (°C)")
+        plt.xlabel("Timestamp")
+        plt.ylabel("Temperature (°C)")
+        plt.legend()
+        plt.tight_layout()
+        plt.show()
 
     except Exception as e:
         logging.error(f"Failed to visualize telemetry data: {str(e)}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated telemetry with event logging and power analysis.")
+    parser.add_argument("--live-plot", action="store_true", help="show the telemetry history in a live plot instead of the power analysis loop")
+    args = parser.parse_args()
+
     start_telemetry_update_thread()
-    start_telemetry_event_handler_thread(handle_telemetry_event)
+    start_telemetry_event_handler_thread(log_telemetry_event)
 
-    while True:
+    if args.live_plot:
+        # Matplotlib needs the main thread; runs until interrupted
         try:
-            telemetry_data = get_telemetry_data()
-            power_analysis_results = perform_power_analysis(telemetry_data)
-            display_power_analysis_results(power_analysis_results)
-            log_telemetry_data(telemetry_data)
-            time.sleep(5)
-
+            plot_telemetry_data_live(threading.Event())
         except KeyboardInterrupt:
-            logging.info("Power analysis interrupted by user.")
-            break
-
-        except Exception as e:
-            logging.error(f"Failed to perform power analysis: {str(e)}")
-            display_error("An error occurred while performing power analysis.")
-            time.sleep(1)
-
-    stop_telemetry_update_thread()
-    visualize_telemetry_data()
+            logging.info("Live telemetry plot interrupted by user.")
+    else:
+        while True:
+            try:
+                telemetry_data = get_telemetry_data()
+                power_analysis_results = perform_power_analysis(telemetry_data)
+                display_power_analysis_results(power_analysis_results)
+                log_telemetry_data(telemetry_data)
+                time.sleep(5)
+
+            except KeyboardInterrupt:
+                logging.info("Power analysis interrupted by user.")
+                break
+
+            except Exception as e:
+                logging.error(f"Failed to perform power analysis: {str(e)}")
+                display_error("An error occurred while performing power analysis.")
+                time.sleep(1)
+
+        stop_telemetry_update_thread()
+        visualize_telemetry_data()
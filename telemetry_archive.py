@@ -0,0 +1,333 @@
+import os
+import time
+import zlib
+import struct
+import logging
+import threading
+import numpy as np
+
+# Fixed-width record layout of the binary telemetry archive (little-endian)
+TELEMETRY_RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("voltage", "<f8"),
+    ("current", "<f8"),
+    ("temperature", "<f8")
+])
+
+# File header: magic, format version, record size in bytes
+ARCHIVE_MAGIC = b"RPGTLM\x00\x01"
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct("<8sII")
+
+# Build the header bytes for a record layout
+def _archive_header(dtype):
+    return ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, dtype.itemsize)
+
+# Validate the header of an open archive file and return the record size
+def _read_archive_header(file):
+    header = file.read(ARCHIVE_HEADER.size)
+    if len(header) != ARCHIVE_HEADER.size:
+        raise ValueError("Telemetry archive header is truncated")
+    magic, version, record_size = ARCHIVE_HEADER.unpack(header)
+    if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+        raise ValueError("Not a telemetry archive or unsupported archive version")
+    return record_size
+
+# Class to append telemetry records to a binary archive.
+# The file stays open and records are staged in a preallocated block that is
+# written with a single call once it fills up (or on flush/close).
+class TelemetryArchiveWriter:
+    def __init__(self, path, block_records=1024, dtype=TELEMETRY_RECORD_DTYPE):
+        self.path = path
+        self.dtype = dtype
+        self._block = np.zeros(block_records, dtype=dtype)
+        self._fill = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+
+        if self._file.tell() == 0:
+            self._file.write(_archive_header(dtype))
+        else:
+            with open(path, "rb") as existing:
+                if _read_archive_header(existing) != dtype.itemsize:
+                    self._file.close()
+                    raise ValueError(f"Record size of {path} does not match the writer layout")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Append one telemetry sample; missing channels are stored as 0.0
+    def append(self, telemetry_data, timestamp=None):
+        with self._lock:
+            record = self._block[self._fill]
+            for name in self.dtype.names:
+                if name == "timestamp":
+                    record[name] = time.time() if timestamp is None else timestamp
+                else:
+                    record[name] = telemetry_data.get(name, 0.0)
+            self._fill += 1
+            if self._fill == len(self._block):
+                self._write_block()
+
+    # Append many records at once from a structured array with the same layout
+    def append_records(self, records):
+        with self._lock:
+            self._write_block()
+            self._file.write(np.ascontiguousarray(records, dtype=self.dtype).tobytes())
+
+    # Write the staged block to the file (caller holds the lock)
+    def _write_block(self):
+        if self._fill:
+            self._file.write(self._block[:self._fill].tobytes())
+            self._fill = 0
+
+    # Push staged records to the operating system
+    def flush(self):
+        with self._lock:
+            self._write_block()
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write_block()
+            self._file.close()
+
+# Function to memory-map a telemetry archive as a read-only structured array.
+# No data is parsed or copied; pages are only read when a slice is touched.
+def open_telemetry_archive(path, dtype=TELEMETRY_RECORD_DTYPE):
+    with open(path, "rb") as file:
+        record_size = _read_archive_header(file)
+    if record_size != dtype.itemsize:
+        raise ValueError(f"Record size of {path} does not match the reader layout")
+
+    # Ignore a trailing partial record left by an interrupted writer
+    count = (os.path.getsize(path) - ARCHIVE_HEADER.size) // record_size
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=ARCHIVE_HEADER.size, shape=(count,))
+
+# Function to convert a "timestamp,voltage,current,temperature" CSV log into an archive
+def convert_csv_to_archive(csv_path, archive_path, chunk_lines=65536):
+    with open(csv_path, "r") as csv_file, TelemetryArchiveWriter(archive_path) as writer:
+        while True:
+            lines = [line for _, line in zip(range(chunk_lines), csv_file)]
+            if not lines:
+                break
+            rows = np.loadtxt(lines, delimiter=",", ndmin=2)
+            records = np.zeros(len(rows), dtype=TELEMETRY_RECORD_DTYPE)
+            for column, name in enumerate(TELEMETRY_RECORD_DTYPE.names):
+                records[name] = rows[:, column]
+            writer.append_records(records)
+
+# Number of bytes at the end of the indexed part of a file that are checksummed
+# to tell an appended file (index still valid) from a rewritten one
+INDEX_CHECK_BYTES = 4096
+
+# Function to checksum the INDEX_CHECK_BYTES bytes of a file that end at `end`
+def _tail_checksum(path, end):
+    start = max(0, end - INDEX_CHECK_BYTES)
+    with open(path, "rb") as file:
+        file.seek(start)
+        return zlib.crc32(file.read(end - start))
+
+# Function to load a sidecar index if it still describes the file.
+# It is used as is when the file size and mtime are the ones recorded; after
+# any other change it is only reused if the indexed bytes are still there
+# unchanged, i.e. the file was appended to. Returns None for a missing,
+# unreadable or outdated sidecar.
+def _load_index(index_path, path, stride, stat):
+    try:
+        with np.load(index_path) as cached:
+            cached = {name: cached[name] for name in cached.files}
+    except (OSError, ValueError):
+        return None
+    if "checksum" not in cached or int(cached["stride"]) != stride:
+        return None
+    if int(cached["size"]) == stat.st_size and int(cached["mtime_ns"]) == stat.st_mtime_ns:
+        return cached
+    indexed_bytes = int(cached["indexed_bytes"])
+    if indexed_bytes <= stat.st_size and _tail_checksum(path, indexed_bytes) == int(cached["checksum"]):
+        return cached
+    return None
+
+# Function to save a sidecar index together with what _load_index validates.
+# Saving is best effort: in a read-only location the index just stays in memory.
+def _save_index(index_path, path, stride, stat, indexed_bytes, **arrays):
+    try:
+        np.savez(index_path, stride=stride, size=stat.st_size, mtime_ns=stat.st_mtime_ns, indexed_bytes=indexed_bytes,
+                 checksum=_tail_checksum(path, indexed_bytes), **arrays)
+    except OSError as e:
+        logging.debug(f"Could not save index {index_path}: {str(e)}")
+
+# Function to get the sidecar index path of an archive
+def archive_index_path(path):
+    return path + ".idx.npz"
+
+# Function to build (or extend) the sparse timestamp index of an archive.
+# The index holds the timestamp of every `stride`-th record, so it touches
+# about one page per stride records and lets a time-range query jump to the
+# right block instead of scanning. It is cached next to the archive (when the
+# directory is writable) and only the records appended since the last build
+# are indexed again; a rewritten archive is indexed from scratch.
+def build_archive_index(path, stride=4096, records=None):
+    if records is None:
+        records = open_telemetry_archive(path)
+    index_path = archive_index_path(path)
+    stat = os.stat(path)
+    timestamps = np.zeros(0, dtype=np.float64)
+    cached = _load_index(index_path, path, stride, stat)
+    if cached is not None and int(cached["count"]) <= len(records):
+        timestamps = cached["timestamps"]
+    first = len(timestamps) * stride
+    if first < len(records) or len(timestamps) == 0:
+        timestamps = np.concatenate([timestamps, np.asarray(records["timestamp"][first::stride], dtype=np.float64)])
+        _save_index(index_path, path, stride, stat, ARCHIVE_HEADER.size + len(records) * records.dtype.itemsize,
+                    count=len(records), timestamps=timestamps)
+    return timestamps
+
+# Function to find the [first, last) record range with start <= timestamp < end.
+# Timestamps must be non-decreasing, which holds for archives written in time order.
+def find_record_range(records, start=None, end=None, index=None, stride=4096):
+    count = len(records)
+    if start is None and end is None:
+        return 0, count
+    if index is None:
+        index = np.asarray(records["timestamp"][::stride], dtype=np.float64)
+
+    def locate(timestamp):
+        block = max(0, int(np.searchsorted(index, timestamp, side="left")) - 1)
+        low = block * stride
+        high = min(count, int(np.searchsorted(index, timestamp, side="right")) * stride + 1)
+        return low + int(np.searchsorted(records["timestamp"][low:high], timestamp, side="left"))
+
+    first = 0 if start is None else locate(start)
+    last = count if end is None else locate(end)
+    return first, max(first, last)
+
+# Generator yielding an archive as fixed-size chunks of column arrays.
+# Only the records inside [start, end) are touched, `columns` limits the
+# fields returned (zero-copy views of the memory map) and `step` keeps every
+# step-th record across the whole range.
+def iter_archive_chunks(path, chunk_records=65536, start=None, end=None, columns=None, step=1, stride=4096):
+    records = open_telemetry_archive(path)
+    if columns is None:
+        columns = records.dtype.names
+    index = build_archive_index(path, stride, records) if len(records) and (start is not None or end is not None) else None
+    first, last = find_record_range(records, start, end, index, stride)
+
+    # Align chunk sizes to the decimation step so the stride stays global
+    chunk_records = max(step, chunk_records - chunk_records % step)
+    for chunk_start in range(first, last, chunk_records):
+        chunk = records[chunk_start:min(last, chunk_start + chunk_records):step]
+        yield {name: chunk[name] for name in columns}
+
+# Function to load a time range of an archive, decimated to at most `max_points` records
+def load_archive_range(path, start=None, end=None, columns=None, max_points=None, chunk_records=65536):
+    records = open_telemetry_archive(path)
+    if columns is None:
+        columns = records.dtype.names
+    step = 1
+    if max_points:
+        index = build_archive_index(path, records=records) if len(records) and (start is not None or end is not None) else None
+        first, last = find_record_range(records, start, end, index)
+        step = max(1, -(-(last - first) // max_points))
+    chunks = list(iter_archive_chunks(path, chunk_records, start, end, columns, step))
+    if not chunks:
+        return {name: np.zeros(0, dtype=records.dtype[name]) for name in columns}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in columns}
+
+# Generator yielding a "timestamp,voltage,current,temperature" CSV log in chunks of
+# column arrays, with the same time-range, projection and decimation options
+def iter_csv_chunks(path, chunk_lines=65536, start=None, end=None, columns=None, step=1):
+    names = TELEMETRY_RECORD_DTYPE.names
+    if columns is None:
+        columns = names
+    # Read in binary mode: the index stores byte offsets, which are only
+    # valid seek positions for a binary file
+    with open(path, "rb") as csv_file:
+        if start is not None:
+            csv_file.seek(seek_csv_offset(path, start))
+        seen = 0
+        while True:
+            lines = [line.decode("utf-8") for _, line in zip(range(chunk_lines), csv_file)]
+            if not lines:
+                return
+            rows = np.loadtxt(lines, delimiter=",", ndmin=2)
+            timestamps = rows[:, 0]
+            keep = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                keep &= timestamps >= start
+            if end is not None:
+                keep &= timestamps < end
+            rows = rows[keep]
+            if len(rows):
+                selected = (seen + np.arange(len(rows))) % step == 0
+                seen += len(rows)
+                rows = rows[selected]
+                yield {name: rows[:, names.index(name)] for name in columns}
+            if end is not None and timestamps[-1] >= end:
+                return
+
+# Function to get the sidecar index path of a CSV log
+def csv_index_path(path):
+    return path + ".idx.npz"
+
+# Function to build (or extend) the sparse timestamp-to-byte-offset index of a CSV log.
+# Like the archive index it is cached next to the log and only the lines
+# appended since the last build are scanned; a trailing partial line is left
+# for the next build, so a log that is still being written is indexed safely.
+def build_csv_index(path, stride_lines=4096):
+    index_path = csv_index_path(path)
+    stat = os.stat(path)
+    timestamps = np.zeros(0, dtype=np.float64)
+    offsets = np.zeros(0, dtype=np.int64)
+    indexed_bytes = 0
+    line_number = 0
+    cached = _load_index(index_path, path, stride_lines, stat)
+    if cached is not None:
+        timestamps = cached["timestamps"]
+        offsets = cached["offsets"]
+        indexed_bytes = int(cached["indexed_bytes"])
+        line_number = int(cached["lines"])
+
+    new_offsets = []
+    new_timestamps = []
+    scanned = 0
+    with open(path, "rb") as csv_file:
+        csv_file.seek(indexed_bytes)
+        while True:
+            line = csv_file.readline()
+            if not line.endswith(b"\n"):
+                break
+            if line_number % stride_lines == 0:
+                new_offsets.append(indexed_bytes + scanned)
+                new_timestamps.append(float(line.split(b",", 1)[0]))
+            line_number += 1
+            scanned += len(line)
+
+    if scanned or cached is None:
+        timestamps = np.concatenate([timestamps, np.array(new_timestamps, dtype=np.float64)])
+        offsets = np.concatenate([offsets, np.array(new_offsets, dtype=np.int64)])
+        _save_index(index_path, path, stride_lines, stat, indexed_bytes + scanned,
+                    lines=line_number, timestamps=timestamps, offsets=offsets)
+    return timestamps, offsets
+
+# Cached CSV indexes keyed by path, refreshed when the file size or mtime changes
+_csv_indexes = {}
+
+# Function to get the byte offset of the indexed line at or before `timestamp`
+def seek_csv_offset(path, timestamp, stride_lines=4096):
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns, stride_lines)
+    cached = _csv_indexes.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key,) + build_csv_index(path, stride_lines)
+        _csv_indexes[path] = cached
+    timestamps, offsets = cached[1], cached[2]
+    block = max(0, int(np.searchsorted(timestamps, timestamp, side="left")) - 1)
+    return int(offsets[block]) if len(offsets) else 0
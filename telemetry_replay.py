@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+import configparser
+import numpy as np
+from telemetry_archive import iter_archive_chunks, iter_csv_chunks, convert_csv_to_archive
+from fault_rules import FaultRuleEngine
+from anomaly_detection import StreamingAnomalyDetector
+from ring_buffer import TimeSeriesRingBuffer
+
+# Longest single sleep of a paced replay, so stop requests are noticed promptly
+MAX_REPLAY_SLEEP = 0.05
+
+# Class holding the replay time. Components that accept a clock function
+# (e.g. ControlLoopScheduler(clock=...)) can use time/monotonic so they follow
+# the recorded timeline instead of the wall clock.
+class VirtualClock:
+    def __init__(self, start=0.0):
+        self._now = start
+
+    def time(self):
+        return self._now
+
+    monotonic = time
+
+    def advance_to(self, timestamp):
+        if timestamp > self._now:
+            self._now = timestamp
+
+# Generator yielding a recorded telemetry file as chunks of column arrays.
+# "telemetry_data.csv"-style logs (timestamp,voltage,current,temperature) and
+# binary telemetry archives are both accepted.
+def iter_recorded_chunks(path, chunk_records=65536, start=None, end=None):
+    if path.endswith(".csv"):
+        return iter_csv_chunks(path, chunk_records, start, end)
+    return iter_archive_chunks(path, chunk_records, start, end)
+
+# Function to get a binary archive for a CSV log, converting it once and reusing it
+# while it is newer than the log (parsing CSV caps replay at ~1.5M samples/s)
+def cached_archive_path(csv_path):
+    archive_path = os.path.splitext(csv_path)[0] + ".bin"
+    if not os.path.exists(archive_path) or os.path.getmtime(archive_path) < os.path.getmtime(csv_path):
+        convert_csv_to_archive(csv_path, archive_path)
+    return archive_path
+
+# Function to stack the named columns of a block into a (samples, channels)
+# matrix; channels the recording does not have are NaN ("no data")
+def channel_matrix(columns, channels, count):
+    return np.column_stack([np.asarray(columns[name], dtype=np.float64) if name in columns else np.full(count, np.nan) for name in channels])
+
+# Function to get the bytes hashed for a float array, with every NaN in one
+# canonical form so missing data digests the same however it was produced
+def digest_bytes(values):
+    return np.where(np.isnan(values), np.nan, values).tobytes()
+
+# Class summing values in fixed blocks of the overall sample sequence, so the
+# total is bit-identical however the samples were split into chunks.
+# NaN values (no data) are skipped and not counted in `valid`.
+class BlockSum:
+    def __init__(self, block=4096):
+        self.block = block
+        self.total = 0.0
+        self.valid = 0
+        self._pending = []
+        self._count = 0
+
+    def _add_blocks(self, values, rows):
+        for partial in np.nansum(values.reshape(rows, -1), axis=1).tolist():
+            self.total += partial
+
+    def add(self, values):
+        self._pending.append(values)
+        self._count += len(values)
+        self.valid += int(np.count_nonzero(~np.isnan(values)))
+        if self._count >= self.block:
+            values = np.concatenate(self._pending)
+            full = len(values) - len(values) % self.block
+            self._add_blocks(values[:full], full // self.block)
+            self._pending = [values[full:]]
+            self._count = len(values) - full
+
+    # Add the trailing partial block and return the total
+    def finish(self):
+        if self._count:
+            self._add_blocks(np.concatenate(self._pending), 1)
+        self._pending = []
+        self._count = 0
+        return self.total
+
+# Class replaying recorded telemetry through the detection and analysis paths.
+# Samples are processed in chunks: every sample is checked against the fault
+# rules (one vectorized evaluation per chunk), its power and efficiency are
+# computed and appended to `history`, and the newest sample of the chunk is
+# published to `publisher` so get_telemetry_data() consumers see the replayed
+# stream. `speed` is the replay rate relative to the recording (1.0 = real
+# time, 10.0 = ten times faster) or None to run as fast as possible; in paced
+# mode each chunk holds the samples whose recorded time has come due.
+# All time comes from the recording through `clock`, nothing is random, and
+# the optional sequential stages (`anomaly_detector`, `statistics`) see one
+# sample at a time in recorded order, so the result and its digest are the
+# same on every run and at every speed.
+class TelemetryReplay:
+    def __init__(self, path, speed=None, fault_rules=None, publisher=None, history=None, on_faults=None,
+                 anomaly_detector=None, on_anomalies=None, statistics=None, chunk_records=65536, start=None, end=None):
+        self.path = path
+        self.speed = speed
+        self.fault_rules = fault_rules
+        self.publisher = publisher
+        self.history = history
+        self.on_faults = on_faults
+        self.anomaly_detector = anomaly_detector
+        self.on_anomalies = on_anomalies
+        self.statistics = statistics
+        self.chunk_records = chunk_records
+        self.start = start
+        self.end = end
+        self.clock = VirtualClock()
+        self._reset()
+
+    def _reset(self):
+        # One hash stream per output, so chunk boundaries do not change the digest
+        self._digests = {name: hashlib.blake2b(digest_size=16) for name in ("faults", "power", "anomalies")}
+        self._result = {
+            "samples": 0,
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "fault_samples": 0,
+            "fault_counts": {name: 0 for name in self.fault_rules.channels} if self.fault_rules is not None else {},
+            "anomaly_counts": {},
+            "power_mean": 0.0,
+            "power_min": None,
+            "power_max": None,
+            "energy_wh": 0.0
+        }
+        self._power_sum = BlockSum()
+        self._energy_sum = BlockSum()
+        self._last_sample = None
+
+    # Process one block of samples (column arrays of equal length)
+    def process(self, columns):
+        timestamps = np.asarray(columns["timestamp"], dtype=np.float64)
+        count = len(timestamps)
+        if count == 0:
+            return
+        voltage, current = channel_matrix(columns, ("voltage", "current"), count).T
+        result = self._result
+
+        # Fault rules over the whole block; only faulty rows reach the callback
+        if self.fault_rules is not None:
+            values = channel_matrix(columns, self.fault_rules.channels, count)
+            masks = self.fault_rules.evaluate(values)
+            self._digests["faults"].update(masks.tobytes())
+            faulty = np.flatnonzero(masks)
+            if len(faulty):
+                result["fault_samples"] += len(faulty)
+                for name, bit in self.fault_rules.channel_bits.items():
+                    result["fault_counts"][name] += int(np.count_nonzero(masks[faulty] & np.uint64(bit)))
+                if self.on_faults is not None:
+                    self.on_faults(timestamps[faulty], values[faulty], masks[faulty])
+
+        # Power analysis, as in power_analysis.run_power_analysis_cycle
+        power = voltage * current
+        with np.errstate(invalid="ignore", divide="ignore"):
+            efficiency = np.where(current != 0, power / (voltage * current) * 100, 0.0)
+        self._digests["power"].update(digest_bytes(power))
+        if self.history is not None:
+            self.history.extend(timestamps, voltage, current, power, efficiency)
+
+        # Energy (J) between consecutive samples by the trapezoid rule, continuing from the previous block
+        previous = self._last_sample
+        if previous is not None:
+            energy_timestamps = np.concatenate(([previous[0]], timestamps))
+            energy_power = np.concatenate(([previous[1]], power))
+        else:
+            energy_timestamps, energy_power = timestamps, power
+        self._energy_sum.add(np.diff(energy_timestamps) * (energy_power[1:] + energy_power[:-1]) / 2)
+        self._last_sample = (timestamps[-1], power[-1])
+
+        self._power_sum.add(power)
+        measured = power[~np.isnan(power)]
+        if len(measured):
+            result["power_min"] = float(measured.min()) if result["power_min"] is None else min(result["power_min"], float(measured.min()))
+            result["power_max"] = float(measured.max()) if result["power_max"] is None else max(result["power_max"], float(measured.max()))
+        if result["first_timestamp"] is None:
+            result["first_timestamp"] = float(timestamps[0])
+        result["last_timestamp"] = float(timestamps[-1])
+        result["samples"] += count
+
+        # Sequential stages see every sample in order
+        if self.anomaly_detector is not None or self.statistics is not None:
+            self._process_sequential(columns, timestamps, voltage, current, power, efficiency)
+
+        # Publish the newest sample for get_telemetry_data() consumers
+        self.clock.advance_to(float(timestamps[-1]))
+        if self.publisher is not None:
+            self.publisher.publish({name: float(columns[name][-1]) for name in columns if name != "timestamp"}, float(timestamps[-1]))
+
+    def _process_sequential(self, columns, timestamps, voltage, current, power, efficiency):
+        detector = self.anomaly_detector
+        if detector is not None:
+            channel_values = channel_matrix(columns, detector.channels, len(timestamps))
+            counts = self._result["anomaly_counts"]
+        for row, timestamp in enumerate(timestamps.tolist()):
+            if detector is not None:
+                anomalies = detector.update(channel_values[row], timestamp)
+                flagged = [kind for kind, flags in anomalies.items() if flags.any()]
+                if flagged:
+                    for kind in flagged:
+                        counts[kind] = counts.get(kind, 0) + int(np.count_nonzero(anomalies[kind]))
+                        self._digests["anomalies"].update(np.float64(timestamp).tobytes() + kind.encode() + anomalies[kind].tobytes())
+                    if self.on_anomalies is not None:
+                        self.on_anomalies(timestamp, channel_values[row:row + 1], anomalies)
+            if self.statistics is not None:
+                self.statistics.update((voltage[row], current[row], power[row], efficiency[row]), timestamp)
+
+    # Replay the recording (or until stop_event is set) and return the result
+    def run(self, stop_event=None):
+        self._reset()
+        started = time.perf_counter()
+        wall_start = virtual_start = None
+        for chunk in iter_recorded_chunks(self.path, self.chunk_records, self.start, self.end):
+            if self.speed is None:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                self.process(chunk)
+                continue
+
+            timestamps = chunk["timestamp"]
+            if wall_start is None and len(timestamps):
+                wall_start, virtual_start = time.monotonic(), float(timestamps[0])
+            position = 0
+            while position < len(timestamps):
+                if stop_event is not None and stop_event.is_set():
+                    break
+                virtual_now = virtual_start + (time.monotonic() - wall_start) * self.speed
+                due = int(np.searchsorted(timestamps, virtual_now, side="right"))
+                if due <= position:
+                    delay = min(MAX_REPLAY_SLEEP, (timestamps[position] - virtual_now) / self.speed)
+                    if stop_event is not None:
+                        stop_event.wait(delay)
+                    else:
+                        time.sleep(delay)
+                    continue
+                self.process({name: values[position:due] for name, values in chunk.items()})
+                position = due
+            if stop_event is not None and stop_event.is_set():
+                break
+
+        elapsed = time.perf_counter() - started
+        result = dict(self._result, fault_counts=dict(self._result["fault_counts"]), anomaly_counts=dict(self._result["anomaly_counts"]))
+        power_total = self._power_sum.finish()
+        result["power_mean"] = power_total / self._power_sum.valid if self._power_sum.valid else 0.0
+        result["energy_wh"] = self._energy_sum.finish() / 3600
+        result["digest"] = hashlib.blake2b(b"".join(digest.digest() for digest in self._digests.values()), digest_size=16).hexdigest()
+        result["elapsed"] = elapsed
+        result["samples_per_second"] = result["samples"] / elapsed if elapsed > 0 else 0.0
+        return result
+
+    # Run the replay on a background thread
+    def start_thread(self, stop_event=None):
+        thread = threading.Thread(target=self.run, args=(stop_event,), name="TelemetryReplay", daemon=True)
+        thread.start()
+        return thread
+
+# Function to create a replay wired to the running modules: samples are published
+# to data_transmitter, faults are reported through fault_detection (logs and
+# email alerts when `report` is set) and the history feeds power_analysis plots
+def create_replay(path, speed=None, report=False, anomalies=False, **options):
+    # Imported here: these modules configure logging and alerting on import
+    import data_transmitter
+    import fault_detection
+    import power_analysis
+
+    def report_replayed_faults(timestamps, values, masks):
+        for row, mask in zip(values.tolist(), masks.tolist()):
+            fault_detection.report_faults(dict(zip(fault_detection.fault_rules.channels, row)), mask)
+
+    # A fresh detector so the replay does not inherit live history
+    detector = StreamingAnomalyDetector.from_config(fault_detection.config, fault_detection.fault_rules.channels) if anomalies else None
+
+    def report_replayed_anomalies(timestamp, values, flags):
+        fault_detection.report_anomalies(values, flags, detector)
+
+    return TelemetryReplay(
+        path,
+        speed=speed,
+        fault_rules=fault_detection.fault_rules,
+        publisher=data_transmitter.telemetry_publisher,
+        history=power_analysis.power_analysis_data,
+        on_faults=report_replayed_faults if report else None,
+        anomaly_detector=detector,
+        on_anomalies=report_replayed_anomalies if anomalies and report else None,
+        **options
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded telemetry through fault detection and power analysis.")
+    parser.add_argument("path", nargs="?", default="telemetry_data.csv", help="telemetry_data.csv-style log or binary telemetry archive")
+    parser.add_argument("--speed", type=float, help="replay rate relative to the recording (default: as fast as possible)")
+    parser.add_argument("--start", type=float, help="first recorded timestamp to replay")
+    parser.add_argument("--end", type=float, help="replay recorded timestamps before this one")
+    parser.add_argument("--anomalies", action="store_true", help="also run the (sequential) anomaly detector")
+    parser.add_argument("--cache", action="store_true", help="convert a CSV log to a binary archive once and replay that")
+    args = parser.parse_args()
+
+    # Standalone replays use fresh detectors built from config.ini
+    config = configparser.ConfigParser()
+    config.read("config.ini")
+    rules = FaultRuleEngine.from_config(config)
+    detector = StreamingAnomalyDetector.from_config(config, rules.channels) if args.anomalies else None
+
+    path = cached_archive_path(args.path) if args.cache and args.path.endswith(".csv") else args.path
+    replay = TelemetryReplay(path, speed=args.speed, fault_rules=rules, history=TimeSeriesRingBuffer(config.getint("power_analysis", "history_capacity", fallback=36000)),
+                             anomaly_detector=detector, start=args.start, end=args.end)
+    try:
+        print(json.dumps(replay.run(), indent=2))
+    except KeyboardInterrupt:
+        print("Replay stopped by the user.")
@@ -0,0 +1,187 @@
+# Batched telemetry upload without module-level side effects (no logging
+# setup, config or simulated drone), so benchmarks and tools can import it
+# without pulling in data_transmitter.
+
+import time
+import json
+import gzip
+import logging
+import threading
+import collections
+import requests
+from command_channel import RETRYABLE_STATUS
+
+# Function to create a persistent HTTP session with a keep-alive connection pool
+def create_http_session(pool_size=4):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Class to buffer telemetry samples and upload them in compressed batches.
+# Samples are flushed as one gzip-compressed JSON document once `batch_size`
+# samples are pending or the oldest pending sample is `max_age` seconds old.
+# All uploads go through one keep-alive session, and producers block (or are
+# refused) once `max_pending` samples are waiting, so a slow link applies
+# backpressure instead of growing memory without bound. A batch that fails
+# with 429, a 5xx or a connection error is retried up to `max_retries` times
+# with exponential backoff before its samples are counted as dropped.
+class BatchTelemetryTransmitter:
+    def __init__(self, endpoint, batch_size=100, max_age=1.0, max_pending=10000, timeout=5.0, compress=True, session=None,
+                 max_retries=3, backoff_base=0.1, backoff_max=2.0):
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.compress = compress
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = session if session is not None else create_http_session(pool_size=1)
+
+        self._pending = collections.deque()
+        self._arrivals = collections.deque()
+        self._condition = threading.Condition()
+        self._stop = False
+        self._worker = None
+        self._metrics = {
+            "batches_sent": 0,
+            "batches_failed": 0,
+            "samples_sent": 0,
+            "samples_dropped": 0,
+            "retries": 0,
+            "last_batch_size": 0,
+            "last_payload_bytes": 0,
+            "last_flush_latency": 0.0,
+            "max_flush_latency": 0.0,
+            "total_flush_latency": 0.0
+        }
+
+    # Start the background flush thread
+    def start(self):
+        with self._condition:
+            if self._worker is not None:
+                return
+            self._stop = False
+            self._worker = threading.Thread(target=self._run, name="BatchTelemetryTransmitter", daemon=True)
+            self._worker.start()
+
+    # Flush whatever is pending and stop the background flush thread
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    # Queue one sample for transmission. Blocks while the buffer is full
+    # unless `block` is False; returns False if the sample was not accepted
+    # (including once stop() has been called).
+    def submit(self, sample, block=True, timeout=None):
+        if "timestamp" not in sample:
+            sample = dict(sample, timestamp=time.time())
+        with self._condition:
+            if self._stop:
+                self._metrics["samples_dropped"] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                if not block or not self._condition.wait_for(lambda: len(self._pending) < self.max_pending or self._stop, timeout):
+                    self._metrics["samples_dropped"] += 1
+                    return False
+                if self._stop:
+                    self._metrics["samples_dropped"] += 1
+                    return False
+            self._pending.append(sample)
+            self._arrivals.append(time.monotonic())
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+            return True
+
+    # Get a snapshot of batch size and flush latency metrics
+    def get_metrics(self):
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["pending"] = len(self._pending)
+        batches = metrics["batches_sent"] + metrics["batches_failed"]
+        metrics["mean_batch_size"] = metrics["samples_sent"] / metrics["batches_sent"] if metrics["batches_sent"] else 0.0
+        metrics["mean_flush_latency"] = metrics["total_flush_latency"] / batches if batches else 0.0
+        return metrics
+
+    # Encode a batch of samples as the request body and headers
+    def encode_batch(self, batch):
+        body = json.dumps({"samples": batch}, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.compress:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+
+    # Take up to one batch of pending samples (caller holds the condition)
+    def _take_batch(self):
+        count = min(self.batch_size, len(self._pending))
+        batch = [self._pending.popleft() for _ in range(count)]
+        for _ in range(count):
+            self._arrivals.popleft()
+        self._condition.notify_all()
+        return batch
+
+    # Upload one batch, retrying transient failures with bounded backoff, and record its metrics
+    def _send_batch(self, batch):
+        body, headers = self.encode_batch(batch)
+        started = time.monotonic()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self._condition:
+                    self._metrics["retries"] += 1
+                time.sleep(min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+            try:
+                response = self.session.post(self.endpoint, data=body, headers=headers, timeout=self.timeout)
+                status = response.status_code
+            except requests.exceptions.RequestException as e:
+                status = None
+                error = str(e)
+            else:
+                error = f"HTTP {status}"
+            sent = status == 200
+            if sent or (status is not None and status not in RETRYABLE_STATUS):
+                break
+        if not sent:
+            logging.error(f"Failed to transmit telemetry batch of {len(batch)} samples: {error}")
+        latency = time.monotonic() - started
+
+        with self._condition:
+            metrics = self._metrics
+            if sent:
+                metrics["batches_sent"] += 1
+                metrics["samples_sent"] += len(batch)
+            else:
+                metrics["batches_failed"] += 1
+                metrics["samples_dropped"] += len(batch)
+            metrics["last_batch_size"] = len(batch)
+            metrics["last_payload_bytes"] = len(body)
+            metrics["last_flush_latency"] = latency
+            metrics["max_flush_latency"] = max(metrics["max_flush_latency"], latency)
+            metrics["total_flush_latency"] += latency
+        return sent
+
+    # Background loop: wait until a batch is full or old enough, then send it
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._stop or len(self._pending) >= self.batch_size:
+                        break
+                    if self._pending:
+                        remaining = self._arrivals[0] + self.max_age - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._stop and not self._pending:
+                    return
+                batch = self._take_batch()
+            self._send_batch(batch)
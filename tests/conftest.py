@@ -0,0 +1,12 @@
+import os
+import sys
+import shutil
+import tempfile
+
+# Tests import the top-level modules directly. They run in a scratch directory
+# holding a copy of config.ini, so log and archive files never land in the repository.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+WORKSPACE = tempfile.mkdtemp(prefix="remote_power_guard_tests_")
+shutil.copy(os.path.join(ROOT, "config.ini"), WORKSPACE)
+os.chdir(WORKSPACE)
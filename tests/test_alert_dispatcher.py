@@ -0,0 +1,141 @@
+import time
+import email
+import threading
+import socketserver
+from alert_dispatcher import AlertDispatcher
+
+# Minimal SMTP server that records every message it accepts
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.reply("220 stand-in ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii").strip().upper()
+            if command.startswith("DATA"):
+                self.reply("354 end data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data[1:] if data.startswith(b"..") else data)
+                time.sleep(self.server.delay)
+                if self.server.failures > 0:
+                    self.server.failures -= 1
+                    self.reply("451 temporary failure")
+                    continue
+                self.server.messages.append(email.message_from_bytes(b"".join(lines)))
+                self.reply("250 queued")
+            elif command.startswith("QUIT"):
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), SMTPStandInHandler)
+        self.delay = delay
+        self.failures = 0
+        self.messages = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+def make_dispatcher(server, **options):
+    return AlertDispatcher("drone@example.com", "ops@example.com", "127.0.0.1", server.server_address[1],
+                           use_ssl=False, **options)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+def test_alerts_are_throttled_and_digested_per_channel():
+    server = SMTPStandIn()
+    dispatcher = make_dispatcher(server, rate_limit_interval=0.5)
+    try:
+        dispatcher.submit("voltage", "Potential voltage fault detected: 9.5 V")
+        wait_for(lambda: len(server.messages) == 1)
+        for value in (9.4, 9.3, 9.2):
+            dispatcher.submit("voltage", f"Potential voltage fault detected: {value} V")
+        dispatcher.submit("current", "Potential current fault detected: 3.1 A")
+
+        # The other channel is not throttled; the voltage digest waits for the interval
+        wait_for(lambda: len(server.messages) == 2)
+        assert server.messages[1]["Subject"] == "Drone Fault Detected"
+        time.sleep(0.2)
+        assert len(server.messages) == 2
+        wait_for(lambda: len(server.messages) == 3)
+        digest = server.messages[2]
+        assert digest["Subject"] == "Drone Fault Digest: voltage (3 alerts)"
+        assert digest.get_payload().count("Potential voltage fault") == 3
+
+        # The stand-in records a message before the dispatcher sees the reply
+        wait_for(lambda: dispatcher.get_stats()["emails_sent"] == 3)
+        stats = dispatcher.get_stats()
+        assert stats["alerts_coalesced"] == 2
+        assert stats["connections_opened"] == 1
+    finally:
+        dispatcher.stop(timeout=5.0)
+        server.close()
+
+def test_stop_flushes_throttled_digests():
+    server = SMTPStandIn()
+    dispatcher = make_dispatcher(server, rate_limit_interval=60.0)
+    try:
+        dispatcher.submit("temperature", "first")
+        wait_for(lambda: len(server.messages) == 1)
+        dispatcher.submit("temperature", "second")
+        dispatcher.submit("temperature", "third")
+        dispatcher.stop(timeout=5.0)
+        assert len(server.messages) == 2
+        assert server.messages[1]["Subject"] == "Drone Fault Digest: temperature (2 alerts)"
+    finally:
+        server.close()
+
+def test_stop_does_not_block_on_a_full_queue():
+    server = SMTPStandIn(delay=0.3)
+    dispatcher = make_dispatcher(server, rate_limit_interval=0.0, queue_size=2)
+    try:
+        dispatcher.submit("voltage", "sent while the queue fills")
+        wait_for(lambda: dispatcher.get_stats()["queued"] == 0)
+        assert dispatcher.submit("current", "queued 1")
+        assert dispatcher.submit("power", "queued 2")
+        started = time.monotonic()
+        dispatcher.stop(timeout=5.0)
+        assert time.monotonic() - started < 5.0
+        assert sorted(message.get_payload().strip() for message in server.messages) == ["queued 1", "queued 2", "sent while the queue fills"]
+    finally:
+        server.close()
+
+def test_failed_digest_is_kept_and_retried():
+    server = SMTPStandIn()
+    server.failures = 2
+    dispatcher = make_dispatcher(server, rate_limit_interval=60.0, retry_interval=0.2)
+    try:
+        # Both attempts of the first send fail; the alert must not be lost
+        dispatcher.submit("voltage", "Potential voltage fault detected: 9.5 V")
+        wait_for(lambda: dispatcher.get_stats()["send_failures"] == 1)
+        assert dispatcher.get_stats()["pending_channels"] == 1
+        dispatcher.submit("voltage", "Potential voltage fault detected: 9.4 V")
+
+        wait_for(lambda: len(server.messages) == 1)
+        digest = server.messages[0]
+        assert digest["Subject"] == "Drone Fault Digest: voltage (2 alerts)"
+        assert "9.5 V" in digest.get_payload() and "9.4 V" in digest.get_payload()
+        wait_for(lambda: dispatcher.get_stats()["pending_channels"] == 0)
+    finally:
+        dispatcher.stop(timeout=5.0)
+        server.close()
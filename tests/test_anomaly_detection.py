@@ -0,0 +1,74 @@
+import numpy as np
+from anomaly_detection import StreamingAnomalyDetector
+
+def make_detector(n_drones=1, **options):
+    settings = dict(window=20, z_threshold=4.0, cusum_k=0.5, cusum_h=5.0, min_samples=10)
+    settings.update(options)
+    return StreamingAnomalyDetector(("voltage", "current"), n_drones=n_drones, **settings)
+
+def feed(detector, values, start=0.0, interval=1.0):
+    results = []
+    for index, row in enumerate(values):
+        results.append(detector.update(row, start + index * interval))
+    return results
+
+def test_zscore_flags_a_spike_after_warmup():
+    detector = make_detector()
+    rng = np.random.default_rng(0)
+    feed(detector, np.column_stack([12.0 + 0.01 * rng.standard_normal(30), 2.0 + 0.01 * rng.standard_normal(30)]))
+    anomalies = detector.update([12.0, 2.5], 30.0)
+    assert anomalies["zscore"].tolist() == [[False, True]]
+
+def test_no_zscore_before_min_samples():
+    detector = make_detector()
+    results = feed(detector, [[12.0 + 0.01 * (index % 2), 2.0] for index in range(5)] + [[20.0, 2.0]])
+    assert not results[-1]["zscore"].any()
+
+def test_cusum_catches_slow_drift_below_the_zscore_threshold():
+    detector = make_detector(window=200, z_threshold=10.0)
+    noise = 0.01 * np.where(np.arange(400) % 2, 1.0, -1.0)
+    baseline = feed(detector, np.column_stack([12.0 + noise[:200], np.full(200, 2.0)]))
+    assert not any(result["cusum"].any() for result in baseline)
+    drift = feed(detector, np.column_stack([12.02 + noise[200:], np.full(200, 2.0)]), start=200.0)
+    assert any(result["cusum"][0, 0] for result in drift[:5])
+    assert not any(result["zscore"].any() for result in drift)
+
+def test_rate_uses_the_time_between_samples():
+    detector = make_detector(max_rates={"voltage": 1.0})
+    detector.update([12.0, 2.0], 0.0)
+    # 1.5 V over 2 s is 0.75 V/s: within the limit
+    assert not detector.update([13.5, 2.0], 2.0)["rate"].any()
+    # 1.5 V over 0.5 s is 3 V/s
+    assert detector.update([12.0, 2.0], 2.5)["rate"][0, 0]
+
+def test_duplicate_and_stale_samples_are_skipped():
+    detector = make_detector(max_rates={"voltage": 1.0})
+    feed(detector, [[12.0, 2.0]] * 15)
+    count = detector._window.get_stats()["count"].copy()
+    # Same sample re-read (same timestamp) and an older sample arriving late
+    assert not any(flags.any() for flags in detector.update([12.0, 2.0], 14.0).values())
+    assert not any(flags.any() for flags in detector.update([30.0, 9.0], 3.0).values())
+    np.testing.assert_array_equal(detector._window.get_stats()["count"], count)
+    # The next real sample is compared with the last accepted one (12 V at t=14)
+    assert not detector.update([12.5, 2.0], 15.0)["rate"].any()
+
+def test_each_drone_keeps_its_own_timestamps():
+    detector = make_detector(n_drones=2, max_rates={"voltage": 1.0})
+    detector.update([[12.0, 2.0], [12.0, 2.0]], [0.0, 0.0])
+    # Drone 1 has no new sample; drone 0 jumps 2 V in 1 s
+    anomalies = detector.update([[14.0, 2.0], [20.0, 2.0]], [1.0, 0.0])
+    assert detector.describe(anomalies) == [(0, "voltage", "rate")]
+    # Drone 1 now reports 2 V up after 4 s: 0.5 V/s
+    anomalies = detector.update([[14.0, 2.0], [14.0, 2.0]], [1.0, 4.0])
+    assert not anomalies["rate"].any()
+
+def test_align_keeps_state_with_the_drone_id():
+    detector = make_detector(n_drones=0, max_rates={"voltage": 1.0})
+    detector.align(["a", "b"])
+    detector.update([[12.0, 2.0], [10.0, 1.5]], [0.0, 0.0])
+    detector.align(["c", "b", "a"])
+    assert detector.n_drones == 3
+    # Every drone moves 0.5 V in 1 s from its own previous value
+    anomalies = detector.update([[30.0, 2.0], [10.5, 1.5], [12.5, 2.0]], [1.0, 1.0, 1.0])
+    assert not anomalies["rate"].any()
+    np.testing.assert_array_equal(detector._window.get_stats()["count"].reshape(3, 2), [[1, 1], [2, 2], [2, 2]])
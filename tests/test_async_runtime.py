@@ -0,0 +1,39 @@
+import time
+import threading
+from async_runtime import AsyncRuntime
+
+def test_stop_before_run_is_not_lost():
+    runtime = AsyncRuntime(max_workers=1)
+    task = runtime.add_task("tick", lambda: None, 0.01)
+    runtime.stop()
+    thread = threading.Thread(target=runtime.run)
+    thread.start()
+    thread.join(timeout=5.0)
+    assert not thread.is_alive()
+    assert task.runs == 0
+
+    # The request only applies to that run; the runtime can be started again
+    thread = threading.Thread(target=runtime.run)
+    thread.start()
+    deadline = time.monotonic() + 5.0
+    while task.runs < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    runtime.stop()
+    thread.join(timeout=5.0)
+    assert not thread.is_alive()
+    assert task.runs >= 3
+
+def test_failing_task_keeps_running_on_its_grid():
+    runtime = AsyncRuntime(max_workers=1)
+    calls = []
+
+    def failing():
+        calls.append(time.monotonic())
+        if len(calls) == 3:
+            runtime.stop()
+        raise RuntimeError("sensor offline")
+
+    task = runtime.add_task("failing", failing, 0.01)
+    runtime.run()
+    assert task.runs == 3
+    assert task.errors == 3
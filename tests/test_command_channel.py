@@ -0,0 +1,72 @@
+import time
+from command_channel import PowerCommandChannel
+from stand_in_server import StandInServer
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+def test_pending_setpoints_are_coalesced():
+    with StandInServer(port=0, latency=0.2) as server:
+        channel = PowerCommandChannel(server.command_url, workers=1)
+        channel.submit("drone-a", 11.0, 2.0)
+        wait_for(lambda: server.get_stats()["requests"] == 1)
+        for voltage in (11.5, 12.0, 12.5):
+            channel.submit("drone-a", voltage, 2.0)
+        assert channel.wait_idle(timeout=5.0)
+        channel.stop()
+        metrics = channel.get_metrics()
+        stats = server.get_stats()
+
+    assert server.setpoints["drone-a"] == (12.5, 2.0)
+    assert metrics["submitted"] == 4
+    assert metrics["coalesced"] == 2
+    assert metrics["sent"] == 2
+    assert stats["commands_applied"] == 2
+
+def test_retried_command_is_applied_once():
+    # The read timeout expires before the stand-in answers, so the command is
+    # retried with the same idempotency key while the first attempt is applied
+    with StandInServer(port=0, latency=0.3) as server:
+        channel = PowerCommandChannel(server.command_url, timeout=(1.0, 0.1), max_retries=1, backoff_base=0.01, workers=1)
+        channel.submit("drone-a", 12.0, 2.0)
+        assert channel.wait_idle(timeout=5.0)
+        channel.stop()
+        wait_for(lambda: sum(server.get_stats()["status"].values()) == 2)
+        stats = server.get_stats()
+
+    assert channel.get_metrics()["retries"] == 1
+    assert stats["commands_applied"] == 1
+    assert stats["duplicate_commands"] == 1
+
+def test_transient_failures_are_retried_with_bounded_attempts():
+    with StandInServer(port=0, error_rate=1.0) as server:
+        channel = PowerCommandChannel(server.command_url, max_retries=2, backoff_base=0.001, workers=1)
+        channel.submit("drone-a", 12.0, 2.0)
+        assert channel.wait_idle(timeout=5.0)
+        channel.stop()
+        metrics = channel.get_metrics()
+        stats = server.get_stats()
+
+    assert stats["requests"] == 3
+    assert metrics["retries"] == 2
+    assert metrics["failed"] == 1
+    assert metrics["sent"] == 0
+
+def test_stop_abandons_retry_during_backoff():
+    with StandInServer(port=0, error_rate=1.0) as server:
+        channel = PowerCommandChannel(server.command_url, max_retries=5, backoff_base=5.0, workers=1)
+        channel.submit("drone-a", 12.0, 2.0)
+        wait_for(lambda: server.get_stats()["requests"] == 1)
+        started = time.monotonic()
+        channel.stop(timeout=5.0)
+        elapsed = time.monotonic() - started
+        time.sleep(0.05)
+        requests_made = server.get_stats()["requests"]
+
+    assert elapsed < 1.0
+    assert requests_made == 1
+    assert channel.get_metrics()["failed"] == 1
@@ -0,0 +1,111 @@
+import threading
+import pytest
+from control_scheduler import ControlLoopScheduler
+from instrumentation import Instrumentation
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+# Stage function that records its calls and takes `duration` seconds of fake time
+def make_stage(clock, calls, name, duration=0.0):
+    def stage(context):
+        calls.append((name, clock()))
+        clock.advance(duration)
+    return stage
+
+def build(clock, calls, instruments=None):
+    scheduler = ControlLoopScheduler(tick_budget=0.1, clock=clock, instruments=instruments)
+    scheduler.add_stage("slow", make_stage(clock, calls, "slow", 0.15), 1.0, 1)
+    scheduler.add_stage("logging", make_stage(clock, calls, "logging"), 0.1, 2)
+    scheduler.add_stage("faults", make_stage(clock, calls, "faults"), 0.1, 3, critical=True)
+    return scheduler
+
+def test_overrun_defers_non_critical_stages_but_runs_critical_ones():
+    clock = FakeClock()
+    calls = []
+    instruments = Instrumentation()
+    scheduler = build(clock, calls, instruments)
+
+    scheduler.tick({})
+    assert [name for name, _ in calls] == ["slow", "faults"]
+    stats = scheduler.get_stats()
+    assert stats["tick_overruns"] == 1
+    assert stats["stages"]["logging"]["deferred"] == 1
+    assert stats["stages"]["faults"]["runs"] == 1
+    assert stats["stages"]["slow"]["last_duration"] == 0.15
+    histograms = instruments.to_dict()
+    assert histograms["control_loop.tick"]["overruns"] == 1
+    assert histograms["control_loop.slow"]["count"] == 1
+
+def test_deferred_stage_catches_up_without_bursting():
+    clock = FakeClock()
+    calls = []
+    scheduler = build(clock, calls)
+
+    scheduler.tick({})
+    calls.clear()
+    next_deadline = scheduler.tick({})
+    # The slow stage is not due again until t=1.0; the deferred stage runs once
+    # and skips the period it missed instead of running twice
+    assert [name for name, _ in calls] == ["logging", "faults"]
+    logging_stats = scheduler.get_stats()["stages"]["logging"]
+    assert logging_stats["runs"] == 1
+    assert logging_stats["skipped"] == 1
+    assert next_deadline == 0.2
+    assert scheduler.get_stats()["tick_overruns"] == 1
+
+def test_critical_stage_runs_every_tick_while_others_overrun():
+    clock = FakeClock()
+    calls = []
+    scheduler = ControlLoopScheduler(tick_budget=0.1, clock=clock)
+    scheduler.add_stage("hog", make_stage(clock, calls, "hog", 0.2), 0.1, 0)
+    scheduler.add_stage("display", make_stage(clock, calls, "display"), 0.1, 1)
+    scheduler.add_stage("faults", make_stage(clock, calls, "faults"), 0.1, 2, critical=True)
+
+    for _ in range(5):
+        scheduler.tick({})
+    stats = scheduler.get_stats()["stages"]
+    assert stats["faults"]["runs"] == 5
+    assert stats["display"]["runs"] == 0
+    assert stats["display"]["deferred"] == 5
+    assert scheduler.get_stats()["tick_overruns"] == 5
+
+def test_failing_stage_is_counted_and_does_not_stop_the_tick():
+    clock = FakeClock()
+    calls = []
+    instruments = Instrumentation()
+    scheduler = ControlLoopScheduler(tick_budget=0.1, clock=clock, instruments=instruments)
+
+    def failing(context):
+        raise RuntimeError("sensor offline")
+
+    scheduler.add_stage("failing", failing, 0.1, 0)
+    scheduler.add_stage("faults", make_stage(clock, calls, "faults"), 0.1, 1, critical=True)
+    scheduler.tick({})
+    assert scheduler.get_stats()["stages"]["failing"]["errors"] == 1
+    assert instruments.to_dict()["control_loop.failing"]["errors"] == 1
+    assert [name for name, _ in calls] == ["faults"]
+
+def test_run_follows_stage_deadlines_until_stopped():
+    clock = FakeClock()
+    calls = []
+    stop_event = threading.Event()
+    scheduler = ControlLoopScheduler(tick_budget=0.1, clock=clock)
+
+    def telemetry(context):
+        calls.append(clock())
+        if len(calls) == 4:
+            stop_event.set()
+        # Let fake time pass so the loop never waits on the real clock
+        clock.advance(0.1)
+
+    scheduler.add_stage("telemetry", telemetry, 0.1, 0, critical=True)
+    scheduler.run(stop_event=stop_event)
+    assert calls == pytest.approx([0.0, 0.1, 0.2, 0.3])
@@ -0,0 +1,68 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import time
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+from dashboard import FleetDashboard, FleetStripBuffer
+from fleet_registry import FleetRegistry
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+# Brute-force min/max over buckets anchored to absolute sample indices
+def expected_buckets(data, total, capacity, per_bucket):
+    first = total - min(total, capacity)
+    start = first + (-first) % per_bucket
+    starts = list(range(start, total, per_bucket))
+    low = np.array([data[index:min(index + per_bucket, total)].min(axis=0) for index in starts])
+    high = np.array([data[index:min(index + per_bucket, total)].max(axis=0) for index in starts])
+    return [float(index) for index in starts], low, high
+
+@pytest.mark.parametrize("total", [7, 100, 137, 250, 263])
+def test_decimate_matches_brute_force(total):
+    capacity, buckets = 100, 10
+    data = np.random.default_rng(total).normal(size=(total, 3, 4))
+    buffer = FleetStripBuffer(capacity, ["a", "b", "c"])
+    for index in range(total):
+        buffer.append(float(index), data[index])
+
+    times, low, high = buffer.decimate(buckets)
+    expected_times, expected_low, expected_high = expected_buckets(data, total, capacity, capacity // buckets)
+    assert times.tolist() == expected_times
+    np.testing.assert_array_equal(low, expected_low)
+    np.testing.assert_array_equal(high, expected_high)
+
+def test_decimate_without_reduction_returns_history():
+    buffer = FleetStripBuffer(8, ["a"])
+    assert buffer.decimate(16) is None
+    for index in range(11):
+        buffer.append(float(index), np.full((1, 4), index))
+    times, low, high = buffer.decimate(16)
+    assert times.tolist() == [float(index) for index in range(3, 11)]
+    assert low[:, 0, 0].tolist() == high[:, 0, 0].tolist() == list(range(3, 11))
+
+def test_frames_are_delivered_offscreen(app):
+    registry = FleetRegistry()
+    drone_ids = [f"drone-{index}" for index in range(12)]
+    registry.update_many(drone_ids, np.tile([12.0, 2.0, 30.0], (12, 1)))
+
+    dashboard = FleetDashboard(registry, history=2.0, sample_interval=0.01, frame_rate=60.0)
+    dashboard.show()
+    deadline = time.monotonic() + 1.0
+    while time.monotonic() < deadline:
+        registry.update_many(drone_ids, np.tile([12.0, 2.0, 30.0], (12, 1)) + np.random.default_rng().normal(0, 0.1, (12, 3)))
+        app.processEvents()
+        time.sleep(0.005)
+    dashboard.close()
+    stats = dashboard.get_stats()
+
+    assert stats["delivered"] >= 20
+    assert stats["delivered"] <= 70
+    assert stats["paint"]["count"] > 0
+    frame = dashboard.grid.frame
+    assert frame["drone_ids"] == drone_ids
+    assert len(frame["polygons"]) == 12 and len(frame["polygons"][0]) == 4
+    assert frame["labels"][0][2].endswith("W")
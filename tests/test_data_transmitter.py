@@ -0,0 +1,41 @@
+from telemetry_uplink import BatchTelemetryTransmitter
+from stand_in_server import StandInServer
+
+def sample(index):
+    return {"drone_id": "drone-0", "voltage": 12.0, "current": 2.0, "temperature": 30.0, "timestamp": float(index)}
+
+def test_transient_failures_are_retried():
+    with StandInServer(port=0, error_rate=0.3, seed=1) as server:
+        transmitter = BatchTelemetryTransmitter(server.telemetry_url, batch_size=20, max_age=0.01, max_retries=10, backoff_base=0.001)
+        transmitter.start()
+        for index in range(400):
+            assert transmitter.submit(sample(index))
+        transmitter.stop()
+        metrics = transmitter.get_metrics()
+        stats = server.get_stats()
+
+    assert metrics["retries"] > 0
+    assert metrics["samples_dropped"] == 0
+    assert metrics["samples_sent"] == 400
+    assert stats["samples_received"] == 400
+
+def test_batch_is_dropped_after_bounded_retries():
+    with StandInServer(port=0, error_rate=1.0) as server:
+        transmitter = BatchTelemetryTransmitter(server.telemetry_url, batch_size=5, max_retries=2, backoff_base=0.001)
+        transmitter.start()
+        for index in range(5):
+            transmitter.submit(sample(index))
+        transmitter.stop()
+        metrics = transmitter.get_metrics()
+        requests_made = server.get_stats()["requests"]
+
+    assert metrics["samples_dropped"] == 5
+    assert metrics["retries"] == 2
+    assert requests_made == 3
+
+def test_submit_is_refused_after_stop():
+    transmitter = BatchTelemetryTransmitter("http://127.0.0.1:9/telemetry")
+    transmitter.start()
+    transmitter.stop()
+    assert transmitter.submit(sample(0)) is False
+    assert transmitter.get_metrics()["pending"] == 0
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from event_bus import TelemetryEventBus, channel_range, outside_range, channel_delta, drone_set
+
+def recorder(log, label):
+    def callback(events):
+        log.append((label, list(events["drone_ids"]), events["values"][:, 0].tolist()))
+    return callback
+
+def test_subscribe_and_unsubscribe():
+    bus = TelemetryEventBus()
+    log = []
+    subscription = bus.subscribe(recorder(log, "all"), name="all")
+    assert bus.publish([[12.0, 2.0, 30.0]], timestamps=1.0) == 1
+    bus.unsubscribe(subscription)
+    assert bus.publish([[12.0, 2.0, 30.0]], timestamps=2.0) == 0
+    assert log == [("all", ["drone-0"], [12.0])]
+    assert bus.get_stats() == {}
+
+    with pytest.raises(ValueError):
+        bus.subscribe(recorder(log, "bad"), channel_range("pressure", 0.0, 1.0))
+
+def test_predicates_match_ranges_deltas_and_drone_sets():
+    bus = TelemetryEventBus()
+    log = []
+    bus.subscribe(recorder(log, "in_range"), channel_range("voltage", 11.0, 12.5))
+    bus.subscribe(recorder(log, "out_of_range"), outside_range("voltage", 11.0, 12.5))
+    bus.subscribe(recorder(log, "rise"), channel_delta("voltage", 1.0, "rise"))
+    bus.subscribe(recorder(log, "fall"), channel_delta("voltage", 1.0, "fall"))
+    bus.subscribe(recorder(log, "drone_b"), drone_set(["b"]))
+
+    bus.publish([[12.0, 2.0, 30.0], [10.0, 2.0, 30.0]], ["a", "b"], [1.0, 1.0])
+    bus.publish([[13.5, 2.0, 30.0], [np.nan, 2.0, 30.0]], ["a", "b"], [2.0, 2.0])
+    assert log[:5] == [
+        ("in_range", ["a"], [12.0]),
+        ("out_of_range", ["b"], [10.0]),
+        ("drone_b", ["b"], [10.0]),
+        ("out_of_range", ["a"], [13.5]),
+        ("rise", ["a"], [13.5])
+    ]
+    # A missing value is neither inside nor outside a range and has no delta
+    assert len(log) == 6
+    assert log[5][:2] == ("drone_b", ["b"]) and np.isnan(log[5][2][0])
+
+    del log[:]
+    bus.publish([[11.0, 2.0, 30.0]], ["a"], 3.0)
+    assert log == [("in_range", ["a"], [11.0]), ("fall", ["a"], [11.0])]
+
+def test_subscribers_sharing_a_predicate_set_are_delivered_in_subscription_order():
+    bus = TelemetryEventBus()
+    log = []
+    hot = channel_range("temperature", 60.0)
+    high_current = channel_range("current", 5.0)
+    bus.subscribe(recorder(log, "first"), hot, high_current)
+    bus.subscribe(recorder(log, "second"), high_current)
+    bus.subscribe(recorder(log, "third"), high_current, hot)
+    bus.subscribe(recorder(log, "fourth"), hot)
+
+    compiled = bus._compile()
+    assert compiled["predicate_count"] == 2
+    assert len(compiled["predicate_sets"]) == 3
+    assert compiled["subscription_sets"][0] == compiled["subscription_sets"][2]
+
+    dispatched = bus.publish([[12.0, 6.0, 70.0], [12.0, 6.0, 20.0], [12.0, 1.0, 70.0]], ["a", "b", "c"], 1.0)
+    assert [entry[0] for entry in log] == ["first", "second", "third", "fourth"]
+    assert log[0][1] == ["a"] and log[2][1] == ["a"]
+    assert log[1][1] == ["a", "b"]
+    assert log[3][1] == ["a", "c"]
+    assert dispatched == 6
+
+def test_stale_samples_and_failing_subscribers():
+    bus = TelemetryEventBus()
+    log = []
+
+    def failing(events):
+        raise RuntimeError("display closed")
+
+    bus.subscribe(failing, name="failing")
+    bus.subscribe(recorder(log, "after"), name="after")
+    assert bus.publish([[12.0, 2.0, 30.0]], ["a"], 5.0) == 2
+    # Re-publishing the same snapshot fires nothing
+    assert bus.publish([[12.0, 2.0, 30.0]], ["a"], 5.0) == 0
+    assert len(log) == 1
+    assert bus.get_stats() == {"failing": {"matches": 1, "errors": 1}, "after": {"matches": 1, "errors": 0}}
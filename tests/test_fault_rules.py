@@ -0,0 +1,28 @@
+import configparser
+import numpy as np
+from fault_rules import FaultRuleEngine
+
+def make_engine():
+    config = configparser.ConfigParser()
+    config.read_dict({"fault_detection": {
+        "min_voltage": "10.0", "max_voltage": "13.0",
+        "min_current": "1.5", "max_current": "2.5",
+        "max_temperature": "35.0", "update_interval": "5.0"
+    }})
+    return FaultRuleEngine.from_config(config)
+
+def test_limits_are_compiled_from_config():
+    engine = make_engine()
+    assert engine.channels == ("voltage", "current", "temperature")
+    assert engine.min_limits[2] == -np.inf
+
+def test_violations_set_channel_bits():
+    engine = make_engine()
+    masks = engine.evaluate([[9.0, 2.0, 30.0], [12.0, 3.0, 40.0], [12.0, 2.0, 30.0]])
+    assert [engine.describe(mask) for mask in masks] == [["voltage"], ["current", "temperature"], []]
+
+def test_missing_channels_are_not_faults():
+    engine = make_engine()
+    assert engine.evaluate_sample({"voltage": 12.0}) == 0
+    assert engine.evaluate_sample({"current": 3.0}) == engine.channel_bits["current"]
+    assert engine.evaluate(engine.to_matrix([{}, {"voltage": 9.0}])).tolist() == [0, engine.channel_bits["voltage"]]
@@ -0,0 +1,47 @@
+import threading
+import numpy as np
+from fleet_registry import FleetRegistry
+
+def test_new_drones_are_never_visible_without_data():
+    # Small capacity so registration also exercises growth
+    registry = FleetRegistry(capacity=4, shards=4)
+    stop = threading.Event()
+    bad_rows = []
+
+    def read():
+        while not stop.is_set():
+            drone_ids, values, timestamps = registry.snapshot()
+            if len(values) and (not np.all(values > 0) or not np.all(timestamps > 0)):
+                bad_rows.append((drone_ids, values, timestamps))
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    try:
+        for batch in range(200):
+            drone_ids = [f"batch-{batch}-{index}" for index in range(8)]
+            registry.update_many(drone_ids, np.full((8, 3), 12.0), 100.0 + batch)
+            registry.update(f"single-{batch}", {"voltage": 11.0, "current": 2.0, "temperature": 30.0}, 100.0 + batch)
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert not bad_rows
+    assert len(registry) == 200 * 9
+
+def test_missing_channels_are_nan():
+    registry = FleetRegistry()
+    registry.update("drone-1", {"voltage": 12.0})
+    _, values, _ = registry.snapshot(channels=("voltage", "current", "altitude"))
+    assert values[0, 0] == 12.0
+    assert np.isnan(values[0, 1]) and np.isnan(values[0, 2])
+
+def test_update_many_keeps_row_order():
+    registry = FleetRegistry(capacity=2)
+    registry.update_many(["a", "b", "c"], [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]], [1.0, 2.0, 3.0])
+    registry.update_many(["c", "a"], [[9.0, 9.0, 9.0], [0.5, 0.5, 0.5]], 4.0)
+    drone_ids, values, timestamps = registry.snapshot()
+    assert drone_ids == ["a", "b", "c"]
+    assert values[:, 0].tolist() == [0.5, 4.0, 9.0]
+    assert timestamps.tolist() == [4.0, 2.0, 4.0]
@@ -0,0 +1,87 @@
+import json
+import threading
+from instrumentation import Instrumentation, LatencyHistogram, LATENCY_BUCKET_BOUNDS, LATENCY_BUCKET_COUNT
+
+def bucket_of(elapsed_ns):
+    histogram = LatencyHistogram("test")
+    histogram.record_ns(elapsed_ns)
+    return histogram.counts.index(1)
+
+def test_bucket_boundaries_are_inclusive_powers_of_two():
+    assert bucket_of(0) == 0
+    assert bucket_of(1023) == 0
+    assert bucket_of(1024) == 0
+    assert bucket_of(1025) == 1
+    assert bucket_of(2048) == 1
+    assert bucket_of(2049) == 2
+    for index in range(LATENCY_BUCKET_COUNT - 1):
+        upper = 2 ** (10 + index)
+        assert bucket_of(upper) == index
+        assert bucket_of(upper + 1) == index + 1
+        assert LATENCY_BUCKET_BOUNDS[index] == upper / 1e9
+    assert bucket_of(10 ** 15) == LATENCY_BUCKET_COUNT - 1
+    assert LATENCY_BUCKET_BOUNDS[-1] == float("inf")
+
+def test_percentile_reports_the_bucket_bound_capped_at_the_maximum():
+    histogram = LatencyHistogram("test")
+    assert histogram.percentile(0.5) == 0.0
+    for _ in range(99):
+        histogram.record_ns(1500)
+    histogram.record_ns(3000)
+    assert histogram.percentile(0.5) == 2048 / 1e9
+    assert histogram.percentile(0.99) == 2048 / 1e9
+    assert histogram.percentile(1.0) == 3000 / 1e9
+
+def test_to_dict_reports_counts_overruns_and_errors():
+    instruments = Instrumentation()
+    instruments.record("stage", 0.002)
+    instruments.record("stage", 0.004)
+    instruments.count_overrun("stage")
+    instruments.count_error("stage")
+    instruments.histogram("idle")
+
+    stats = instruments.to_dict()
+    assert list(stats) == ["idle", "stage"]
+    assert stats["idle"]["count"] == 0 and stats["idle"]["mean"] == 0.0
+    assert stats["stage"]["count"] == 2
+    assert stats["stage"]["overruns"] == 1
+    assert stats["stage"]["errors"] == 1
+    assert abs(stats["stage"]["mean"] - 0.003) < 1e-9
+    assert stats["stage"]["max"] == 0.004
+    assert sum(stats["stage"]["buckets"].values()) == 2
+    assert json.loads(instruments.dump_json()) == stats
+    assert "stage" in instruments.dump_text()
+
+def test_timed_records_calls_that_raise():
+    instruments = Instrumentation()
+
+    @instruments.timed("failing")
+    def failing():
+        raise ValueError("boom")
+
+    try:
+        failing()
+    except ValueError:
+        pass
+    assert instruments.to_dict()["failing"]["count"] == 1
+
+def test_to_dict_while_histograms_are_added():
+    instruments = Instrumentation()
+    stop = threading.Event()
+
+    def add_histograms():
+        for index in range(5000):
+            if stop.is_set():
+                break
+            instruments.record(f"stage{index}", 0.001)
+
+    thread = threading.Thread(target=add_histograms)
+    thread.start()
+    try:
+        while thread.is_alive():
+            stats = instruments.to_dict()
+            assert all(entry["count"] <= 1 for entry in stats.values())
+    finally:
+        stop.set()
+        thread.join()
+    assert len(instruments.to_dict()) > 0
@@ -0,0 +1,57 @@
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+from live_plot import LivePlot, downsample, lttb, minmax_decimate
+
+def test_minmax_decimation_keeps_every_extreme():
+    rng = np.random.default_rng(11)
+    for length in (1000, 1001, 4099):
+        x = np.arange(length, dtype=np.float64)
+        for position in (0, length // 3, length - 2, length - 1):
+            y = rng.normal(0.0, 1.0, length)
+            y[position] = 50.0
+            y[(position + 7) % length] = -50.0
+            plot_x, plot_y = minmax_decimate(x, y, 64)
+            assert len(plot_y) <= 64
+            assert np.all(np.diff(plot_x) > 0)
+            assert plot_y.max() == 50.0 and plot_y.min() == -50.0
+            assert plot_x[0] == 0.0 and plot_x[-1] == length - 1
+
+    # Short series are returned unchanged
+    plot_x, plot_y = minmax_decimate([0.0, 1.0], [3.0, 4.0], 64)
+    np.testing.assert_array_equal(plot_y, [3.0, 4.0])
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10000, dtype=np.float64)
+    y = np.sin(x / 500.0)
+    y[4321] = 8.0
+    y[8765] = -8.0
+    plot_x, plot_y = lttb(x, y, 200)
+    assert len(plot_y) == 200
+    assert plot_x[0] == 0.0 and plot_x[-1] == 9999.0
+    assert np.all(np.diff(plot_x) > 0)
+    assert 4321.0 in plot_x and 8765.0 in plot_x
+
+def test_downsample_methods_keep_the_extremes():
+    rng = np.random.default_rng(5)
+    x = np.arange(200000, dtype=np.float64)
+    y = rng.normal(12.0, 0.1, len(x))
+    y[123456] = 20.0
+    y[-3] = 4.0
+    for method in ("lttb", "minmax"):
+        plot_x, plot_y = downsample(x, y, 500, method)
+        assert len(plot_y) <= 500
+        assert plot_y.max() == 20.0 and plot_y.min() == 4.0
+
+def test_live_plot_update_draws_downsampled_lines():
+    plot = LivePlot([("voltage", "Voltage (V)", "blue"), ("current", "Current (A)", "red")], "Telemetry", max_points=100)
+    try:
+        x = np.arange(5000, dtype=np.float64)
+        plot.update(x, {"voltage": 12.0 + np.sin(x / 100.0), "current": np.full(len(x), 2.0)})
+        line_x, line_y = plot.lines["voltage"].get_data()
+        assert len(line_y) <= 100
+        assert abs(max(line_y) - 13.0) < 1e-3
+        low, high = plot.axes[0].get_ylim()
+        assert low < 11.0 and high > 13.0
+    finally:
+        plot.close()
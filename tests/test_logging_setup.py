@@ -0,0 +1,82 @@
+import json
+import queue
+import logging
+import logging_setup
+from logging_setup import DeferredQueueHandler, SampleFormatter, SampleLogger, SampleRecordFilter
+
+def make_record(name, msg="value %s", args=(1,), **extra):
+    record = logging.LogRecord(name, logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    log_queue = queue.Queue(maxsize=2)
+    handler = DeferredQueueHandler(log_queue)
+    records = [make_record("app") for _ in range(3)]
+    for record in records:
+        handler.handle(record)
+    assert handler.dropped == 1
+    queued = log_queue.get_nowait()
+    assert queued is records[0]
+    assert queued.msg == "value %s" and queued.args == (1,)
+
+def test_sample_formatter_styles():
+    sample = {"voltage": 12.0, "current": 2.5}
+    record = make_record("samples.drone", "sample", (), sample=sample, source="drone-7")
+    record.created = 100.25
+    assert SampleFormatter("compact").format(record) == "100.250 drone-7 voltage=12.0 current=2.5"
+    assert json.loads(SampleFormatter("json").format(record)) == {"voltage": 12.0, "current": 2.5, "t": 100.25, "src": "drone-7"}
+    # Ordinary records use the standard format
+    assert SampleFormatter().format(make_record("app")) == "value 1"
+
+def test_sample_record_filter_splits_the_streams():
+    sample_record = make_record("samples.drone")
+    app_record = make_record("fault_detection")
+    assert SampleRecordFilter(samples=True).filter(sample_record)
+    assert not SampleRecordFilter(samples=True).filter(app_record)
+    assert SampleRecordFilter(samples=False).filter(app_record)
+    assert not SampleRecordFilter(samples=False).filter(sample_record)
+
+def test_sample_logger_keeps_one_sample_in_every():
+    records = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    sample_logger = SampleLogger("sampling_test", every=3)
+    collector = Collector()
+    sample_logger.logger.addHandler(collector)
+    sample_logger.logger.setLevel(logging.INFO)
+    sample_logger.logger.propagate = False
+    try:
+        for index in range(7):
+            sample_logger.log({"index": index})
+        assert [record.sample["index"] for record in records] == [0, 3, 6]
+        assert records[0].source == "sampling_test"
+
+        # Disabled levels create no records at all
+        sample_logger.logger.setLevel(logging.WARNING)
+        for index in range(6):
+            sample_logger.log({"index": index})
+        assert len(records) == 3
+    finally:
+        sample_logger.logger.removeHandler(collector)
+        sample_logger.logger.propagate = True
+        sample_logger.logger.setLevel(logging.NOTSET)
+
+def test_records_reach_their_files_after_stop():
+    logging_setup.stop_logging()
+    try:
+        assert logging_setup.configure_logging() is logging_setup.configure_logging()
+        logging.getLogger("logging_setup_test").warning("queued warning %d", 42)
+        logging_setup.get_sample_logger("logging_setup_test").log({"voltage": 11.5})
+        logging_setup.stop_logging()
+        assert logging_setup.get_dropped_records() == 0
+
+        with open("drone_power.log") as log_file:
+            assert log_file.read().splitlines()[-1].endswith("WARNING - queued warning 42")
+        with open("telemetry_samples.log") as sample_file:
+            assert sample_file.read().splitlines()[-1].endswith("logging_setup_test voltage=11.5")
+    finally:
+        logging_setup.configure_logging()
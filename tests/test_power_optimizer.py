@@ -0,0 +1,36 @@
+import numpy as np
+from power_optimizer import GeneticPowerOptimizer, demand_shortfall_fitness, optimize_power_distribution
+
+def test_zero_demand_has_no_shortfall():
+    population = np.array([[0.0, 5.0], [2.0, 10.0]])
+    scores = demand_shortfall_fitness(population, np.array([0.0, 10.0]), np.ones(2))
+    np.testing.assert_allclose(scores, [-0.25, 0.0])
+
+def test_optimizer_handles_idle_devices():
+    optimizer = GeneticPowerOptimizer([0.0, 0.0, 1.0], [20.0, 20.0, 20.0], 30.0, demand=[0.0, 15.0, 15.0], seed=1)
+    allocation, fitness = optimizer.run(generations=100)
+    assert np.isfinite(fitness)
+    assert allocation.sum() <= 30.0 + 1e-9
+    assert allocation[1] > 10.0 and allocation[2] > 10.0
+
+def test_distribution_from_the_configured_power_settings():
+    from remote_power_adjustment import load_configuration
+    power_settings, power_range, _, _ = load_configuration()
+    budget = power_settings["voltage"] * power_settings["current"]
+
+    allocation, fitness = optimize_power_distribution(power_settings, power_range, n_devices=4, generations=50, seed=0)
+    assert allocation.shape == (4,)
+    assert np.isfinite(fitness)
+    assert allocation.sum() <= budget + 1e-9
+    assert np.all(allocation >= power_range["min_voltage"] * power_range["min_current"] / 4 - 1e-9)
+
+def test_distribution_follows_demand_at_full_supply():
+    from remote_power_adjustment import load_configuration
+    power_settings, power_range, _, _ = load_configuration()
+    power_settings = {"voltage": power_range["max_voltage"], "current": power_range["max_current"]}
+    demand = np.array([2.0, 4.0, 8.0, 12.0])
+
+    allocation, fitness = optimize_power_distribution(power_settings, power_range, demand=demand, n_devices=4, generations=200, seed=0)
+    assert allocation.sum() <= power_range["max_voltage"] * power_range["max_current"] + 1e-9
+    # Total demand fits the supply, so every device's demand is (nearly) met
+    assert np.all(allocation >= 0.97 * demand)
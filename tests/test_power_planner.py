@@ -0,0 +1,43 @@
+import itertools
+import numpy as np
+import remote_power_adjustment
+from power_planner import plan_power_reserve, plan_power_settings
+
+# Run the scalar reserve_power on one setting and return what it leaves in power_settings.
+# reserve_power works on module globals that are normally set up by the __main__ block.
+def scalar_reserve(voltage, current, power_range, telemetry_reserve, combat_mode):
+    remote_power_adjustment.power_settings = {"voltage": voltage, "current": current}
+    remote_power_adjustment.power_range = power_range
+    remote_power_adjustment.telemetry_power_reserve = telemetry_reserve
+    remote_power_adjustment.reserve_power(telemetry_distance=0.5, combat_mode=combat_mode)
+    return remote_power_adjustment.power_settings["voltage"], remote_power_adjustment.power_settings["current"]
+
+def test_vectorized_plan_matches_scalar_reserve_power(monkeypatch):
+    for name in ("power_settings", "power_range", "telemetry_power_reserve"):
+        monkeypatch.setattr(remote_power_adjustment, name, None, raising=False)
+    power_settings, power_range, _, telemetry_reserve = remote_power_adjustment.load_configuration()
+    # Settings below, inside and above the range, around both reserve thresholds
+    voltages = np.linspace(power_range["min_voltage"] - 1.0, power_range["max_voltage"] + 2.0, 23)
+    currents = np.linspace(power_range["min_current"] - 0.5, power_range["max_current"] + 2.0, 19)
+    cases = list(itertools.product(voltages.tolist(), currents.tolist(), (False, True)))
+
+    voltage, current, combat_mode = (np.array(column) for column in zip(*cases))
+    plan = plan_power_reserve(voltage, current, power_range["min_voltage"], power_range["max_voltage"],
+                              power_range["min_current"], power_range["max_current"], telemetry_reserve, combat_mode)
+    expected = np.array([scalar_reserve(v, c, power_range, telemetry_reserve, combat) for v, c, combat in cases])
+    np.testing.assert_allclose(plan["voltage"], expected[:, 0], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(plan["current"], expected[:, 1], rtol=0, atol=1e-12)
+    assert plan["combat_infeasible"].any() and plan["clamped"].any()
+    assert not plan["combat_infeasible"][~combat_mode].any()
+
+def test_plan_power_settings_uses_the_shared_range(monkeypatch):
+    for name in ("power_settings", "power_range", "telemetry_power_reserve"):
+        monkeypatch.setattr(remote_power_adjustment, name, None, raising=False)
+    _, power_range, _, telemetry_reserve = remote_power_adjustment.load_configuration()
+    settings = [{"voltage": power_range["max_voltage"], "current": power_range["max_current"]},
+                {"voltage": power_range["min_voltage"], "current": power_range["min_current"]}]
+    plan = plan_power_settings(settings, power_range, telemetry_reserve)
+    for index, entry in enumerate(settings):
+        expected = scalar_reserve(entry["voltage"], entry["current"], power_range, telemetry_reserve, False)
+        assert (plan["voltage"][index], plan["current"][index]) == expected
+    assert plan["clamped"].tolist() == [False, True]
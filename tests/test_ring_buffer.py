@@ -0,0 +1,16 @@
+import numpy as np
+from ring_buffer import TimeSeriesRingBuffer
+
+def test_window_views_alias_the_buffer_and_copies_do_not():
+    buffer = TimeSeriesRingBuffer(4)
+    for index in range(4):
+        buffer.append(float(index), 12.0, 2.0, 24.0, 100.0)
+    view = buffer.window()
+    copy = buffer.window(copy=True)
+    np.testing.assert_array_equal(copy["timestamp"], [0.0, 1.0, 2.0, 3.0])
+
+    for index in range(4, 8):
+        buffer.append(float(index), 12.0, 2.0, 24.0, 100.0)
+    np.testing.assert_array_equal(copy["timestamp"], [0.0, 1.0, 2.0, 3.0])
+    assert not np.array_equal(view["timestamp"], [0.0, 1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(buffer.window(2, copy=True)["timestamp"], [6.0, 7.0])
@@ -0,0 +1,67 @@
+import numpy as np
+from rolling_stats import RollingWindow, RollingStatistics
+
+# Statistics of the last `length` rows computed directly, ignoring NaN
+def reference_stats(history, length):
+    window = np.array(history[-length:])
+    stats = {"count": [], "mean": [], "variance": [], "min": [], "max": []}
+    for column in window.T:
+        values = column[~np.isnan(column)]
+        stats["count"].append(len(values))
+        stats["mean"].append(values.mean() if len(values) else np.nan)
+        stats["variance"].append(values.var(ddof=1) if len(values) > 1 else np.nan)
+        stats["min"].append(values.min() if len(values) else np.nan)
+        stats["max"].append(values.max() if len(values) else np.nan)
+    return {name: np.array(value) for name, value in stats.items()}
+
+def test_rolling_window_matches_brute_force_reference():
+    rng = np.random.default_rng(7)
+    for length in (1, 5, 16):
+        window = RollingWindow(length, 3)
+        history = []
+        for step in range(200):
+            values = 12.0 + rng.normal(0.0, 1.0, 3)
+            values[rng.random(3) < 0.2] = np.nan
+            if step % 50 == 49:
+                values[:] = np.nan
+            history.append(values)
+            window.update(values)
+
+            stats = window.get_stats()
+            expected = reference_stats(history, length)
+            np.testing.assert_array_equal(stats["count"], expected["count"])
+            for name in ("mean", "variance", "min", "max"):
+                np.testing.assert_allclose(stats[name], expected[name], rtol=1e-9, atol=1e-9, equal_nan=True)
+
+def test_select_rearranges_and_adds_series():
+    rng = np.random.default_rng(3)
+    window = RollingWindow(4, 2)
+    history = []
+    for _ in range(6):
+        values = rng.normal(0.0, 1.0, 2)
+        history.append(values)
+        window.update(values)
+
+    window.select([1, -1, 0])
+    history = [np.array([row[1], np.nan, row[0]]) for row in history]
+    for _ in range(3):
+        values = rng.normal(0.0, 1.0, 3)
+        history.append(values)
+        window.update(values)
+        stats = window.get_stats()
+        expected = reference_stats(history, 4)
+        np.testing.assert_array_equal(stats["count"], expected["count"])
+        for name in ("mean", "variance", "min", "max"):
+            np.testing.assert_allclose(stats[name], expected[name], rtol=1e-9, atol=1e-9, equal_nan=True)
+
+def test_rolling_statistics_ewma_and_energy():
+    statistics = RollingStatistics(("voltage", "current"), n_drones=2, windows=(3,), ewma_alpha=0.5)
+    statistics.update([[12.0, 2.0], [10.0, 1.0]], 0.0)
+    statistics.update([[12.0, 4.0], [np.nan, 1.0]], 3600.0)
+
+    stats = statistics.get_stats()
+    np.testing.assert_allclose(stats["ewma"], [[12.0, 3.0], [10.0, 1.0]])
+    # Trapezoid of 24 W and 48 W over one hour; the second drone's power is missing
+    np.testing.assert_allclose(stats["energy_wh"], [36.0, 0.0])
+    np.testing.assert_allclose(stats["mean"], [[12.0, 3.0], [10.0, 1.0]])
+    assert statistics.get_drone_stats(1)["voltage"]["count"] == 1.0
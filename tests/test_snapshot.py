@@ -0,0 +1,71 @@
+import copy
+import pickle
+import threading
+import pytest
+from snapshot import FrozenSample, SnapshotPublisher, TelemetrySnapshot
+
+def test_published_samples_and_snapshots_are_read_only():
+    publisher = SnapshotPublisher()
+    snapshot = publisher.publish({"voltage": 12.0, "current": 2.0}, timestamp=10.0)
+    sample = snapshot.data
+    assert isinstance(sample, dict)
+    assert sample.get("voltage") == 12.0
+
+    for modify in (lambda: sample.__setitem__("voltage", 0.0), lambda: sample.__delitem__("voltage"),
+                   sample.clear, lambda: sample.pop("voltage"), sample.popitem,
+                   lambda: sample.setdefault("temperature", 30.0), lambda: sample.update(voltage=0.0)):
+        with pytest.raises(TypeError):
+            modify()
+    with pytest.raises(TypeError):
+        sample |= {"voltage": 0.0}
+    with pytest.raises(AttributeError):
+        snapshot.version = 5
+    assert snapshot.data == {"voltage": 12.0, "current": 2.0}
+
+    # Copies are ordinary mutable dictionaries; pickling keeps the sample frozen
+    for duplicate in (dict(sample), sample.copy(), copy.copy(sample)):
+        duplicate["voltage"] = 0.0
+    assert sample["voltage"] == 12.0
+    assert isinstance(pickle.loads(pickle.dumps(sample)), FrozenSample)
+
+def test_publishing_does_not_change_the_data_passed_in():
+    publisher = SnapshotPublisher()
+    data = {"voltage": 12.0}
+    snapshot = publisher.publish(data)
+    data["voltage"] = 0.0
+    assert snapshot.data["voltage"] == 12.0
+
+def test_publish_swaps_in_a_new_version():
+    publisher = SnapshotPublisher({"voltage": 11.0})
+    initial = publisher.latest()
+    assert isinstance(initial, TelemetrySnapshot)
+    assert initial.version == 0 and publisher.latest_data() == {"voltage": 11.0}
+
+    first = publisher.publish({"voltage": 12.0}, timestamp=1.0)
+    second = publisher.publish({"voltage": 13.0}, timestamp=2.0)
+    assert (first.version, second.version) == (1, 2)
+    assert publisher.version == 2
+    assert publisher.latest() is second
+    assert publisher.latest_data() is second.data
+    # Readers holding an older snapshot keep a consistent view
+    assert first.data == {"voltage": 12.0} and first.timestamp == 1.0
+    assert initial.data == {"voltage": 11.0}
+
+def test_concurrent_publishers_get_distinct_versions():
+    publisher = SnapshotPublisher()
+    versions = []
+    lock = threading.Lock()
+
+    def produce():
+        for index in range(500):
+            version = publisher.publish({"voltage": float(index)}).version
+            with lock:
+                versions.append(version)
+
+    threads = [threading.Thread(target=produce) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(versions) == list(range(1, 2001))
+    assert publisher.version == 2000
@@ -0,0 +1,41 @@
+import configparser
+import numpy as np
+from synthetic_telemetry import FAULT_KINDS, SyntheticFleetGenerator
+
+def test_fixed_seed_reproduces_the_fleet():
+    options = dict(rate=10.0, seed=42, start_time=1000.0, spike_rate=0.5, fault_rate=0.05)
+    first = SyntheticFleetGenerator(8, **options).generate(500)
+    second = SyntheticFleetGenerator(8, **options).generate(500)
+    for expected, actual in zip(first, second):
+        np.testing.assert_array_equal(expected, actual)
+    np.testing.assert_allclose(first[0], 1000.0 + np.arange(500) * 0.1)
+    assert first[2].any()
+
+    other = SyntheticFleetGenerator(8, **dict(options, seed=43)).generate(500)
+    assert not np.array_equal(first[1], other[1])
+
+def test_generate_matches_consecutive_steps():
+    blocks = SyntheticFleetGenerator(4, seed=7, start_time=0.0).generate(50)
+    generator = SyntheticFleetGenerator(4, seed=7, start_time=0.0)
+    for index in range(50):
+        timestamp, values, fault_masks = generator.step()
+        assert timestamp == blocks[0][index]
+        np.testing.assert_array_equal(values, blocks[1][index])
+        np.testing.assert_array_equal(fault_masks, blocks[2][index])
+
+def test_injected_fault_sets_its_mask_bit_for_its_duration():
+    generator = SyntheticFleetGenerator(3, rate=10.0, seed=1, start_time=0.0)
+    generator.inject_fault(1, "overheat", 1.0)
+    _, _, fault_masks = generator.generate(20)
+    bit = 1 << FAULT_KINDS.index("overheat")
+    assert fault_masks[:10, 1].tolist() == [bit] * 10
+    assert not fault_masks[10:].any()
+    assert not fault_masks[:, [0, 2]].any()
+
+def test_from_config_uses_the_configured_seed_and_rate():
+    config = configparser.ConfigParser()
+    config.read_string("[data_generation]\nupdate_interval = 0.5\nseed = 9\n")
+    generator = SyntheticFleetGenerator.from_config(config, n_drones=2)
+    assert generator.rate == 2.0
+    expected = SyntheticFleetGenerator(2, rate=2.0, seed=9, start_time=generator.start_time).generate(10)
+    np.testing.assert_array_equal(generator.generate(10)[1], expected[1])
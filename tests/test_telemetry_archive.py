@@ -0,0 +1,113 @@
+import os
+import numpy as np
+import telemetry_archive
+from telemetry_archive import (TELEMETRY_RECORD_DTYPE, TelemetryArchiveWriter, archive_index_path, build_csv_index,
+                               csv_index_path, iter_csv_chunks, load_archive_range)
+
+def write_csv(path, first, count, mode="w"):
+    with open(path, mode, newline="") as csv_file:
+        for index in range(first, first + count):
+            csv_file.write(f"{index * 0.5},{12.0 + index % 7 * 0.01},{2.0},{30.0}\r\n")
+
+def test_time_range_query_on_crlf_log(tmp_path):
+    path = str(tmp_path / "telemetry.csv")
+    write_csv(path, 0, 10000)
+    chunks = list(iter_csv_chunks(path, chunk_lines=1000, start=2100.0, end=3000.0))
+    timestamps = np.concatenate([chunk["timestamp"] for chunk in chunks])
+    np.testing.assert_array_equal(timestamps, np.arange(4200, 6000) * 0.5)
+
+def test_csv_index_is_persisted_and_extended(tmp_path):
+    path = str(tmp_path / "telemetry.csv")
+    write_csv(path, 0, 250)
+    timestamps, offsets = build_csv_index(path, stride_lines=100)
+    assert os.path.exists(csv_index_path(path))
+    np.testing.assert_array_equal(timestamps, [0.0, 50.0, 100.0])
+
+    # Append more lines plus a partial line still being written
+    write_csv(path, 250, 100, mode="a")
+    with open(path, "a", newline="") as csv_file:
+        csv_file.write("175.0,12.0")
+    timestamps, offsets = build_csv_index(path, stride_lines=100)
+    np.testing.assert_array_equal(timestamps, [0.0, 50.0, 100.0, 150.0])
+    with open(path, "rb") as csv_file:
+        for timestamp, offset in zip(timestamps, offsets):
+            csv_file.seek(offset)
+            assert float(csv_file.readline().split(b",")[0]) == timestamp
+
+    with np.load(csv_index_path(path)) as cached:
+        assert int(cached["lines"]) == 350
+
+def test_range_query_after_log_grows(tmp_path):
+    path = str(tmp_path / "telemetry.csv")
+    write_csv(path, 0, 5000)
+    list(iter_csv_chunks(path, start=100.0))
+    write_csv(path, 5000, 5000, mode="a")
+    telemetry_archive._csv_indexes.clear()
+    chunks = list(iter_csv_chunks(path, start=4000.0, end=4001.0))
+    np.testing.assert_array_equal(np.concatenate([chunk["timestamp"] for chunk in chunks]), [4000.0, 4000.5])
+
+def write_archive(path, first, count):
+    records = np.zeros(count, dtype=TELEMETRY_RECORD_DTYPE)
+    records["timestamp"] = first + np.arange(count, dtype=np.float64)
+    records["voltage"] = 12.0
+    if os.path.exists(path):
+        os.remove(path)
+    with TelemetryArchiveWriter(path) as writer:
+        writer.append_records(records)
+
+# Move the mtime forward so a rewrite within the filesystem's timestamp resolution still shows
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+def test_range_queries_work_without_a_writable_index(tmp_path, monkeypatch):
+    def read_only(*args, **kwargs):
+        raise PermissionError("Read-only file system")
+
+    archive_path = str(tmp_path / "telemetry.bin")
+    csv_path = str(tmp_path / "telemetry.csv")
+    write_archive(archive_path, 0, 10000)
+    write_csv(csv_path, 0, 10000)
+    telemetry_archive._csv_indexes.clear()
+    monkeypatch.setattr(np, "savez", read_only)
+
+    loaded = load_archive_range(archive_path, start=5000.0, end=5003.0, max_points=100)
+    np.testing.assert_array_equal(loaded["timestamp"], [5000.0, 5001.0, 5002.0])
+    chunks = list(iter_csv_chunks(csv_path, start=4000.0, end=4001.0))
+    np.testing.assert_array_equal(np.concatenate([chunk["timestamp"] for chunk in chunks]), [4000.0, 4000.5])
+    assert not os.path.exists(archive_index_path(archive_path))
+    assert not os.path.exists(csv_index_path(csv_path))
+
+def test_archive_index_is_rebuilt_when_the_archive_is_rewritten(tmp_path):
+    path = str(tmp_path / "telemetry.bin")
+    write_archive(path, 0, 10000)
+    assert load_archive_range(path, start=9000.0, end=9001.0)["timestamp"].tolist() == [9000.0]
+
+    # Same size, different contents
+    write_archive(path, 50000, 10000)
+    touch_later(path)
+    assert load_archive_range(path, start=59000.0, end=59001.0)["timestamp"].tolist() == [59000.0]
+    with np.load(archive_index_path(path)) as cached:
+        assert cached["timestamps"][0] == 50000.0
+
+def test_csv_index_is_rebuilt_when_the_log_is_rewritten(tmp_path):
+    path = str(tmp_path / "telemetry.csv")
+
+    def write_log(first):
+        with open(path, "w", newline="") as csv_file:
+            for index in range(3000):
+                csv_file.write(f"{first + index}.0,12.0,2.0,30.0\n")
+
+    write_log(10000)
+    timestamps, _ = build_csv_index(path, stride_lines=100)
+    assert timestamps[0] == 10000.0
+    size = os.path.getsize(path)
+
+    write_log(20000)
+    touch_later(path)
+    assert os.path.getsize(path) == size
+    timestamps, _ = build_csv_index(path, stride_lines=100)
+    assert timestamps[0] == 20000.0
+    telemetry_archive._csv_indexes.clear()
+    chunks = list(iter_csv_chunks(path, start=21500.0, end=21502.0))
+    np.testing.assert_array_equal(np.concatenate([chunk["timestamp"] for chunk in chunks]), [21500.0, 21501.0])
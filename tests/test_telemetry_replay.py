@@ -0,0 +1,54 @@
+import configparser
+import numpy as np
+import pytest
+from fault_rules import FaultRuleEngine
+from anomaly_detection import StreamingAnomalyDetector
+from telemetry_replay import TelemetryReplay, BlockSum
+
+def load_config():
+    config = configparser.ConfigParser()
+    config.read("config.ini")
+    return config
+
+def write_recording(path, count=6000, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = 1000.0 + 0.5 * np.arange(count)
+    voltage = 12.0 + 0.3 * rng.standard_normal(count)
+    current = 2.0 + 0.2 * rng.standard_normal(count)
+    temperature = 30.0 + 2.0 * rng.standard_normal(count)
+    voltage[rng.integers(0, count, 20)] = 9.0
+    np.savetxt(path, np.column_stack([timestamps, voltage, current, temperature]), delimiter=",", fmt="%.6f")
+
+def replay(path, chunk_records):
+    config = load_config()
+    rules = FaultRuleEngine.from_config(config)
+    detector = StreamingAnomalyDetector.from_config(config, rules.channels)
+    return TelemetryReplay(path, fault_rules=rules, anomaly_detector=detector, chunk_records=chunk_records).run()
+
+def test_result_does_not_depend_on_chunk_size(tmp_path):
+    path = str(tmp_path / "telemetry_data.csv")
+    write_recording(path)
+    results = [replay(path, chunk_records) for chunk_records in (997, 4096, 65536)]
+    assert results[0]["samples"] == 6000
+    assert results[0]["fault_samples"] > 0
+    for result in results[1:]:
+        assert result["digest"] == results[0]["digest"]
+        for key in ("fault_samples", "fault_counts", "anomaly_counts", "power_mean", "power_min", "power_max", "energy_wh"):
+            assert result[key] == results[0][key]
+
+def test_missing_channels_are_no_data_not_zero():
+    rules = FaultRuleEngine.from_config(load_config())
+    flagged = []
+    replay = TelemetryReplay("unused.csv", fault_rules=rules, on_faults=lambda timestamps, values, masks: flagged.extend(masks.tolist()))
+    # A recording without a temperature column: only the low voltage is a fault
+    replay.process({"timestamp": np.array([0.0, 1.0]), "voltage": np.array([12.0, 9.0]), "current": np.array([2.0, 2.0])})
+    assert flagged == [rules.channel_bits["voltage"]]
+
+def test_block_sum_skips_missing_values():
+    values = np.arange(10000, dtype=np.float64)
+    values[::7] = np.nan
+    total = BlockSum(block=1000)
+    for chunk in np.array_split(values, 13):
+        total.add(chunk)
+    assert total.finish() == pytest.approx(np.nansum(values))
+    assert total.valid == np.count_nonzero(~np.isnan(values))
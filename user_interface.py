@@ -3,21 +3,44 @@ import sys
 import time
 import threading
 import random
+import configparser
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QWidget, QMessageBox
 from PyQt5.QtCore import Qt
+from qt_bridge import TelemetryBridge
+from dashboard import create_dashboard
+from fleet_registry import fleet_registry
+
+# Load configuration from config.ini
+config = configparser.ConfigParser()
+config.read("config.ini")
 
 # Define global variables for user interface
 exit_flag = False
 
+# Bridge delivering telemetry to the GUI thread, and the labels it updates (created by create_gui)
+telemetry_bridge = None
+telemetry_labels = {}
+dashboard_window = None
+
 # Function to initialize the user interface
 def init():
     print("Welcome to the Drone Power Supply Management System!")
     # Add any necessary initialization tasks here
 
-# Function to update the user interface with real-time data
+# Function to update the user interface with real-time data.
+# Safe to call from any thread: the sample is formatted on the calling thread
+# and shown on the GUI thread at the next frame; samples arriving faster than
+# the frame rate are coalesced to the newest. Samples before the GUI exists are dropped.
 def update_display(telemetry_data):
-    # Update GUI elements with telemetry data
-    # Implement GUI update logic based on the chosen library
+    if telemetry_bridge is not None:
+        telemetry_bridge.submit(telemetry_data)
+
+# Function to show prepared telemetry texts; runs on the GUI thread
+def show_telemetry(display_texts):
+    for name, text in display_texts.items():
+        label = telemetry_labels.get(name)
+        if label is not None:
+            label.setText(text)
 
 # Function to prompt the user for power adjustments
 def prompt_power_adjustments():
@@ -147,21 +170,18 @@ def get_power_analysis_results():
 def display_power_analysis_results(power_analysis_results):
     # Implement logic to display power analysis results on the GUI
 
-    # Example: Update GUI elements with power analysis results (for PyQt)
+    # Update the result labels created by create_gui (call on the GUI thread)
     if power_analysis_results:
-        # Assuming you have labels or text fields to display the results
-        voltage_label.setText(f"Voltage: {power_analysis_results['voltage']} V")
-        current_label.setText(f"Current: {power_analysis_results['current']} A")
-        power_label.setText(f"Power: {power_analysis_results['power']} W")
-        efficiency_label.setText(f"Efficiency: {power_analysis_results['efficiency']} %")
-        temperature_label.setText(f"Temperature: {power_analysis_results['temperature']} °C")
+        show_telemetry({
+            "voltage": f"Voltage: {power_analysis_results['voltage']} V",
+            "current": f"Current: {power_analysis_results['current']} A",
+            "power": f"Power: {power_analysis_results['power']} W",
+            "efficiency": f"Efficiency: {power_analysis_results['efficiency']} %",
+            "temperature": f"Temperature: {power_analysis_results['temperature']} °C"
+        })
     else:
         # Handle the case when power analysis results are not available
-        voltage_label.setText("Voltage: N/A")
-        current_label.setText("Current: N/A")
-        power_label.setText("Power: N/A")
-        efficiency_label.setText("Efficiency: N/A")
-        temperature_label.setText("Temperature: N/A")
+        show_telemetry({name: f"{name.capitalize()}: N/A" for name in ("voltage", "current", "power", "efficiency", "temperature")})
 
 # Function to check for firmware updates
 def check_firmware_updates():
@@ -267,15 +287,18 @@ def deny_access():
 
 # Function to update telemetry data
 def update_telemetry_data():
-    while True:
+    update_interval = config.getfloat("user_interface", "telemetry_interval", fallback=0.5)
+    drone_id = config.get("fleet", "drone_id", fallback="drone-0")
+    while not exit_flag:
         try:
             # Replace this with the actual function to get telemetry data from your drone
             telemetry_data = get_telemetry_data_from_drone()
             if telemetry_data:
+                fleet_registry.update(drone_id, telemetry_data)
                 update_display(telemetry_data)
             else:
                 print("Failed to retrieve telemetry data from the drone.")
-            time.sleep(0.5)  # Adjust the interval as needed
+            time.sleep(update_interval)
 
         except KeyboardInterrupt:
             # Exit the loop gracefully if the user interrupts the program (e.g., by pressing Ctrl+C)
@@ -300,6 +323,11 @@ def create_gui():
     # Initialize the application
     app = QApplication(sys.argv)
 
+    # Telemetry reaches the widgets only through the bridge, on the GUI thread
+    global telemetry_bridge
+    telemetry_bridge = TelemetryBridge(frame_rate=config.getfloat("user_interface", "frame_rate", fallback=60.0))
+    telemetry_bridge.frame_ready.connect(show_telemetry)
+
     # Create the main window
     window = QMainWindow()
     window.setWindowTitle("Drone Control Panel")
@@ -313,10 +341,15 @@ def create_gui():
     # Replace "actionFirmwareUpdate" with the actual menu item object
     actionFirmwareUpdate = window.menuBar().addAction("Firmware Update")
     actionFirmwareUpdate.triggered.connect(lambda: on_menu_select("Firmware Update"))
+    actionFleetDashboard = window.menuBar().addAction("Fleet Dashboard")
+    actionFleetDashboard.triggered.connect(lambda: on_menu_select("Fleet Dashboard"))
 
     # Set up the main layout
     layout = QVBoxLayout()
     layout.addWidget(label)
+    for name in ("voltage", "current", "power", "efficiency", "temperature"):
+        telemetry_labels[name] = QLabel(f"{name.capitalize()}: N/A")
+        layout.addWidget(telemetry_labels[name])
     layout.addWidget(button)
 
     # Create a central widget to hold the layout
@@ -341,6 +374,16 @@ def on_menu_select(menu_item):
     if menu_item == "Firmware Update":
         firmware_update_status = check_firmware_updates()
         display_firmware_update_status(firmware_update_status)
+    elif menu_item == "Fleet Dashboard":
+        open_fleet_dashboard()
+
+# Function to show the live fleet dashboard window
+def open_fleet_dashboard():
+    global dashboard_window
+    if dashboard_window is None:
+        dashboard_window = create_dashboard()
+    dashboard_window.show()
+    dashboard_window.raise_()
 
 # Function to check if the user wants to exit the program
 def should_exit():
@@ -364,7 +407,7 @@ def display_error(message):
 if __name__ == "__main__":
     # Initialize the user interface and telemetry data thread
     init()
-    telemetry_thread = threading.Thread(target=update_telemetry_data)
+    telemetry_thread = threading.Thread(target=update_telemetry_data, daemon=True)
     telemetry_thread.start()
 
     # Create the GUI and start the main event loop